@@ -1,192 +1,115 @@
-import fitz  # PyMuPDF
-from PIL import Image
-import numpy as np
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 import os
 import ctypes
 import subprocess  # 用于打开文件浏览器
-import pythoncom
-import win32com.client
 
+# PyMuPDF 只在后台进程中导入，以加快启动速度；Word、Visio 的转换由后台合并进程中
+# 常驻的转换进程完成，本模块在没有安装 pywin32 的系统上也能导入
+from pdfcrop import SAVE_PROFILES, CropOptions, CropWorker, MergeWorker
+from pdfcrop.preview_pane import PreviewPane
 
-# 判断文件类型并转换为 PDF
-def convert_to_pdf(file_path):
-    file_extension = os.path.splitext(file_path)[1].lower()
-    output_pdf = os.path.splitext(file_path)[0] + ".pdf"  # 设置默认输出 PDF 文件名
+# 当前正在运行的后台裁剪任务
+crop_worker = None
 
-    if file_extension == ".pdf":
-        return file_path  # 如果已经是 PDF，直接返回文件路径
+# 后台合并进程，整个程序运行期间只创建一次，Word、Visio 因此只启动一次
+merge_worker = None
 
-    elif file_extension in [".jpg", ".jpeg", ".png", ".bmp"]:
-        # 图片文件转换为 PDF
-        images_to_pdf([file_path], output_pdf)
-        return output_pdf
-
-    elif file_extension in [".vsd", ".vsdx"]:
-        # Visio 文件转换为 PDF
-        visio_to_pdf(file_path, output_pdf)
-        return output_pdf
-
-    elif file_extension == ".docx":
-        # Word 文件转换为 PDF
-        word_to_pdf(file_path, output_pdf)
-        return output_pdf
-
-    else:
-        messagebox.showerror("错误", f"不支持的文件类型: {file_extension}")
-        return None
-
-
-# 合并 PDF 文件的函数
-def merge_pdfs(pdf_list, output_pdf):
-    merged_pdf = fitz.open()
-    for pdf in pdf_list:
-        current_pdf = fitz.open(pdf)
-        merged_pdf.insert_pdf(current_pdf)
-    merged_pdf.save(output_pdf)
-    messagebox.showinfo("成功", f"PDFs已成功合并并保存为 {output_pdf}")
 
+# 合并 PDF 按钮的点击事件
+def merge_button_click():
+    """在后台逐个转换、按需裁剪并合并所选文件，不在源文件旁边生成中间 PDF，界面保持响应"""
+    input_files = file_list.get(0, tk.END)
+    if not input_files:
+        messagebox.showwarning("警告", "请先选择至少一个文件！")
+        return
 
-# 图片转换为 PDF 的函数
-def images_to_pdf(image_list, output_pdf):
-    images = []
-    for img in image_list:
+    crop_options = None
+    if merge_crop_var.get():
         try:
-            img_obj = Image.open(img)
-            img_obj = img_obj.convert("RGB")  # 转换为RGB模式
-            images.append(img_obj)
-        except Exception as e:
-            messagebox.showerror("错误", f"图片文件转换失败: {img}\n{str(e)}")
+            precision_dpi_str = precision_dpi_entry.get().strip()
+            crop_options = CropOptions(
+                border_width=int(border_width_entry.get()),
+                precision_dpi=int(precision_dpi_str) if precision_dpi_str else None,
+            )
+        except ValueError:
+            status_label.config(text="错误: 边框宽度与精细 DPI 必须是整数")
             return
 
-    if images:
-        # 保存为单页PDF
-        images[0].save(output_pdf, save_all=True, append_images=images[1:])
-        messagebox.showinfo("成功", f"图片已成功转换并保存为 {output_pdf}")
-
-
-# Visio转换为PDF
-def visio_to_pdf(visio_file, output_pdf):
-    try:
-        pythoncom.CoInitialize()  # 初始化COM库
-        visio = win32com.client.Dispatch("Visio.Application")
-        visio.Visible = False  # 不显示Visio界面
-        doc = visio.Documents.Open(visio_file)
-        doc.SaveAs(output_pdf, 32)  # 32表示保存为PDF格式
-        doc.Close()
-        visio.Quit()
-        messagebox.showinfo("成功", f"Visio文件已成功转换为 {output_pdf}")
-    except Exception as e:
-        messagebox.showerror("错误", f"Visio文件转换失败: {str(e)}")
-
-
-# Word转换为PDF
-def word_to_pdf(word_file, output_pdf):
-    try:
-        pythoncom.CoInitialize()  # 初始化COM库
-        word = win32com.client.Dispatch("Word.Application")
-        word.Visible = False  # 不显示Word界面
-        doc = word.Documents.Open(word_file)
-        doc.SaveAs(output_pdf, FileFormat=17)  # 17表示保存为PDF格式
-        doc.Close()
-        word.Quit()
-        messagebox.showinfo("成功", f"Word文件已成功转换为 {output_pdf}")
-    except Exception as e:
-        messagebox.showerror("错误", f"Word文件转换失败: {str(e)}")
-
-
-
-# 自动裁剪 PDF 文件的函数
-def auto_crop_pdf(input_pdf_path, output_pdf_path, border_width=5):
-    pdf_document = fitz.open(input_pdf_path)
-    output_pdf = fitz.open()
-
-    for page_number in range(pdf_document.page_count):
-        page = pdf_document[page_number]
-        pix = page.get_pixmap()
-
-        # 将 PDF 页面转换为 PIL 图像
-        image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-        # 转换为灰度图
-        image = image.convert("L")
-        image_array = np.array(image)
-
-        # 获取图像尺寸
-        height, width = image_array.shape
-
-        # 初始化裁剪边界
-        left, top, right, bottom = width, height, 0, 0
-
-        # 判断像素是否位于边框
-        def is_border_pixel(x, y):
-            return x < border_width or y < border_width or x >= width - border_width or y >= height - border_width
-
-        # 寻找所有非白色像素，并且忽略边框
-        for y in range(height):
-            for x in range(width):
-                if not is_border_pixel(x, y) and image_array[y, x] < 255:
-                    left = min(left, x)
-                    right = max(right, x)
-                    top = min(top, y)
-                    bottom = max(bottom, y)
-
-        # 如果整个页面都是白色或只有边框，则不裁剪
-        if left == width and top == height and right == 0 and bottom == 0:
-            new_page = output_pdf.new_page(width=pix.width, height=pix.height)
-            new_page.show_pdf_page(new_page.rect, pdf_document, page_number)
-            continue
-
-        # 创建裁剪区域的矩形
-        crop_rect = fitz.Rect(left, top, right + 1, bottom + 1)  # 注意加一操作
-
-        # 创建新的 PDF 页面
-        new_page = output_pdf.new_page(width=crop_rect.width, height=crop_rect.height)
+    output_pdf = filedialog.asksaveasfilename(
+        defaultextension=".pdf",
+        filetypes=[("PDF Files", "*.pdf")],
+        title="保存合并后的PDF"
+    )
+    if not output_pdf:
+        return
 
-        # 从原始页面提取并显示内容
-        new_page.show_pdf_page(new_page.rect, pdf_document, page_number, clip=crop_rect)
+    save_profile = save_profile_combobox.get()
+    merge_worker.start(input_files, output_pdf, crop_options=crop_options, save_profile=save_profile)
 
-    # 保存输出 PDF
-    output_pdf.save(output_pdf_path)
-    pdf_document.close()
-    output_pdf.close()
+    file_progressbar.config(value=0, maximum=len(input_files))
+    set_running(True)
+    status_label.config(text="正在合并，请稍候...")
+    window.after(100, poll_merge_worker, output_pdf, save_profile)
 
 
-# 合并 PDF 按钮的点击事件
-def merge_button_click():
-    pdf_files = file_list.get(0, tk.END)
-    if not pdf_files:
-        messagebox.showwarning("警告", "请先选择至少一个文件！")
+# 轮询后台合并进度
+def poll_merge_worker(output_pdf, save_profile):
+    """刷新合并进度，结束后显示结果"""
+    merge_worker.poll()
+    file_progressbar.config(maximum=max(merge_worker.file_total, 1), value=merge_worker.files_done)
+    if not merge_worker.finished:
+        if not merge_worker.cancelled:
+            status_label.config(text=f"正在合并：{merge_worker.files_done}/{merge_worker.file_total}")
+        window.after(100, poll_merge_worker, output_pdf, save_profile)
         return
 
-    # 转换所有非 PDF 文件为 PDF
-    pdf_list = []
-    for file in pdf_files:
-        pdf_file = convert_to_pdf(file)
-        if pdf_file:
-            pdf_list.append(pdf_file)
+    set_running(False)
+    errors = merge_worker.skipped
+    skipped = "\n".join(f"{os.path.basename(path)}: {e}" for path, e in errors)
+
+    if merge_worker.error is not None:
+        error = merge_worker.error
+        message = f"合并失败: {str(error)}"
+        if errors:
+            message += "\n\n以下文件转换失败，已跳过：\n" + skipped
+        messagebox.showerror("错误", message)
+        status_label.config(text="合并失败：" + str(error))
+        return
 
-    if not pdf_list:
-        messagebox.showwarning("警告", "没有可合并的PDF文件！")
+    if merge_worker.cancelled:
+        status_label.config(text=f"已取消合并：完成 {merge_worker.files_done} 个文件，未写出输出文件")
         return
 
-    output_pdf = filedialog.asksaveasfilename(
-        defaultextension=".pdf",
-        filetypes=[("PDF Files", "*.pdf")],
-        title="保存合并后的PDF"
+    result = merge_worker.result
+    message = (
+        f"{result.file_count} 个文件（{result.page_count} 页）已合并并保存为 {output_pdf}\n"
+        f"写入 {result.bytes_written / 1024:.1f} KB，保存耗时 {result.save_seconds:.2f} 秒（保存配置：{save_profile}）"
     )
+    status_label.config(text=f"合并完成：{result.file_count} 个文件，{result.page_count} 页")
+    if errors:
+        messagebox.showwarning("部分文件未合并", message + "\n\n以下文件转换失败，已跳过：\n" + skipped)
+    else:
+        messagebox.showinfo("成功", message)
+
 
-    if output_pdf:
-        merge_pdfs(pdf_list, output_pdf)
+# 后台任务运行期间禁用合并与裁切按钮，只允许取消
+def set_running(running):
+    state = tk.DISABLED if running else tk.NORMAL
+    merge_button.config(state=state)
+    process_pdf_button.config(state=state)
+    cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
 
 
 # 处理 PDF 文件裁切的点击事件
 def process_pdf_files():
-    """处理选择的多个PDF文件进行自动裁剪"""
+    """在后台处理选择的多个PDF文件进行自动裁剪，界面保持响应"""
+    global crop_worker
     file_paths = file_list.get(0, tk.END)
     border_width_str = border_width_entry.get()
+    precision_dpi_str = precision_dpi_entry.get().strip()
+    save_profile = save_profile_combobox.get()
     output_folder = output_folder_entry.get()
 
     if not file_paths:
@@ -199,26 +122,83 @@ def process_pdf_files():
         status_label.config(text="错误: 边框宽度必须是整数")
         return
 
+    try:
+        precision_dpi = int(precision_dpi_str) if precision_dpi_str else None
+    except ValueError:
+        status_label.config(text="错误: 精细 DPI 必须是整数")
+        return
+
     if not output_folder:
         output_folder = filedialog.askdirectory(title="选择输出文件夹")  # 选择输出文件夹
         if not output_folder:
             messagebox.showwarning("警告", "请选择输出文件夹!")
             return
 
-    status_label.config(text="正在处理，请稍候...")
-
+    tasks = []
     for input_pdf_path in file_paths:
         file_name = os.path.basename(input_pdf_path)
         output_file_name = os.path.splitext(file_name)[0] + "_cropped.pdf"
-        output_pdf_path = os.path.join(output_folder, output_file_name)
-        try:
-            auto_crop_pdf(input_pdf_path, output_pdf_path, border_width)
-        except Exception as e:
-            messagebox.showerror("错误", "处理 PDF 文件时发生错误: " + str(e))
-            status_label.config(text="发生错误，停止处理：" + str(e))
-            return
+        tasks.append((input_pdf_path, os.path.join(output_folder, output_file_name)))
+
+    crop_worker = CropWorker(
+        tasks, border_width=border_width, precision_dpi=precision_dpi, save_profile=save_profile
+    )
+    crop_worker.start()
+
+    page_progressbar.config(value=0, maximum=1)
+    file_progressbar.config(value=0, maximum=len(tasks))
+    set_running(True)
+    status_label.config(text="正在处理，请稍候...")
+    window.after(100, poll_crop_worker, output_folder)
+
+
+# 取消按钮的点击事件
+def cancel_processing():
+    """取消后台裁剪或合并：裁剪在当前页完成后停止，合并在当前文件完成后停止"""
+    for worker in (crop_worker, merge_worker):
+        if worker is not None and worker.start_time is not None and not worker.finished:
+            worker.cancel()
+    cancel_button.config(state=tk.DISABLED)
+    status_label.config(text="正在取消...")
+
+
+# 轮询后台裁剪进度
+def poll_crop_worker(output_folder):
+    """刷新进度条与吞吐量，处理结束后显示结果"""
+    crop_worker.poll()
+
+    # 出错时与之前一样停止处理后续文件
+    if crop_worker.errors and not crop_worker.cancelled:
+        crop_worker.cancel()
+
+    page_progressbar.config(maximum=max(crop_worker.page_total, 1), value=crop_worker.pages_done)
+    file_progressbar.config(value=crop_worker.files_done)
+    elapsed = max(crop_worker.elapsed, 1e-9)
+    throughput_label.config(
+        text=f"页: {crop_worker.pages_done}/{crop_worker.page_total}  "
+        f"文件: {crop_worker.files_done}/{len(crop_worker.tasks)}  "
+        f"({crop_worker.pages_done / elapsed:.1f} 页/秒, {crop_worker.files_done / elapsed:.2f} 文件/秒)"
+    )
+
+    if not crop_worker.finished:
+        window.after(100, poll_crop_worker, output_folder)
+        return
+
+    set_running(False)
+
+    if crop_worker.errors:
+        error = crop_worker.errors[0][1]
+        messagebox.showerror("错误", "处理 PDF 文件时发生错误: " + str(error))
+        status_label.config(text="发生错误，停止处理：" + str(error))
+        return
 
-    status_label.config(text="处理完成")
+    if crop_worker.cancelled:
+        status_label.config(text=f"已取消：完成 {crop_worker.files_done} 个文件")
+        return
+
+    bytes_written = sum(result.bytes_written for result in crop_worker.results.values())
+    save_seconds = sum(result.save_seconds for result in crop_worker.results.values())
+    status_label.config(text=f"处理完成：共写入 {bytes_written / 1024:.1f} KB，保存耗时 {save_seconds:.2f} 秒")
     messagebox.showinfo("完成", "PDF 文件裁剪成功")
 
     # 打开输出文件夹
@@ -245,6 +225,24 @@ def browse_files():
         file_list.delete(0, tk.END)
         for file in files:
             file_list.insert(tk.END, file)
+        file_list.selection_set(0)
+        preview_selected_file()
+
+# 在预览面板中显示列表中选中的文件（PDF 与图片；Word、Visio 无法预览）
+def preview_selected_file(event=None):
+    selection = file_list.curselection()
+    if selection:
+        preview_pane.show_file(file_list.get(selection[0]))
+
+# 按当前的边框宽度与精细 DPI 刷新预览，输入无效时保持原预览
+def update_preview_options(event=None):
+    try:
+        border_width = int(border_width_entry.get())
+        precision_dpi_str = precision_dpi_entry.get().strip()
+        precision_dpi = int(precision_dpi_str) if precision_dpi_str else None
+    except ValueError:
+        return
+    preview_pane.set_options(border_width=border_width, precision_dpi=precision_dpi)
 
 # 选择输出文件夹
 def select_output_folder():
@@ -255,86 +253,151 @@ def select_output_folder():
         status_label.config(text="输出文件夹已选择：" + folder_path)
 
 
-# 启用 DPI 感知
-if os.name == 'nt':  # 仅在 Windows 上启用 DPI 感知
+def main():
+    """创建主窗口并进入事件循环。"""
+    global window, file_list, process_pdf_button, cancel_button, page_progressbar, file_progressbar
+    global throughput_label, status_label, output_folder_entry, border_width_entry, precision_dpi_entry
+    global save_profile_combobox, merge_crop_var, preview_pane, merge_button, merge_worker
+
+    # 启用 DPI 感知
+    if os.name == 'nt':  # 仅在 Windows 上启用 DPI 感知
+        try:
+            ctypes.windll.shcore.SetProcessDpiAwareness(1)
+        except Exception as e:
+            print("Failed to set DPI awareness")
+
+    # 创建主窗口
+    window = tk.Tk()
+    window.title("PDF 自动裁剪与文件转换工具")
+
+    # 获取屏幕的 DPI
+    screen_dpi = window.winfo_fpixels('1i')
+
+    # 计算字体大小的缩放比例，并设置最大值
+    base_font_size = 10  # 设置基准字体大小
+    font_scale = screen_dpi / 96
+    max_font_size = 16  # 设置字体大小的最大值
+    scaled_font_size = min(int(base_font_size * font_scale), max_font_size)
+
+    # 根据DPI调整窗口大小
+    base_width = 1100
+    base_height = 790
+    window_width = int(base_width * screen_dpi / 96)
+    window_height = int(base_height * screen_dpi / 96)
+    window.geometry(f"{window_width}x{window_height}")
+
+    default_font = ("Arial", scaled_font_size)  # 使用计算后的字体大小
+
+    # 使用 ttk 的主题样式
+    style = ttk.Style(window)
+    style.theme_use('clam')
+    style.configure('TLabel', font=default_font)
+    style.configure('TButton', font=default_font)
+    style.configure('TEntry', font=default_font)
+    style.configure('TLabelFrame', font=default_font)
+    style.configure("Listbox", font=default_font)
+
+    # 预览面板位于窗口右侧：后台渲染缩略图，并以红框标出按当前边框宽度检测到的裁剪区域
+    preview_pane = PreviewPane(window)
+    preview_pane.pack(side=tk.RIGHT, padx=(0, 20), pady=10, fill="both", expand=True)
+
+    # 文件选择框架
+    file_frame = ttk.LabelFrame(window, text="选择文件")
+    file_frame.pack(padx=20, pady=10, fill="x")
+
+    # 文件列表框
+    file_list = tk.Listbox(file_frame, height=5)
+    file_list.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
+    file_list.bind("<<ListboxSelect>>", preview_selected_file)
+
+    # 选择文件按钮
+    select_file_button = ttk.Button(file_frame, text="选择文件", command=browse_files)
+    select_file_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+    # 合并 PDF 按钮
+    merge_button_frame = ttk.Frame(window)
+    merge_button_frame.pack(pady=10)
+
+    merge_button = ttk.Button(merge_button_frame, text="合并或转换 PDF", command=merge_button_click)
+    merge_button.pack(side=tk.LEFT, padx=5)
+
+    # 合并时按下方的边框宽度与精细 DPI 自动裁剪每一页
+    merge_crop_var = tk.BooleanVar(value=False)
+    merge_crop_checkbutton = ttk.Checkbutton(merge_button_frame, text="合并时自动裁剪", variable=merge_crop_var)
+    merge_crop_checkbutton.pack(side=tk.LEFT, padx=5)
+
+    # 处理 PDF 裁切按钮与取消按钮
+    crop_button_frame = ttk.Frame(window)
+    crop_button_frame.pack(pady=10)
+
+    process_pdf_button = ttk.Button(crop_button_frame, text="自动裁切 PDF", command=process_pdf_files)
+    process_pdf_button.pack(side=tk.LEFT, padx=5)
+
+    cancel_button = ttk.Button(crop_button_frame, text="取消", command=cancel_processing, state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, padx=5)
+
+    # 裁切进度：按页与按文件的进度条，以及实时吞吐量
+    progress_frame = ttk.LabelFrame(window, text="裁切进度")
+    progress_frame.pack(padx=20, pady=10, fill="x")
+
+    page_progressbar = ttk.Progressbar(progress_frame, mode="determinate")
+    page_progressbar.pack(padx=5, pady=5, fill="x")
+
+    file_progressbar = ttk.Progressbar(progress_frame, mode="determinate")
+    file_progressbar.pack(padx=5, pady=5, fill="x")
+
+    throughput_label = ttk.Label(progress_frame, text="")
+    throughput_label.pack(padx=5, pady=5)
+
+    # 状态标签
+    status_label = ttk.Label(window, text="等待操作...")
+    status_label.pack(pady=10)
+
+    # 输出文件夹路径框
+    output_folder_frame = ttk.LabelFrame(window, text="输出文件夹路径")
+    output_folder_frame.pack(padx=20, pady=10, fill="x")
+
+    output_folder_entry = ttk.Entry(output_folder_frame)
+    output_folder_entry.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
+
+    # 选择文件夹按钮
+    select_output_button = ttk.Button(output_folder_frame, text="选择文件夹", command=select_output_folder)
+    select_output_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+    # 设置边框宽度
+    border_width_frame = ttk.LabelFrame(window, text="边框宽度")
+    border_width_frame.pack(padx=20, pady=10, fill="x")
+
+    border_width_entry = ttk.Entry(border_width_frame)
+    border_width_entry.insert(0, "5")  # 默认边框宽度
+    border_width_entry.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
+    border_width_entry.bind("<KeyRelease>", update_preview_options)
+
+    # 设置精细 DPI（留空则不细化边界）
+    precision_dpi_frame = ttk.LabelFrame(window, text="精细 DPI（留空则不细化，例如 600）")
+    precision_dpi_frame.pack(padx=20, pady=10, fill="x")
+
+    precision_dpi_entry = ttk.Entry(precision_dpi_frame)
+    precision_dpi_entry.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
+    precision_dpi_entry.bind("<KeyRelease>", update_preview_options)
+
+    # 设置保存配置（裁剪与合并共用）
+    save_profile_frame = ttk.LabelFrame(window, text="保存配置（fast 最快，compact 较小，archival 最小）")
+    save_profile_frame.pack(padx=20, pady=10, fill="x")
+
+    save_profile_combobox = ttk.Combobox(save_profile_frame, values=list(SAVE_PROFILES), state="readonly")
+    save_profile_combobox.set("fast")  # 默认保存配置
+    save_profile_combobox.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
+
+    # 后台合并进程在第一次合并时启动，关闭窗口后随转换进程池一起退出
+    merge_worker = MergeWorker()
+
+    # 运行 GUI 窗口
     try:
-        ctypes.windll.shcore.SetProcessDpiAwareness(1)
-    except Exception as e:
-        print("Failed to set DPI awareness")
-
-# 创建主窗口
-window = tk.Tk()
-window.title("PDF 自动裁剪与文件转换工具")
-
-# 获取屏幕的 DPI
-screen_dpi = window.winfo_fpixels('1i')
-
-# 计算字体大小的缩放比例，并设置最大值
-base_font_size = 10  # 设置基准字体大小
-font_scale = screen_dpi / 96
-max_font_size = 16  # 设置字体大小的最大值
-scaled_font_size = min(int(base_font_size * font_scale), max_font_size)
-
-# 根据DPI调整窗口大小
-base_width = 700
-base_height = 500
-window_width = int(base_width * screen_dpi / 96)
-window_height = int(base_height * screen_dpi / 96)
-window.geometry(f"{window_width}x{window_height}")
-
-default_font = ("Arial", scaled_font_size)  # 使用计算后的字体大小
-
-# 使用 ttk 的主题样式
-style = ttk.Style(window)
-style.theme_use('clam')
-style.configure('TLabel', font=default_font)
-style.configure('TButton', font=default_font)
-style.configure('TEntry', font=default_font)
-style.configure('TLabelFrame', font=default_font)
-style.configure("Listbox", font=default_font)
-
-# 文件选择框架
-file_frame = ttk.LabelFrame(window, text="选择文件")
-file_frame.pack(padx=20, pady=10, fill="x")
-
-# 文件列表框
-file_list = tk.Listbox(file_frame, height=5)
-file_list.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
-
-# 选择文件按钮
-select_file_button = ttk.Button(file_frame, text="选择文件", command=browse_files)
-select_file_button.pack(side=tk.LEFT, padx=5, pady=5)
-
-# 合并 PDF 按钮
-merge_button = ttk.Button(window, text="合并或转换 PDF", command=merge_button_click)
-merge_button.pack(pady=10)
-
-# 处理 PDF 裁切按钮
-process_pdf_button = ttk.Button(window, text="自动裁切 PDF", command=process_pdf_files)
-process_pdf_button.pack(pady=10)
-
-# 状态标签
-status_label = ttk.Label(window, text="等待操作...")
-status_label.pack(pady=10)
-
-# 输出文件夹路径框
-output_folder_frame = ttk.LabelFrame(window, text="输出文件夹路径")
-output_folder_frame.pack(padx=20, pady=10, fill="x")
-
-output_folder_entry = ttk.Entry(output_folder_frame)
-output_folder_entry.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
-
-# 选择文件夹按钮
-select_output_button = ttk.Button(output_folder_frame, text="选择文件夹", command=select_output_folder)
-select_output_button.pack(side=tk.LEFT, padx=5, pady=5)
-
-# 设置边框宽度
-border_width_frame = ttk.LabelFrame(window, text="边框宽度")
-border_width_frame.pack(padx=20, pady=10, fill="x")
-
-border_width_entry = ttk.Entry(border_width_frame)
-border_width_entry.insert(0, "5")  # 默认边框宽度
-border_width_entry.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
-
-# 运行 GUI 窗口
-window.mainloop()
+        window.mainloop()
+    finally:
+        merge_worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,366 @@
-import fitz
-from PIL import Image
-import numpy as np
 import os
 import argparse
+import contextlib
 import glob
+import sys
+import time
 
+from pdfcrop import (
+    CROP_MODES,
+    DEFAULT_EXPORT_DPI,
+    DEFAULT_EXPORT_TEMPLATE,
+    DEFAULT_FIGURE_GAP,
+    DEFAULT_UNIFORM_SAMPLE,
+    EXPORT_FORMATS,
+    FIGURE_OUTPUTS,
+    OUTPUT_MODES,
+    SAVE_PROFILES,
+    CropCache,
+    Manifest,
+    TraceWriter,
+    add_hook,
+    check_export_options,
+    crop_files,
+    file_signature,
+    format_summary,
+    iter_files,
+    mirrored_output_path,
+    parse_uniform_sample,
+    read_trace,
+    remove_hook,
+    stage,
+    summarize,
+    watch_folder,
+)
 
-def auto_crop_pdf(input_pdf_path, output_pdf_path, border_width=5):
-    """
-    自动裁剪 PDF 文件中的图表，去除周围空白，并忽略指定宽度的边框。
 
-    Args:
-        input_pdf_path: 输入 PDF 文件的路径。
-        output_pdf_path: 输出 PDF 文件的路径。
-        border_width: 需要忽略的边框宽度，默认为 5 像素。
-    """
-    pdf_document = fitz.open(input_pdf_path)
-    output_pdf = fitz.open()
-
-    for page_number in range(pdf_document.page_count):
-        page = pdf_document[page_number]
-        pix = page.get_pixmap()
-        
-        # 将 PDF 页面转换为 PIL 图像
-        image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-        # 转换为灰度图
-        image = image.convert("L")
-        image_array = np.array(image)
-
-        # 获取图像尺寸
-        height, width = image_array.shape
-
-        # 初始化裁剪边界
-        left, top, right, bottom = width, height, 0, 0
-
-        # 判断像素是否位于边框
-        def is_border_pixel(x, y):
-            return x < border_width or y < border_width or x >= width - border_width or y >= height - border_width
-        
-        # 寻找所有非白色像素，并且忽略边框
-        for y in range(height):
-            for x in range(width):
-                if not is_border_pixel(x, y) and image_array[y, x] < 255:
-                    left = min(left, x)
-                    right = max(right, x)
-                    top = min(top, y)
-                    bottom = max(bottom, y)
-                    
-        # 如果整个页面都是白色或只有边框，则不裁剪
-        if left == width and top == height and right == 0 and bottom == 0:
-            new_page = output_pdf.new_page(width=pix.width, height=pix.height)
-            new_page.show_pdf_page(new_page.rect, pdf_document, page_number)
-            continue
-        
-        # 创建裁剪区域的矩形
-        crop_rect = fitz.Rect(left, top, right + 1, bottom + 1)  # 注意加一操作
-
-        # 创建新的 PDF 页面
-        new_page = output_pdf.new_page(width=crop_rect.width, height=crop_rect.height)
-
-        # 从原始页面提取并显示内容
-        new_page.show_pdf_page(new_page.rect, pdf_document, page_number, clip=crop_rect)
-
-    # 保存输出 PDF
-    output_pdf.save(output_pdf_path)
-    pdf_document.close()
-    output_pdf.close()
-
-def process_pdf_files(input_files, output_folder, border_width=5):
+def describe_outputs(output_paths):
+    """把实际写出的文件列表转换为提示信息中的简短说明。"""
+    if not output_paths:
+        return "（没有内容，未写出文件）"
+    if len(output_paths) == 1:
+        return output_paths[0]
+    folder = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in output_paths])
+    return f"{len(output_paths)} 个文件，位于 {folder}"
+
+
+def process_pdf_files(
+    input_files,
+    output_folder,
+    border_width=5,
+    mode="raster",
+    precision_dpi=None,
+    jobs=None,
+    cache=None,
+    incremental=False,
+    output_mode="rebuild",
+    save_profile="fast",
+    profile=None,
+    figure_gap=None,
+    figure_output="pages",
+    uniform=None,
+    uniform_percentile=100,
+    export_format=None,
+    export_dpi=DEFAULT_EXPORT_DPI,
+    export_template=DEFAULT_EXPORT_TEMPLATE,
+    mirror_root=None,
+):
     """
     处理多个 PDF 文件。
 
     Args:
-        input_files: 一个包含输入 PDF 文件路径的列表。
+        input_files: 输入 PDF 文件路径的列表，也可以是逐个产出路径的生成器：
+            文件在取到时即交给进程池，不会先读入全部路径。
         output_folder: 输出文件夹路径。
         border_width: 需要忽略的边框宽度，默认为 5 像素。
+        mode: 裁剪模式，"raster" 或 "vector"，默认为 "raster"。
+        precision_dpi: 栅格检测时细化边界使用的分辨率，默认为 None（不细化）。
+        jobs: 并行进程数，默认为 CPU 核数。
+        cache: ``CropCache`` 对象，默认为 None（不使用缓存）。
+        incremental: 是否启用增量模式，默认为 False。启用后在输出文件夹中维护处理清单，
+            跳过输入与参数均未变化的文件，中断后重新运行会从未完成的文件继续。
+        output_mode: 输出方式，"rebuild" 或 "cropbox"，默认为 "rebuild"。
+        save_profile: 保存配置，"fast"、"compact" 或 "archival"，默认为 "fast"。
+        profile: 分阶段计时的跟踪文件路径，默认为 None（不计时）。启用后每页每个阶段的耗时
+            以 JSON Lines 格式写入该文件，处理结束后打印各阶段合计与耗时分布。
+        figure_gap: 按图表分割时图表之间的最小空白宽度（点），默认为 None（每页只裁剪出一个区域）。
+        figure_output: 分割出的图表的输出方式，"pages" 或 "files"，默认为 "pages"。
+        uniform: 统一裁剪的抽样页数 ``(开头的页数, 随机抽取的页数)``，默认为 None（逐页裁剪）。
+        uniform_percentile: 统一裁剪区域取抽样区域边界的百分位数，默认为 100（并集）。
+        export_format: 把裁剪区域直接导出为图片的格式，"png" 或 "svg"，默认为 None（输出 PDF）。
+        export_dpi: 导出 PNG 的分辨率，默认为 300。
+        export_template: 导出文件名的模板，默认为 ``DEFAULT_EXPORT_TEMPLATE``。
+        mirror_root: 输入文件的根目录，默认为 None（所有输出平铺在输出文件夹中）。
+            指定时在输出文件夹中重建输入文件相对于该目录的子文件夹结构。
+
+    Returns:
+        与成功排队的文件一一对应（保持输入顺序）的 ``CropResult`` 列表，处理失败的文件为 None。
     """
-    if not input_files:
+    if isinstance(input_files, (list, tuple)) and not input_files:
         print("错误: 没有提供任何 PDF 文件路径.")
         return
 
     if not os.path.exists(output_folder):
         os.makedirs(output_folder) # 如果输出文件夹不存在，创建它
     
-    for input_pdf_path in input_files:
-        if not os.path.exists(input_pdf_path):
-            print(f"错误: 输入文件不存在: {input_pdf_path}")
-            continue
-
-        file_name = os.path.basename(input_pdf_path)
-        output_file_name = os.path.splitext(file_name)[0] + "_cropped.pdf"
-        output_pdf_path = os.path.join(output_folder, output_file_name)
-        try:
-            auto_crop_pdf(input_pdf_path, output_pdf_path, border_width)
-            print(f"已裁剪: {input_pdf_path}  ->  {output_pdf_path}")
-        except Exception as e:
-            print(f"处理 {input_pdf_path} 时发生错误：{e}")
-    
-    print(f"处理完成。裁剪后的文件保存在：{os.path.abspath(output_folder)}")
+    params = {
+        "border_width": border_width,
+        "mode": mode,
+        "precision_dpi": precision_dpi,
+        "output_mode": output_mode,
+        "save_profile": save_profile,
+        "figure_gap": figure_gap,
+        "figure_output": figure_output,
+        "uniform": uniform,
+        "uniform_percentile": uniform_percentile,
+        "export_format": export_format,
+        "export_dpi": export_dpi,
+        "export_template": export_template,
+    }
+    manifest = Manifest(output_folder) if incremental else None
+
+    # 已排队、尚未完成的任务：下标 -> (输入路径, 输出路径, 开始前的签名)
+    pending = {}
+    task_count = 0
+
+    def iter_tasks():
+        """逐个检查输入文件并产出待处理的任务，供 crop_files 边遍历边提交。"""
+        nonlocal task_count
+        for input_pdf_path in input_files:
+            if not os.path.exists(input_pdf_path):
+                print(f"错误: 输入文件不存在: {input_pdf_path}")
+                continue
+
+            if mirror_root is not None:
+                output_pdf_path = mirrored_output_path(input_pdf_path, mirror_root, output_folder)
+                os.makedirs(os.path.dirname(output_pdf_path), exist_ok=True)
+            else:
+                file_name = os.path.basename(input_pdf_path)
+                output_file_name = os.path.splitext(file_name)[0] + "_cropped.pdf"
+                output_pdf_path = os.path.join(output_folder, output_file_name)
+            unchanged = False
+            if manifest is not None:
+                with stage("manifest", input_pdf_path):
+                    unchanged = manifest.is_current(input_pdf_path, output_pdf_path, params)
+            if unchanged:
+                print(f"跳过（未变化）: {input_pdf_path}")
+                continue
+            pending[task_count] = (input_pdf_path, output_pdf_path, file_signature(input_pdf_path))
+            task_count += 1
+            yield input_pdf_path, output_pdf_path
+
+    start_time = time.perf_counter()
+    crop_results = {}
+
+    trace_writer = None
+    if profile:
+        if os.path.exists(profile):
+            os.remove(profile)
+        trace_writer = TraceWriter(profile)
+        add_hook(trace_writer)
+
+    tasks = iter_tasks()
+    if isinstance(input_files, (list, tuple)):
+        # 文件列表已在内存中：先检查全部文件，只有一个文件时由 crop_files 按页段并行
+        tasks = list(tasks)
+
+    # 结果按完成顺序返回，单个文件失败不影响其他文件
+    results = crop_files(
+        tasks,
+        jobs,
+        border_width=border_width,
+        mode=mode,
+        precision_dpi=precision_dpi,
+        cache=cache,
+        output_mode=output_mode,
+        save_profile=save_profile,
+        figure_gap=figure_gap,
+        figure_output=figure_output,
+        uniform=uniform,
+        uniform_percentile=uniform_percentile,
+        export_format=export_format,
+        export_dpi=export_dpi,
+        export_template=export_template,
+    )
+    try:
+        for index, result, error in results:
+            input_pdf_path, output_pdf_path, signature = pending.pop(index)
+            if error is not None:
+                print(f"处理 {input_pdf_path} 时发生错误：{error}")
+                continue
+            crop_results[index] = result
+            if manifest is not None:
+                with stage("manifest", input_pdf_path):
+                    manifest.record(input_pdf_path, output_pdf_path, params, signature, result.output_paths)
+            if export_format is not None:
+                print(
+                    f"已导出: {input_pdf_path}  ->  {describe_outputs(result.output_paths)}"
+                    f"（{export_format.upper()}，{result.bytes_written / 1024:.1f} KB，"
+                    f"导出 {result.save_seconds:.3f} 秒）"
+                )
+                continue
+            print(
+                f"已裁剪: {input_pdf_path}  ->  {describe_outputs(result.output_paths)}"
+                f"（{result.bytes_written / 1024:.1f} KB，保存 {result.save_seconds:.3f} 秒）"
+            )
+    finally:
+        if trace_writer is not None:
+            remove_hook(trace_writer)
+            trace_writer.close()
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    crop_results = [crop_results.get(index) for index in range(task_count)]
+    done = [result for result in crop_results if result is not None]
+    done_pages = sum(result.page_count for result in done)
+    print(
+        f"处理完成：成功 {len(done)} 个文件，失败 {task_count - len(done)} 个，共 {done_pages} 页，"
+        f"用时 {elapsed:.2f} 秒（{len(done) / elapsed:.2f} 文件/秒，{done_pages / elapsed:.2f} 页/秒）。"
+    )
+    print(
+        f"共写入 {sum(result.bytes_written for result in done) / 1024 / 1024:.2f} MB，"
+        + (
+            f"导出耗时 {sum(result.save_seconds for result in done):.2f} 秒（{export_format.upper()}）。"
+            if export_format is not None
+            else f"保存耗时 {sum(result.save_seconds for result in done):.2f} 秒（保存配置：{save_profile}）。"
+        )
+    )
+    print(f"裁剪后的文件保存在：{os.path.abspath(output_folder)}")
+
+    if trace_writer is not None and os.path.exists(profile):
+        print()
+        print(format_summary(summarize(read_trace(profile))))
+        print(f"逐页计时记录保存在：{os.path.abspath(profile)}")
+    return crop_results
+
+
+def watch_pdf_folder(
+    watch_dir,
+    output_folder,
+    border_width=5,
+    mode="raster",
+    precision_dpi=None,
+    jobs=None,
+    cache=None,
+    output_mode="rebuild",
+    save_profile="fast",
+    figure_gap=None,
+    figure_output="pages",
+    uniform=None,
+    uniform_percentile=100,
+    export_format=None,
+    export_dpi=DEFAULT_EXPORT_DPI,
+    export_template=DEFAULT_EXPORT_TEMPLATE,
+    settle_seconds=2.0,
+    poll_interval=1.0,
+):
+    """
+    持续监视文件夹，裁剪新出现或被修改的 PDF 文件，直到按 Ctrl+C 停止。
+
+    进程池与已导入的模块在整个监视期间保持常驻；处理清单总是启用，重新启动监视时
+    跳过已完成的旧文件。每个文件完成后在它实际写出的每个文件旁写入 ``<输出文件>.done`` 标记。
+    参数含义见 ``process_pdf_files``，另有：
+
+    Args:
+        watch_dir: 要监视的文件夹。
+        settle_seconds: 文件保持不变多少秒后才开始处理，默认为 2。
+        poll_interval: 扫描文件夹的间隔（秒），默认为 1。
+    """
+    print(f"正在监视：{os.path.abspath(watch_dir)}（按 Ctrl+C 停止）")
+    done_count = 0
+    error_count = 0
+    events = watch_folder(
+        watch_dir,
+        output_folder,
+        jobs,
+        settle_seconds,
+        poll_interval,
+        border_width=border_width,
+        mode=mode,
+        precision_dpi=precision_dpi,
+        cache=cache,
+        output_mode=output_mode,
+        save_profile=save_profile,
+        figure_gap=figure_gap,
+        figure_output=figure_output,
+        uniform=uniform,
+        uniform_percentile=uniform_percentile,
+        export_format=export_format,
+        export_dpi=export_dpi,
+        export_template=export_template,
+    )
+    try:
+        for event in events:
+            if event.error is not None:
+                error_count += 1
+                print(f"处理 {event.input_path} 时发生错误：{event.error}")
+                continue
+            done_count += 1
+            print(
+                f"已裁剪: {event.input_path}  ->  {describe_outputs(event.result.output_paths)}"
+                f"（{event.result.page_count} 页，延迟 {event.latency:.2f} 秒）"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        events.close()
+    print(f"已停止监视：成功 {done_count} 个文件，失败 {error_count} 个。")
+
+
+def crop_pipe(
+    input_file,
+    output_file,
+    border_width=5,
+    mode="raster",
+    precision_dpi=None,
+    cache=None,
+    output_mode="rebuild",
+    save_profile="fast",
+    figure_gap=None,
+    uniform=None,
+    uniform_percentile=100,
+):
+    """
+    裁剪单个文件，输入或输出为 "-" 时使用标准输入或标准输出，便于在管道中使用。
+
+    数据全程在内存中处理，不写临时文件；提示信息输出到标准错误，不会混入输出的 PDF。
+    参数含义见 ``process_pdf_files``，另有：
+
+    Args:
+        input_file: 输入 PDF 文件路径，"-" 表示从标准输入读取。
+        output_file: 输出 PDF 文件路径，"-" 表示写入标准输出。
+    """
+    source = sys.stdin.buffer.read() if input_file == "-" else input_file
+    target = sys.stdout.buffer if output_file == "-" else output_file
+    if output_file != "-":
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+
+    start_time = time.perf_counter()
+    # PyMuPDF 的警告默认打印到 sys.stdout，导入与处理期间转到标准错误
+    with contextlib.redirect_stdout(sys.stderr):
+        from pdfcrop import auto_crop_pdf
+
+        result = auto_crop_pdf(
+            source,
+            target,
+            border_width,
+            mode,
+            precision_dpi,
+            cache=cache,
+            output_mode=output_mode,
+            save_profile=save_profile,
+            figure_gap=figure_gap,
+            uniform=uniform,
+            uniform_percentile=uniform_percentile,
+        )
+    if output_file == "-":
+        target.flush()
+    print(
+        f"已裁剪: {'标准输入' if input_file == '-' else input_file}  ->  "
+        f"{'标准输出' if output_file == '-' else output_file}"
+        f"（{result.page_count} 页，{time.perf_counter() - start_time:.2f} 秒）",
+        file=sys.stderr,
+    )
+    return result
 
 
 if __name__ == "__main__":
@@ -106,13 +368,15 @@ if __name__ == "__main__":
     parser.add_argument(
         "input_files",
         nargs="*",
-        help="要处理的 PDF 文件路径（如果没有提供，则处理当前目录下的所有 PDF 文件）。",
+        help="要处理的 PDF 文件路径（如果没有提供，则处理当前目录下的所有 PDF 文件）；"
+        "\"-\" 表示从标准输入读取一个 PDF。",
     )
     parser.add_argument(
         "-o",
         "--output",
         default="output",
-        help="输出文件夹路径，默认是当前目录下的 'output' 文件夹。",
+        help="输出文件夹路径，默认是当前目录下的 'output' 文件夹；"
+        "\"-\" 表示把唯一一个输入文件的裁剪结果写入标准输出。",
     )
     parser.add_argument(
         "-b",
@@ -121,14 +385,273 @@ if __name__ == "__main__":
         default=5,
         help="需要忽略的边框宽度（像素），默认为 5。",
     )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=CROP_MODES,
+        default="raster",
+        help="裁剪模式：raster 渲染页面后按像素检测；vector 直接使用 PDF 的绘图、文字和图片位置，"
+        "无法处理的页面自动回退到 raster。默认为 raster。",
+    )
+    parser.add_argument(
+        "--precision-dpi",
+        type=int,
+        default=None,
+        help="先以 72 DPI 粗略检测，再以该分辨率渲染四条边附近的细条带来细化边界（例如 600）。"
+        "默认不细化，精度为 1 点。",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="并行处理文件的进程数，默认为 CPU 核数。",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="裁剪区域缓存目录。按页面内容哈希与裁剪参数缓存检测结果，重复处理相同页面时跳过检测。默认不使用缓存。",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=64,
+        help="缓存容量上限（MB），超出后淘汰最久未使用的记录，默认为 64。",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量模式：在输出文件夹中记录处理清单，跳过输入与参数均未变化的文件，中断后可继续处理。",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=OUTPUT_MODES,
+        default="rebuild",
+        help="输出方式：rebuild 新建文档并逐页嵌入裁剪后的内容，兼容忽略 CropBox 的阅读器；"
+        "cropbox 只修改原文档每页的 CropBox 与 MediaBox，保存更快、文件更小，并保留链接与注释。默认为 rebuild。",
+    )
+    parser.add_argument(
+        "--save-profile",
+        choices=list(SAVE_PROFILES),
+        default="fast",
+        help="保存配置：fast 写入最快；compact 合并重复对象、压缩内容流并使用对象流；"
+        "archival 进一步去除重复的流并压缩图片与字体，文件最小、写入最慢。默认为 fast。",
+    )
+    parser.add_argument(
+        "--split-figures",
+        nargs="?",
+        type=int,
+        const=DEFAULT_FIGURE_GAP,
+        default=None,
+        metavar="GAP",
+        help="按图表分割：一页中被至少 GAP 点（默认 %(const)s）空白隔开的多个内容区域分别裁剪输出，"
+        "而不是合并为一个区域。只支持 rebuild 输出方式。",
+    )
+    parser.add_argument(
+        "--uniform",
+        nargs="?",
+        type=parse_uniform_sample,
+        const=DEFAULT_UNIFORM_SAMPLE,
+        default=None,
+        metavar="N,K",
+        help="统一裁剪：只检测开头 N 页与随机抽取的 K 页（默认 %s,%s），求出一个共同的裁剪区域，"
+        "其余页面经廉价检查确认内容都在该区域之内后直接使用它，输出页面尺寸一致；"
+        "检查不通过的页面回退为逐页检测。适合幻灯片与模板化报告。" % DEFAULT_UNIFORM_SAMPLE,
+    )
+    parser.add_argument(
+        "--uniform-percentile",
+        type=float,
+        default=100,
+        metavar="P",
+        help="统一裁剪时共同区域各边取抽样区域边界的 P 百分位数，默认为 100（并集）；"
+        "较小的取值会忽略少数内容向外突出的抽样页面。",
+    )
+    parser.add_argument(
+        "--export",
+        choices=EXPORT_FORMATS,
+        default=None,
+        help="把每个裁剪区域（与 --split-figures 同时使用时为每个图表）直接导出为 PNG 或 SVG，"
+        "不生成裁剪后的 PDF；PNG 只按目标分辨率渲染一次裁剪区域，SVG 保持矢量。整页空白的页面不导出。",
+    )
+    parser.add_argument(
+        "--export-dpi",
+        type=int,
+        default=DEFAULT_EXPORT_DPI,
+        help="导出 PNG 的分辨率，默认为 %(default)s。",
+    )
+    parser.add_argument(
+        "--export-template",
+        default=DEFAULT_EXPORT_TEMPLATE,
+        metavar="TEMPLATE",
+        help="导出文件名模板，相对于输出文件夹；可用字段 {stem}（输入文件名加 _cropped）、{page}、{index}、{ext}，"
+        "支持格式说明，如 \"{stem}/fig_{page:03d}_{index}.{ext}\"。默认为 \"%(default)s\"。",
+    )
+    parser.add_argument(
+        "--figure-output",
+        choices=FIGURE_OUTPUTS,
+        default="pages",
+        help="按图表分割时的输出：pages 每个图表在输出文件中各占一页；"
+        "files 每个图表保存为单独的文件（<输出文件名>_p<页码>_<序号>.pdf）。默认为 pages。",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="pdfcrop_profile.jsonl",
+        default=None,
+        help="分阶段计时：打印打开、渲染、检测、合成、保存等各阶段的合计耗时与耗时分布，"
+        "并把每页每个阶段的耗时以 JSON Lines 格式写入指定文件（默认为 pdfcrop_profile.jsonl）。",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="递归模式：把输入参数视为目录（默认为当前目录），边遍历边处理其中的文件，"
+        "并在输出文件夹中重建输入的子文件夹结构，不同子文件夹中的同名文件不会互相覆盖。",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=None,
+        metavar="PATTERN",
+        help="递归模式下纳入的文件名通配符，可多次指定，默认为 *.pdf。",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="递归模式下排除的文件名、目录名或相对路径通配符（如 drafts 或 */old/*），可多次指定。",
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="DIR",
+        default=None,
+        help="热文件夹模式：持续监视 DIR，文件写入完成后立即裁剪新出现或被修改的 PDF 文件，"
+        "并在实际写出的每个文件旁写入 .done 标记；已处理且未变化的文件不会重复处理。按 Ctrl+C 停止。",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="监视模式下文件大小与修改时间保持不变多少秒才视为写入完成，默认为 2。",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="监视模式下扫描文件夹的间隔（秒），默认为 1。",
+    )
     
     args = parser.parse_args()
+    if args.split_figures is not None and args.output_mode != "rebuild":
+        parser.error("--split-figures 只支持 rebuild 输出方式")
+    if args.uniform is not None and args.split_figures is not None:
+        parser.error("--uniform 不能与 --split-figures 同时使用")
+    if not 0 < args.uniform_percentile <= 100:
+        parser.error("--uniform-percentile 必须在 (0, 100] 之间")
+    try:
+        check_export_options(args.export, args.export_dpi, args.export_template)
+    except ValueError as e:
+        parser.error(str(e))
 
     input_files = args.input_files
     output_folder = args.output
     border_width = args.border
+    mode = args.mode
+    precision_dpi = args.precision_dpi
+    jobs = args.jobs
+    cache = CropCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+
+    if args.watch is not None:
+        if input_files:
+            parser.error("--watch 与输入文件不能同时使用")
+        if output_folder == "-":
+            parser.error("--watch 不支持输出到标准输出")
+        watch_pdf_folder(
+            args.watch,
+            output_folder,
+            border_width,
+            mode,
+            precision_dpi,
+            jobs,
+            cache,
+            args.output_mode,
+            args.save_profile,
+            args.split_figures,
+            args.figure_output,
+            args.uniform,
+            args.uniform_percentile,
+            args.export,
+            args.export_dpi,
+            args.export_template,
+            args.settle,
+            args.poll_interval,
+        )
+        raise SystemExit
+
+    if "-" in input_files or output_folder == "-":
+        if len(input_files) != 1 or args.recursive:
+            parser.error("使用 \"-\" 时只能处理一个输入文件，且不能与 --recursive 同时使用")
+        if args.split_figures is not None and args.figure_output == "files":
+            parser.error("使用 \"-\" 时不支持 --figure-output files")
+        if args.export is not None:
+            parser.error("使用 \"-\" 时不支持 --export")
+        if output_folder == "-":
+            output_file = "-"
+        else:
+            # 从标准输入读取时没有文件名，输出为 <输出文件夹>/stdin_cropped.pdf
+            output_file_name = "stdin"
+            if input_files[0] != "-":
+                output_file_name = os.path.splitext(os.path.basename(input_files[0]))[0]
+            output_file = os.path.join(output_folder, output_file_name + "_cropped.pdf")
+        crop_pipe(
+            input_files[0],
+            output_file,
+            border_width,
+            mode,
+            precision_dpi,
+            cache,
+            args.output_mode,
+            args.save_profile,
+            args.split_figures,
+            args.uniform,
+            args.uniform_percentile,
+        )
+        raise SystemExit
 
-    if not input_files:  # 如果没有提供输入文件，则处理当前目录下的所有 PDF 文件
+    mirror_root = None
+    if args.recursive:
+        roots = input_files or ["."]
+        for root in roots:
+            if not os.path.isdir(root):
+                parser.error(f"递归模式的输入必须是目录: {root}")
+        # 多个输入目录时以它们的公共上级目录为根，保证输出路径互不冲突
+        mirror_root = roots[0] if len(roots) == 1 else os.path.commonpath([os.path.abspath(root) for root in roots])
+        discovered = iter_files(
+            roots, include=args.include or ["*.pdf"], exclude=args.exclude, skip_dirs=[output_folder]
+        )
+        input_files = (path for path, _ in discovered)
+    elif not input_files:  # 如果没有提供输入文件，则处理当前目录下的所有 PDF 文件
        input_files = glob.glob("*.pdf")
     
-    process_pdf_files(input_files, output_folder, border_width)
\ No newline at end of file
+    process_pdf_files(
+        input_files,
+        output_folder,
+        border_width,
+        mode,
+        precision_dpi,
+        jobs,
+        cache,
+        args.incremental,
+        args.output_mode,
+        args.save_profile,
+        args.profile,
+        args.split_figures,
+        args.figure_output,
+        args.uniform,
+        args.uniform_percentile,
+        args.export,
+        args.export_dpi,
+        args.export_template,
+        mirror_root,
+    )
\ No newline at end of file
@@ -1,74 +1,15 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
-import fitz
-from PIL import Image
-import numpy as np
 import os
 import ctypes
 import subprocess  # 用于打开文件浏览器
 
-def auto_crop_pdf(input_pdf_path, output_pdf_path, border_width=5):
-    """
-    自动裁剪 PDF 文件中的图表，去除周围空白，并忽略指定宽度的边框。
-
-    Args:
-        input_pdf_path: 输入 PDF 文件的路径。
-        output_pdf_path: 输出 PDF 文件的路径。
-        border_width: 需要忽略的边框宽度，默认为 5 像素。
-    """
-    pdf_document = fitz.open(input_pdf_path)
-    output_pdf = fitz.open()
-
-    for page_number in range(pdf_document.page_count):
-        page = pdf_document[page_number]
-        pix = page.get_pixmap()
-        
-        # 将 PDF 页面转换为 PIL 图像
-        image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-        # 转换为灰度图
-        image = image.convert("L")
-        image_array = np.array(image)
-
-        # 获取图像尺寸
-        height, width = image_array.shape
-
-        # 初始化裁剪边界
-        left, top, right, bottom = width, height, 0, 0
-
-        # 判断像素是否位于边框
-        def is_border_pixel(x, y):
-            return x < border_width or y < border_width or x >= width - border_width or y >= height - border_width
-        
-        # 寻找所有非白色像素，并且忽略边框
-        for y in range(height):
-            for x in range(width):
-                if not is_border_pixel(x, y) and image_array[y, x] < 255:
-                    left = min(left, x)
-                    right = max(right, x)
-                    top = min(top, y)
-                    bottom = max(bottom, y)
-                    
-        # 如果整个页面都是白色或只有边框，则不裁剪
-        if left == width and top == height and right == 0 and bottom == 0:
-            new_page = output_pdf.new_page(width=pix.width, height=pix.height)
-            new_page.show_pdf_page(new_page.rect, pdf_document, page_number)
-            continue
-        
-        # 创建裁剪区域的矩形
-        crop_rect = fitz.Rect(left, top, right + 1, bottom + 1)  # 注意加一操作
-
-        # 创建新的 PDF 页面
-        new_page = output_pdf.new_page(width=crop_rect.width, height=crop_rect.height)
-
-        # 从原始页面提取并显示内容
-        new_page.show_pdf_page(new_page.rect, pdf_document, page_number, clip=crop_rect)
-
-    # 保存输出 PDF
-    output_pdf.save(output_pdf_path)
-    pdf_document.close()
-    output_pdf.close()
+from pdfcrop import SAVE_PROFILES, CropWorker
+from pdfcrop.preview_pane import PreviewPane
+
+# 当前正在运行的后台裁剪任务
+crop_worker = None
 
 def select_pdf_files():
     """打开文件对话框，选择多个PDF文件."""
@@ -78,6 +19,24 @@ def select_pdf_files():
         for file_path in file_paths:
             input_files_listbox.insert(tk.END, file_path)
         status_label.config(text=f"已选择 {len(file_paths)} 个文件")
+        input_files_listbox.selection_set(0)
+        preview_selected_file()
+
+def preview_selected_file(event=None):
+    """在预览面板中显示文件列表中选中的文件."""
+    selection = input_files_listbox.curselection()
+    if selection:
+        preview_pane.show_file(input_files_listbox.get(selection[0]))
+
+def update_preview_options(event=None):
+    """按当前的边框宽度与精细 DPI 刷新预览，输入无效时保持原预览."""
+    try:
+        border_width = int(border_width_entry.get())
+        precision_dpi_str = precision_dpi_entry.get().strip()
+        precision_dpi = int(precision_dpi_str) if precision_dpi_str else None
+    except ValueError:
+        return
+    preview_pane.set_options(border_width=border_width, precision_dpi=precision_dpi)
 
 def select_output_folder():
     """打开文件夹选择对话框，选择输出文件夹."""
@@ -88,9 +47,12 @@ def select_output_folder():
         status_label.config(text="输出文件夹已选择：" + folder_path)
 
 def process_pdf_files():
-    """处理选择的多个PDF文件."""
+    """在后台处理选择的多个PDF文件，界面保持响应."""
+    global crop_worker
     file_paths = input_files_listbox.get(0, tk.END)
     border_width_str = border_width_entry.get()
+    precision_dpi_str = precision_dpi_entry.get().strip()
+    save_profile = save_profile_combobox.get()
     output_folder = output_folder_entry.get()
 
     if not file_paths:
@@ -102,25 +64,79 @@ def process_pdf_files():
     except ValueError:
          status_label.config(text="错误: 边框宽度必须是整数")
          return
+
+    try:
+         precision_dpi = int(precision_dpi_str) if precision_dpi_str else None
+    except ValueError:
+         status_label.config(text="错误: 精细 DPI 必须是整数")
+         return
     
     if not output_folder:
         output_folder = "output"  # 设置默认输出文件夹为 output
         os.makedirs(output_folder, exist_ok=True) # 如果文件夹不存在，创建它
 
-    status_label.config(text="正在处理，请稍候...")
-
+    tasks = []
     for input_pdf_path in file_paths:
          file_name = os.path.basename(input_pdf_path)
          output_file_name = os.path.splitext(file_name)[0] + "_cropped.pdf"
-         output_pdf_path = os.path.join(output_folder, output_file_name)
-         try:
-             auto_crop_pdf(input_pdf_path, output_pdf_path, border_width)
-         except Exception as e:
-             messagebox.showerror("错误", "处理 PDF 文件时发生错误: " + str(e))
-             status_label.config(text="发生错误，停止处理："+ str(e))
-             return
-
-    status_label.config(text="处理完成")
+         tasks.append((input_pdf_path, os.path.join(output_folder, output_file_name)))
+
+    crop_worker = CropWorker(
+        tasks, border_width=border_width, precision_dpi=precision_dpi, save_profile=save_profile
+    )
+    crop_worker.start()
+
+    page_progressbar.config(value=0, maximum=1)
+    file_progressbar.config(value=0, maximum=len(tasks))
+    process_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    status_label.config(text="正在处理，请稍候...")
+    window.after(100, poll_crop_worker, output_folder)
+
+def cancel_processing():
+    """取消后台处理，正在处理的文件在当前页完成后停止."""
+    if crop_worker is not None:
+        crop_worker.cancel()
+        cancel_button.config(state=tk.DISABLED)
+        status_label.config(text="正在取消...")
+
+def poll_crop_worker(output_folder):
+    """轮询后台处理的进度并刷新界面，处理结束后显示结果."""
+    crop_worker.poll()
+
+    # 出错时与之前一样停止处理后续文件
+    if crop_worker.errors and not crop_worker.cancelled:
+        crop_worker.cancel()
+
+    page_progressbar.config(maximum=max(crop_worker.page_total, 1), value=crop_worker.pages_done)
+    file_progressbar.config(value=crop_worker.files_done)
+    elapsed = max(crop_worker.elapsed, 1e-9)
+    throughput_label.config(
+        text=f"页: {crop_worker.pages_done}/{crop_worker.page_total}  "
+        f"文件: {crop_worker.files_done}/{len(crop_worker.tasks)}  "
+        f"({crop_worker.pages_done / elapsed:.1f} 页/秒, {crop_worker.files_done / elapsed:.2f} 文件/秒)"
+    )
+
+    if not crop_worker.finished:
+        window.after(100, poll_crop_worker, output_folder)
+        return
+
+    process_button.config(state=tk.NORMAL)
+    cancel_button.config(state=tk.DISABLED)
+
+    if crop_worker.errors:
+        error = crop_worker.errors[0][1]
+        messagebox.showerror("错误", "处理 PDF 文件时发生错误: " + str(error))
+        status_label.config(text="发生错误，停止处理："+ str(error))
+        return
+
+    if crop_worker.cancelled:
+        status_label.config(text=f"已取消：完成 {crop_worker.files_done} 个文件")
+        return
+
+    bytes_written = sum(result.bytes_written for result in crop_worker.results.values())
+    save_seconds = sum(result.save_seconds for result in crop_worker.results.values())
+    status_label.config(text=f"处理完成：共写入 {bytes_written / 1024:.1f} KB，保存耗时 {save_seconds:.2f} 秒")
     messagebox.showinfo("完成", "PDF 文件裁剪成功")
     
     # 打开输出文件夹
@@ -133,84 +149,138 @@ def process_pdf_files():
             messagebox.showerror("错误", "无法打开输出文件夹：" + str(e))
             status_label.config(text = "无法打开输出文件夹")
 
-# 启用 DPI 感知
-if os.name == 'nt': # 仅在 Windows 上启用 DPI 感知
-   try:
-        ctypes.windll.shcore.SetProcessDpiAwareness(1)
-   except Exception as e:
-        print("Failed to set DPI awareness")
-    
-# 创建主窗口
-window = tk.Tk()
-window.title("PDF 自动裁剪工具")
-
-# 获取屏幕的 DPI
-screen_dpi = window.winfo_fpixels('1i')
-
-# 计算字体大小的缩放比例，并设置最大值
-base_font_size = 10 # 设置基准字体大小
-font_scale = screen_dpi / 96
-max_font_size = 16  # 设置字体大小的最大值
-scaled_font_size = min(int(base_font_size * font_scale), max_font_size)
-
-# 根据DPI调整窗口大小
-base_width = 700
-base_height = 350
-window_width = int(base_width * screen_dpi / 96)
-window_height = int(base_height * screen_dpi / 96)
-window.geometry(f"{window_width}x{window_height}")
-
-default_font = ("Arial", scaled_font_size) # 使用计算后的字体大小
-
-# 使用 ttk 的主题样式
-style = ttk.Style(window)
-style.theme_use('clam')
-style.configure('TLabel', font=default_font)
-style.configure('TButton', font=default_font)
-style.configure('TEntry', font=default_font)
-style.configure('TLabelFrame', font=default_font)
-style.configure("Listbox", font=default_font)
-
-# PDF 文件选择框架
-input_frame = ttk.LabelFrame(window, text="选择 PDF 文件")
-input_frame.pack(padx=20, pady=10, fill="x")
-
-# PDF 文件列表框
-input_files_listbox = tk.Listbox(input_frame,  height=5)
-input_files_listbox.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
-
-# PDF 文件选择按钮
-select_file_button = ttk.Button(input_frame, text="选择文件", command=select_pdf_files)
-select_file_button.pack(side=tk.LEFT, padx=5, pady=5)
-
-# 输出文件夹框架
-output_frame = ttk.LabelFrame(window, text="选择输出文件夹(默认为output文件夹)")
-output_frame.pack(padx=20, pady=10, fill="x")
-
-# 输出文件夹路径输入框
-output_folder_entry = ttk.Entry(output_frame)
-output_folder_entry.pack(side=tk.LEFT, padx=5, pady=5, fill = "x", expand=True)
-
-# 输出文件夹选择按钮
-select_output_button = ttk.Button(output_frame, text="选择文件夹", command=select_output_folder)
-select_output_button.pack(side=tk.LEFT, padx=5, pady=5)
-
-# 边框宽度框架
-border_frame = ttk.LabelFrame(window, text="设置边框宽度")
-border_frame.pack(padx=20, pady=10, fill="x")
-
-# 边框宽度输入框
-border_width_entry = ttk.Entry(border_frame, width=10)
-border_width_entry.insert(0, "5")  # 默认值
-border_width_entry.pack(side=tk.LEFT, padx=5, pady=5)
-
-# 处理按钮
-process_button = ttk.Button(window, text="开始裁剪", command=process_pdf_files)
-process_button.pack(pady=10)
-
-# 状态标签
-status_label = ttk.Label(window, text="等待操作...")
-status_label.pack(pady=10)
-
-# 运行 GUI 窗口
-window.mainloop()
\ No newline at end of file
+
+def main():
+    """创建主窗口并进入事件循环。"""
+    global window, input_files_listbox, output_folder_entry, border_width_entry, precision_dpi_entry
+    global save_profile_combobox, process_button, cancel_button, page_progressbar, file_progressbar
+    global throughput_label, status_label, preview_pane
+
+    # 启用 DPI 感知
+    if os.name == 'nt': # 仅在 Windows 上启用 DPI 感知
+        try:
+            ctypes.windll.shcore.SetProcessDpiAwareness(1)
+        except Exception as e:
+            print("Failed to set DPI awareness")
+
+    # 创建主窗口
+    window = tk.Tk()
+    window.title("PDF 自动裁剪工具")
+
+    # 获取屏幕的 DPI
+    screen_dpi = window.winfo_fpixels('1i')
+
+    # 计算字体大小的缩放比例，并设置最大值
+    base_font_size = 10 # 设置基准字体大小
+    font_scale = screen_dpi / 96
+    max_font_size = 16  # 设置字体大小的最大值
+    scaled_font_size = min(int(base_font_size * font_scale), max_font_size)
+
+    # 根据DPI调整窗口大小
+    base_width = 1100
+    base_height = 640
+    window_width = int(base_width * screen_dpi / 96)
+    window_height = int(base_height * screen_dpi / 96)
+    window.geometry(f"{window_width}x{window_height}")
+
+    default_font = ("Arial", scaled_font_size) # 使用计算后的字体大小
+
+    # 使用 ttk 的主题样式
+    style = ttk.Style(window)
+    style.theme_use('clam')
+    style.configure('TLabel', font=default_font)
+    style.configure('TButton', font=default_font)
+    style.configure('TEntry', font=default_font)
+    style.configure('TLabelFrame', font=default_font)
+    style.configure("Listbox", font=default_font)
+
+    # 预览面板位于窗口右侧：后台渲染缩略图，并以红框标出按当前边框宽度检测到的裁剪区域
+    preview_pane = PreviewPane(window)
+    preview_pane.pack(side=tk.RIGHT, padx=(0, 20), pady=10, fill="both", expand=True)
+
+    # PDF 文件选择框架
+    input_frame = ttk.LabelFrame(window, text="选择 PDF 文件")
+    input_frame.pack(padx=20, pady=10, fill="x")
+
+    # PDF 文件列表框
+    input_files_listbox = tk.Listbox(input_frame,  height=5)
+    input_files_listbox.pack(side=tk.LEFT, padx=5, pady=5, fill="x", expand=True)
+    input_files_listbox.bind("<<ListboxSelect>>", preview_selected_file)
+
+    # PDF 文件选择按钮
+    select_file_button = ttk.Button(input_frame, text="选择文件", command=select_pdf_files)
+    select_file_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+    # 输出文件夹框架
+    output_frame = ttk.LabelFrame(window, text="选择输出文件夹(默认为output文件夹)")
+    output_frame.pack(padx=20, pady=10, fill="x")
+
+    # 输出文件夹路径输入框
+    output_folder_entry = ttk.Entry(output_frame)
+    output_folder_entry.pack(side=tk.LEFT, padx=5, pady=5, fill = "x", expand=True)
+
+    # 输出文件夹选择按钮
+    select_output_button = ttk.Button(output_frame, text="选择文件夹", command=select_output_folder)
+    select_output_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+    # 边框宽度框架
+    border_frame = ttk.LabelFrame(window, text="设置边框宽度")
+    border_frame.pack(padx=20, pady=10, fill="x")
+
+    # 边框宽度输入框
+    border_width_entry = ttk.Entry(border_frame, width=10)
+    border_width_entry.insert(0, "5")  # 默认值
+    border_width_entry.pack(side=tk.LEFT, padx=5, pady=5)
+    border_width_entry.bind("<KeyRelease>", update_preview_options)
+
+    # 精细 DPI 框架
+    precision_frame = ttk.LabelFrame(window, text="精细 DPI（留空则不细化边界，例如 600）")
+    precision_frame.pack(padx=20, pady=10, fill="x")
+
+    # 精细 DPI 输入框
+    precision_dpi_entry = ttk.Entry(precision_frame, width=10)
+    precision_dpi_entry.pack(side=tk.LEFT, padx=5, pady=5)
+    precision_dpi_entry.bind("<KeyRelease>", update_preview_options)
+
+    # 保存配置框架
+    save_profile_frame = ttk.LabelFrame(window, text="保存配置（fast 最快，compact 较小，archival 最小）")
+    save_profile_frame.pack(padx=20, pady=10, fill="x")
+
+    # 保存配置下拉框
+    save_profile_combobox = ttk.Combobox(save_profile_frame, values=list(SAVE_PROFILES), state="readonly", width=10)
+    save_profile_combobox.set("fast")  # 默认值
+    save_profile_combobox.pack(side=tk.LEFT, padx=5, pady=5)
+
+    # 处理与取消按钮
+    button_frame = ttk.Frame(window)
+    button_frame.pack(pady=10)
+
+    process_button = ttk.Button(button_frame, text="开始裁剪", command=process_pdf_files)
+    process_button.pack(side=tk.LEFT, padx=5)
+
+    cancel_button = ttk.Button(button_frame, text="取消", command=cancel_processing, state=tk.DISABLED)
+    cancel_button.pack(side=tk.LEFT, padx=5)
+
+    # 进度框架：按页与按文件的进度条，以及实时吞吐量
+    progress_frame = ttk.LabelFrame(window, text="进度")
+    progress_frame.pack(padx=20, pady=10, fill="x")
+
+    page_progressbar = ttk.Progressbar(progress_frame, mode="determinate")
+    page_progressbar.pack(padx=5, pady=5, fill="x")
+
+    file_progressbar = ttk.Progressbar(progress_frame, mode="determinate")
+    file_progressbar.pack(padx=5, pady=5, fill="x")
+
+    throughput_label = ttk.Label(progress_frame, text="")
+    throughput_label.pack(padx=5, pady=5)
+
+    # 状态标签
+    status_label = ttk.Label(window, text="等待操作...")
+    status_label.pack(pady=10)
+
+    # 运行 GUI 窗口
+    window.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""PDF 自动裁剪的共享核心库，供命令行脚本与 GUI 共同使用。
+
+子模块在第一次访问其中的名称时才导入，``import pdfcrop`` 本身不会加载 PyMuPDF 或 NumPy。
+典型用法::
+
+    from pdfcrop import CropOptions, crop_document
+
+    result = crop_document("in.pdf", "out.pdf", CropOptions(mode="vector"))
+"""
+
+import importlib
+
+# 公开名称 -> 所在子模块
+_EXPORTS = {
+    "CROP_MODES": "options",
+    "DEFAULT_EXPORT_DPI": "options",
+    "DEFAULT_EXPORT_TEMPLATE": "options",
+    "DEFAULT_FIGURE_GAP": "options",
+    "DEFAULT_PREVIEW_CACHE_BYTES": "preview",
+    "DEFAULT_UNIFORM_SAMPLE": "options",
+    "FIGURE_OUTPUTS": "options",
+    "CropCache": "cache",
+    "CropCancelled": "crop",
+    "CropOptions": "options",
+    "CropResult": "crop",
+    "CropService": "server",
+    "CropWorker": "worker",
+    "add_hook": "timing",
+    "append_image": "images",
+    "append_cropped_pages": "crop",
+    "auto_crop_pdf": "crop",
+    "compute_crop_rects": "crop",
+    "check_export_options": "options",
+    "ConversionError": "convert",
+    "ConversionTimeout": "convert",
+    "convert_to_pdf": "convert",
+    "ConverterBackend": "convert",
+    "ConverterPool": "convert",
+    "crop_bytes": "crop",
+    "crop_document": "crop",
+    "crop_files": "batch",
+    "default_backends": "convert",
+    "export_file_path": "export",
+    "EXPORT_FORMATS": "options",
+    "FakeBackend": "convert",
+    "figure_file_path": "crop",
+    "file_signature": "manifest",
+    "find_content_box": "detect",
+    "find_crop_rect": "crop",
+    "find_figure_rects": "crop",
+    "FolderWatcher": "watch",
+    "format_summary": "timing",
+    "IMAGE_EXTENSIONS": "images",
+    "ink_fraction_detector": "detect",
+    "is_path": "crop",
+    "iter_files": "discover",
+    "LRUCache": "preview",
+    "make_server": "server",
+    "Manifest": "manifest",
+    "mirrored_output_path": "discover",
+    "merge_files": "pipeline",
+    "MergeResult": "pipeline",
+    "MergeWorker": "worker",
+    "open_as_pdf": "pipeline",
+    "open_pdf": "crop",
+    "OUTPUT_MODES": "options",
+    "SAVE_PROFILES": "save",
+    "parse_uniform_sample": "options",
+    "PreviewPane": "preview_pane",
+    "PreviewRenderer": "preview",
+    "PreviewResult": "preview",
+    "raster_crop_rect": "crop",
+    "read_trace": "timing",
+    "remove_hook": "timing",
+    "save_pdf": "save",
+    "segment_content_boxes": "segment",
+    "set_page_crop": "crop",
+    "stage": "timing",
+    "strict_detector": "detect",
+    "SubprocessBackend": "convert",
+    "summarize": "timing",
+    "threshold_detector": "detect",
+    "TraceWriter": "timing",
+    "vector_content_rect": "vector",
+    "VisioBackend": "convert",
+    "watch_folder": "watch",
+    "WatchEvent": "watch",
+    "WordBackend": "convert",
+    "write_exported_figures": "export",
+    "write_cropbox_pdf": "crop",
+    "write_cropped_pdf": "crop",
+    "write_figure_files": "crop",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # 缓存到包的命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
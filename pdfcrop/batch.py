@@ -0,0 +1,66 @@
+"""多进程批量裁剪。"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .timing import install_hooks, pool_hooks
+
+
+def crop_files(tasks, jobs=None, **crop_options):
+    """
+    使用进程池并行裁剪多个文件，每完成一个文件就产出一次结果。
+
+    tasks 可以是任意可迭代对象（例如边遍历目录边产出任务的生成器）：任务在取到时即提交，
+    同时排队的任务数不超过并行进程数的两倍，不会预先把全部任务读入内存。
+    单个文件失败不会影响其他文件，异常会随结果一起返回。只有一个文件时，
+    并行度交给 ``auto_crop_pdf`` 按页段拆分。
+
+    Args:
+        tasks: ``(输入路径, 输出路径)`` 的可迭代对象。
+        jobs: 并行进程数，默认为 CPU 核数；为 1 时直接在当前进程中依次处理。
+        **crop_options: 传给 ``auto_crop_pdf`` 的其他参数，如 border_width、mode。
+
+    Yields:
+        ``(index, result, error)``：index 为该文件在 tasks 中的下标；成功时 result 为
+        ``auto_crop_pdf`` 返回的 ``CropResult``、error 为 None，失败时 result 为 None、
+        error 为捕获到的异常。
+    """
+    # 延迟导入 PyMuPDF：所有文件都被跳过（tasks 为空）时无需加载
+    from .crop import auto_crop_pdf
+
+    jobs = jobs or os.cpu_count() or 1
+    workers = min(jobs, len(tasks)) if hasattr(tasks, "__len__") else jobs
+
+    if workers <= 1:
+        for index, (input_pdf_path, output_pdf_path) in enumerate(tasks):
+            try:
+                result = auto_crop_pdf(input_pdf_path, output_pdf_path, jobs=jobs, **crop_options)
+                yield index, result, None
+            except Exception as e:
+                yield index, None, e
+        return
+
+    # 已注册的可 pickle 钩子在子进程中同样生效
+    with ProcessPoolExecutor(max_workers=workers, initializer=install_hooks, initargs=(pool_hooks(),)) as executor:
+        futures = {}
+        task_iter = enumerate(tasks)
+        exhausted = False
+        while futures or not exhausted:
+            # 补足排队的任务，使每个进程完成当前文件后立即有下一个文件可做
+            while not exhausted and len(futures) < 2 * workers:
+                try:
+                    index, (input_pdf_path, output_pdf_path) = next(task_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                futures[executor.submit(auto_crop_pdf, input_pdf_path, output_pdf_path, **crop_options)] = index
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures.pop(future)
+                try:
+                    yield index, future.result(), None
+                except Exception as e:
+                    yield index, None, e
@@ -0,0 +1,420 @@
+"""可复现的裁剪性能基准测试。
+
+用 PyMuPDF 按固定随机种子生成合成语料（页面尺寸、页数、矢量或位图内容、页边距与空白页
+各不相同），并在生成时记录每页内容的真实边界作为标准答案（golden）。随后对每种裁剪配置
+分别在独立进程中运行 ``auto_crop_pdf``，统计每秒页数、单文件耗时分位数与峰值内存，
+并检查裁剪区域是否与标准答案一致，避免性能优化悄悄改变输出结果。
+
+用法::
+
+    python -m pdfcrop.benchmark --corpus benchmark_corpus -o results.json
+    python -m pdfcrop.benchmark --compare results.json -o new_results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+from .crop import auto_crop_pdf, compute_crop_rects
+
+try:
+    import resource
+except ImportError:
+    # Windows 没有 resource 模块，峰值内存记为 None
+    resource = None
+
+GOLDEN_NAME = "golden.json"
+
+# 语料版本：修改生成规则后需递增，旧语料会被自动重新生成
+CORPUS_VERSION = 1
+
+# 合成语料中的每个文件：名称、页面尺寸、页数、内容类型（vector / raster / mixed）、空白页比例，
+# 以及可选的页面旋转角度（依次循环使用）
+CORPUS_SPECS = [
+    {"name": "vector_letter", "size": (612, 792), "pages": 40, "content": "vector", "blank_ratio": 0.0},
+    {"name": "vector_a4_landscape", "size": (842, 595), "pages": 20, "content": "vector", "blank_ratio": 0.1},
+    {"name": "raster_a4", "size": (595, 842), "pages": 20, "content": "raster", "blank_ratio": 0.0},
+    {"name": "raster_small", "size": (300, 200), "pages": 60, "content": "raster", "blank_ratio": 0.0},
+    {"name": "mixed_large", "size": (1190, 842), "pages": 12, "content": "mixed", "blank_ratio": 0.0},
+    {"name": "mostly_blank", "size": (612, 792), "pages": 30, "content": "mixed", "blank_ratio": 0.6},
+    {"name": "long_document", "size": (612, 792), "pages": 200, "content": "vector", "blank_ratio": 0.05},
+    {
+        "name": "rotated",
+        "size": (612, 792),
+        "pages": 16,
+        "content": "mixed",
+        "blank_ratio": 0.0,
+        "rotations": (0, 90, 180, 270),
+    },
+]
+
+# 参与测试的裁剪配置：名称 -> 传给 auto_crop_pdf 的参数
+BENCHMARK_CONFIGS = {
+    "raster": {"mode": "raster"},
+    "raster_precise": {"mode": "raster", "precision_dpi": 300},
+    "vector": {"mode": "vector"},
+    "vector_cropbox": {"mode": "vector", "output_mode": "cropbox"},
+    "raster_compact": {"mode": "raster", "save_profile": "compact"},
+}
+
+# 与标准答案比较时允许的误差（点）：72 DPI 栅格检测的精度为 1 点
+GOLDEN_TOLERANCE = 1.0
+
+# 页面四周的细边框宽度（点），应被 border_width 忽略
+_FRAME_WIDTH = 2
+
+
+def _draw_vector_figure(page, rect, rng):
+    """在 rect 内绘制由填充矩形、折线和文字组成的矢量图表，外框恰好为 rect。"""
+    shape = page.new_shape()
+    shape.draw_rect(rect)
+    shape.finish(fill=(0.92, 0.92, 0.96), color=None)
+
+    # 内部的柱状图与折线，都留在外框之内
+    inner = rect + (8, 8, -8, -8)
+    bars = rng.randint(3, 8)
+    bar_width = inner.width / (bars * 2)
+    for i in range(bars):
+        height = inner.height * rng.uniform(0.2, 0.9)
+        x0 = inner.x0 + (2 * i + 0.5) * bar_width
+        shape.draw_rect(fitz.Rect(x0, inner.y1 - height, x0 + bar_width, inner.y1))
+        shape.finish(fill=(rng.random() * 0.6, rng.random() * 0.6, rng.random() * 0.6), color=None)
+
+    points = [
+        fitz.Point(inner.x0 + inner.width * i / 10, inner.y0 + inner.height * rng.uniform(0.1, 0.9))
+        for i in range(11)
+    ]
+    shape.draw_polyline(points)
+    shape.finish(color=(0.8, 0.1, 0.1), width=1, closePath=False)
+    shape.commit()
+
+    if inner.height > 30 and inner.width > 80:
+        page.insert_text(inner.tl + (4, 14), f"Figure {rng.randint(1, 99)}", fontsize=10)
+
+
+def _draw_raster_figure(page, rect, rng):
+    """在 rect 内嵌入一张没有白色像素的位图，图片边界恰好为 rect。"""
+    width = max(int(rect.width / 2), 1)
+    height = max(int(rect.height / 2), 1)
+    # 按行生成渐变加噪声的像素，全部通道都低于 230，不会被当作空白
+    base = [rng.randrange(40, 180) for _ in range(3)]
+    samples = bytearray()
+    for y in range(height):
+        shade = y * 40 // height
+        for _ in range(width):
+            samples += bytes(min(229, channel + shade + rng.randrange(20)) for channel in base)
+    pixmap = fitz.Pixmap(fitz.csRGB, width, height, bytes(samples), False)
+    page.insert_image(rect, pixmap=pixmap)
+
+
+def _generate_file(path, spec, rng):
+    """生成单个语料文件，返回每页内容边界（空白页为 None）。"""
+    document = fitz.open()
+    width, height = spec["size"]
+    rotations = spec.get("rotations", (0,))
+    boxes = []
+
+    for page_number in range(spec["pages"]):
+        page = document.new_page(width=width, height=height)
+
+        # 页面四周的细边框
+        shape = page.new_shape()
+        shape.draw_rect(page.rect)
+        shape.finish(color=(0, 0, 0), width=_FRAME_WIDTH)
+        shape.commit()
+
+        # 先在未旋转的页面上绘制，最后再设置旋转
+        rotation = rotations[page_number % len(rotations)]
+        if rng.random() < spec["blank_ratio"]:
+            page.set_rotation(rotation)
+            boxes.append(None)
+            continue
+
+        # 页边距取整数，使 72 DPI 栅格检测的结果与真实边界一致
+        left = rng.randint(10, int(width * 0.3))
+        right = rng.randint(10, int(width * 0.3))
+        top = rng.randint(10, int(height * 0.3))
+        bottom = rng.randint(10, int(height * 0.3))
+        rect = fitz.Rect(left, top, width - right, height - bottom)
+
+        content = spec["content"]
+        if content == "mixed":
+            content = rng.choice(("vector", "raster"))
+        if content == "vector":
+            _draw_vector_figure(page, rect, rng)
+        else:
+            _draw_raster_figure(page, rect, rng)
+
+        # 标准答案使用 page.rect 的（旋转后）坐标
+        page.set_rotation(rotation)
+        boxes.append(list(rect * page.rotation_matrix))
+
+    # 不生成随机的文件 ID，使相同种子生成的文件逐字节一致
+    document.save(path, garbage=3, deflate=True, no_new_id=True)
+    document.close()
+    return boxes
+
+
+def generate_corpus(corpus_folder, specs=CORPUS_SPECS, seed=0):
+    """
+    生成合成语料，并把每页内容的真实边界写入 ``golden.json``。
+
+    同一种子总是生成相同的语料。
+
+    Args:
+        corpus_folder: 语料文件夹路径，不存在时自动创建。
+        specs: 语料文件列表，默认为 ``CORPUS_SPECS``。
+        seed: 随机种子，默认为 0。
+
+    Returns:
+        标准答案字典：``{"version", "seed", "files": {文件名: {"spec", "boxes"}}}``。
+    """
+    os.makedirs(corpus_folder, exist_ok=True)
+    golden = {"version": CORPUS_VERSION, "seed": seed, "files": {}}
+
+    for spec in specs:
+        # 每个文件使用独立的随机序列，增删语料不影响其他文件
+        rng = random.Random(f"{seed}:{spec['name']}")
+        file_name = spec["name"] + ".pdf"
+        boxes = _generate_file(os.path.join(corpus_folder, file_name), spec, rng)
+        golden["files"][file_name] = {"spec": spec, "boxes": boxes}
+
+    with open(os.path.join(corpus_folder, GOLDEN_NAME), "w", encoding="utf-8") as golden_file:
+        json.dump(golden, golden_file, indent=1)
+    return golden
+
+
+def load_corpus(corpus_folder, specs=CORPUS_SPECS, seed=0):
+    """读取语料的标准答案；语料不存在，或版本、语料列表、种子不同时重新生成。"""
+    golden_path = os.path.join(corpus_folder, GOLDEN_NAME)
+    if os.path.exists(golden_path):
+        with open(golden_path, encoding="utf-8") as golden_file:
+            golden = json.load(golden_file)
+        # 经过一次 JSON 往返，元组与列表才能直接比较
+        same_specs = [entry["spec"] for entry in golden["files"].values()] == json.loads(json.dumps(specs))
+        files_exist = all(os.path.exists(os.path.join(corpus_folder, name)) for name in golden["files"])
+        if golden.get("version") == CORPUS_VERSION and golden.get("seed") == seed and same_specs and files_exist:
+            return golden
+    return generate_corpus(corpus_folder, specs, seed)
+
+
+def _percentile(values, percent):
+    """最近秩法求分位数。"""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb():
+    """当前进程的峰值常驻内存（MB），不支持的平台返回 None。"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，Linux 以 KB 为单位
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _golden_mismatches(file_name, crop_rects, boxes, tolerance):
+    """返回裁剪区域与标准答案不一致的页面。"""
+    mismatches = []
+    for page_number, (crop_rect, box) in enumerate(zip(crop_rects, boxes)):
+        if crop_rect is None or box is None:
+            matched = crop_rect is None and box is None
+        else:
+            matched = all(abs(a - b) <= tolerance for a, b in zip(crop_rect, box))
+        if not matched:
+            mismatches.append(
+                {
+                    "file": file_name,
+                    "page": page_number,
+                    "expected": box,
+                    "actual": None if crop_rect is None else [round(value, 3) for value in crop_rect],
+                }
+            )
+    return mismatches
+
+
+def _run_config(corpus_folder, golden, options, border_width, repeat, tolerance):
+    """在当前（独立的子）进程中用一种配置裁剪全部语料，并检查标准答案。"""
+    latencies = []
+    pages = 0
+    mismatches = []
+    output_folder = tempfile.mkdtemp(prefix="pdfcrop-benchmark-")
+
+    try:
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            for file_name in golden["files"]:
+                input_pdf_path = os.path.join(corpus_folder, file_name)
+                output_pdf_path = os.path.join(output_folder, file_name)
+                file_start = time.perf_counter()
+                result = auto_crop_pdf(input_pdf_path, output_pdf_path, border_width, **options)
+                latencies.append(time.perf_counter() - file_start)
+                pages += result.page_count
+        seconds = time.perf_counter() - start_time
+    finally:
+        shutil.rmtree(output_folder, ignore_errors=True)
+
+    # 标准答案检查不计入耗时
+    for file_name, entry in golden["files"].items():
+        crop_rects = compute_crop_rects(
+            os.path.join(corpus_folder, file_name),
+            border_width=border_width,
+            mode=options.get("mode", "raster"),
+            precision_dpi=options.get("precision_dpi"),
+        )
+        mismatches += _golden_mismatches(file_name, crop_rects, entry["boxes"], tolerance)
+
+    return {
+        "options": options,
+        "files": len(latencies),
+        "pages": pages,
+        "seconds": seconds,
+        "pages_per_sec": pages / max(seconds, 1e-9),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50) * 1000,
+            "p90": _percentile(latencies, 90) * 1000,
+            "p99": _percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+        "golden_mismatches": mismatches,
+    }
+
+
+def run_benchmark(
+    corpus_folder,
+    configs=None,
+    border_width=5,
+    repeat=1,
+    seed=0,
+    tolerance=GOLDEN_TOLERANCE,
+):
+    """
+    对每种裁剪配置运行基准测试。
+
+    每种配置在新启动的子进程中运行，峰值内存互不影响。
+
+    Args:
+        corpus_folder: 语料文件夹路径，语料不存在时自动生成。
+        configs: 要测试的配置名称列表，默认为 ``BENCHMARK_CONFIGS`` 中的全部配置。
+        border_width: 需要忽略的边框宽度，默认为 5。
+        repeat: 每个文件重复处理的次数，默认为 1。
+        seed: 语料随机种子，默认为 0。
+        tolerance: 与标准答案比较时允许的误差（点），默认为 ``GOLDEN_TOLERANCE``。
+
+    Returns:
+        可序列化为 JSON 的结果字典。
+    """
+    golden = load_corpus(corpus_folder, seed=seed)
+    configs = configs or list(BENCHMARK_CONFIGS)
+
+    results = {}
+    for name in configs:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[name] = executor.submit(
+                _run_config, corpus_folder, golden, BENCHMARK_CONFIGS[name], border_width, repeat, tolerance
+            ).result()
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "pymupdf": fitz.VersionBind,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpus": {
+            "version": golden["version"],
+            "seed": golden["seed"],
+            "files": len(golden["files"]),
+            "pages": sum(len(entry["boxes"]) for entry in golden["files"].values()),
+        },
+        "border_width": border_width,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def format_results(results, baseline=None):
+    """把结果格式化为表格文本；提供 baseline 时附上与之相比的每秒页数变化。"""
+    lines = [
+        f"{'配置':<16}{'页/秒':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'峰值MB':>10}{'不一致':>8}{'对比':>10}"
+    ]
+    for name, result in results["results"].items():
+        latency = result["latency_ms"]
+        peak = result["peak_rss_mb"]
+        change = ""
+        if baseline is not None and name in baseline["results"]:
+            before = baseline["results"][name]["pages_per_sec"]
+            change = f"{(result['pages_per_sec'] / before - 1) * 100:+.1f}%"
+        lines.append(
+            f"{name:<16}{result['pages_per_sec']:>10.1f}{latency['p50']:>10.1f}{latency['p90']:>10.1f}"
+            f"{latency['p99']:>10.1f}{'-' if peak is None else f'{peak:.0f}':>10}"
+            f"{len(result['golden_mismatches']):>8}{change:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 自动裁剪的性能基准测试。")
+    parser.add_argument(
+        "--corpus",
+        default="benchmark_corpus",
+        help="合成语料文件夹，不存在时自动生成，默认为当前目录下的 'benchmark_corpus'。",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark_results.json",
+        help="结果 JSON 文件路径，默认为 'benchmark_results.json'。",
+    )
+    parser.add_argument(
+        "-c",
+        "--config",
+        nargs="+",
+        choices=list(BENCHMARK_CONFIGS),
+        default=None,
+        help="要测试的裁剪配置，默认测试全部配置。",
+    )
+    parser.add_argument("-b", "--border", type=int, default=5, help="需要忽略的边框宽度，默认为 5。")
+    parser.add_argument("--repeat", type=int, default=1, help="每个文件重复处理的次数，默认为 1。")
+    parser.add_argument("--seed", type=int, default=0, help="语料随机种子，默认为 0。")
+    parser.add_argument("--regenerate", action="store_true", help="重新生成合成语料。")
+    parser.add_argument("--compare", default=None, help="之前的结果 JSON 文件，用于对比每秒页数。")
+    args = parser.parse_args(argv)
+
+    if args.regenerate:
+        generate_corpus(args.corpus, seed=args.seed)
+
+    results = run_benchmark(args.corpus, args.config, args.border, args.repeat, args.seed)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, ensure_ascii=False, indent=1)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print(format_results(results, baseline))
+    print(f"结果已保存到：{os.path.abspath(args.output)}")
+
+    # 裁剪结果与标准答案不一致时以非零状态退出，便于在持续集成中拦截
+    mismatched = sum(len(result["golden_mismatches"]) for result in results["results"].values())
+    if mismatched:
+        print(f"错误: 共 {mismatched} 页的裁剪区域与标准答案不一致。")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""按页面内容哈希持久化缓存裁剪区域。
+
+缓存键由页面内容（内容流、资源、页面尺寸与旋转）的哈希与裁剪参数共同决定，
+因此同一模板或图表即使出现在不同文件中也能命中。缓存保存在 SQLite 数据库中，
+超过容量上限时按最近使用时间淘汰（LRU）。
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 每条记录除缓存键外还保存 4 个坐标与 1 个时间戳
+_ENTRY_OVERHEAD = 5 * 8
+
+# 间接引用，以及指回父节点的引用（哈希时忽略，否则会把整棵页面树卷入）
+_REFERENCE = re.compile(rb"(\d+) (\d+) R")
+_BACK_REFERENCE = re.compile(rb"/(?:Parent|P)\s*\d+ \d+ R")
+
+
+class CropCache:
+    """
+    以 SQLite 保存的裁剪区域缓存。
+
+    对象可以被 pickle 传给子进程，每个进程在首次使用时各自打开数据库连接。
+
+    Args:
+        cache_dir: 缓存目录，不存在时自动创建。
+        max_bytes: 缓存容量上限（字节），默认为 64 MB。
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._connection = None
+        self._touched = []
+        self._digests = {}
+        self._digest_document = None
+
+    def __getstate__(self):
+        return {"cache_dir": self.cache_dir, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"], state["max_bytes"])
+
+    def _connect(self):
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, "crop_cache.sqlite")
+            self._connection = sqlite3.connect(path, timeout=30)
+            # 多个进程会同时读写同一个缓存
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS crops ("
+                "key TEXT PRIMARY KEY, x0 REAL, y0 REAL, x1 REAL, y1 REAL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS crops_last_used ON crops (last_used)")
+        return self._connection
+
+    def _object_digest(self, document, xref, visiting):
+        """递归计算对象的内容摘要，引用的对象以其摘要代替 xref 编号。"""
+        if xref in self._digests:
+            return self._digests[xref]
+        if xref in visiting:
+            return b"cycle"
+        visiting.add(xref)
+
+        source = document.xref_object(xref, compressed=True).encode()
+        source = _BACK_REFERENCE.sub(b"", source)
+        source = _REFERENCE.sub(
+            lambda match: self._object_digest(document, int(match.group(1)), visiting).hex().encode(),
+            source,
+        )
+        digest = hashlib.sha256(source)
+        if document.xref_is_stream(xref):
+            digest.update(document.xref_stream_raw(xref))
+
+        visiting.discard(xref)
+        self._digests[xref] = digest.digest()
+        return self._digests[xref]
+
+    def page_key(self, page, **params):
+        """
+        计算页面的缓存键。
+
+        Args:
+            page: PyMuPDF 页面对象。
+            **params: 影响裁剪结果的参数，如 border_width、mode、precision_dpi。
+        """
+        document = page.parent
+        if document is not self._digest_document:
+            # 摘要按 xref 编号记忆，只在同一文档内有效
+            self._digests = {}
+            self._digest_document = document
+
+        digest = hashlib.sha256()
+        digest.update(self._object_digest(document, page.xref, set()))
+
+        # 资源可能继承自父节点
+        node = page.xref
+        while document.xref_get_key(node, "Resources")[0] == "null":
+            kind, parent = document.xref_get_key(node, "Parent")
+            if kind != "xref":
+                break
+            node = int(parent.split()[0])
+            resources = document.xref_get_key(node, "Resources")
+            if resources[0] != "null":
+                digest.update(resources[1].encode())
+                for match in _REFERENCE.finditer(resources[1].encode()):
+                    digest.update(self._object_digest(document, int(match.group(1)), set()))
+
+        digest.update(repr((tuple(page.mediabox), tuple(page.cropbox), page.rotation)).encode())
+        digest.update(repr(sorted(params.items())).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        查询缓存。
+
+        Returns:
+            未命中时返回 None；命中时返回裁剪区域元组，不需要裁剪的页面为空元组。
+        """
+        row = self._connect().execute("SELECT x0, y0, x1, y1 FROM crops WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._touched.append(key)
+        return () if row[0] is None else tuple(row)
+
+    def put(self, key, crop_rect):
+        """写入缓存，crop_rect 为 None 表示该页不需要裁剪。"""
+        values = (None,) * 4 if crop_rect is None else tuple(crop_rect)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO crops VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, *values, len(key) + _ENTRY_OVERHEAD, time.time()),
+        )
+
+    def flush(self):
+        """提交写入、更新命中记录的使用时间，并在超出容量时淘汰最久未使用的记录。"""
+        if self._connection is None:
+            return
+        connection = self._connection
+        now = time.time()
+        connection.executemany("UPDATE crops SET last_used = ? WHERE key = ?", ((now, key) for key in self._touched))
+        self._touched = []
+
+        total, count = connection.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM crops").fetchone()
+        if total > self.max_bytes and count:
+            # 淘汰到容量上限的 90%，避免每次写入都触发淘汰
+            excess = total - self.max_bytes * 0.9
+            evict = min(count, int(excess / (total / count)) + 1)
+            connection.execute(
+                "DELETE FROM crops WHERE key IN (SELECT key FROM crops ORDER BY last_used LIMIT ?)", (evict,)
+            )
+        connection.commit()
+
+    def close(self):
+        """提交并关闭数据库连接。"""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,515 @@
+"""文档转换：可替换的转换后端与常驻的转换进程池。
+
+Word、Visio 等格式需要借助外部程序转换为 PDF，而启动这些程序往往比转换本身慢得多。
+``ConverterPool`` 维护若干常驻的转换进程，每个进程按文件扩展名持有各自的后端实例，
+后端在第一次使用时启动（例如打开 Word），之后的文件复用同一个实例，直到进程池关闭。
+
+每个文件都有转换超时：超时的转换进程会被终止并在下次使用时重新启动，不会卡住后续文件；
+后端启动的外部程序（例如 COM 启动的 Word）按 ``process_ids`` 报告的进程号一并终止，不会遗留。
+转换进程数即并发上限。后端包括：
+
+- ``WordBackend``、``VisioBackend``：通过 Windows COM 调用 Office（需要 pywin32）；
+- ``SubprocessBackend``：调用本地命令行程序，默认使用 LibreOffice，可在 Linux 上运行。
+  注意每个文件仍会单独启动一次 soffice，常驻进程只省去 Python 端的启动，
+  省不掉 LibreOffice 本身的启动时间；
+- ``FakeBackend``：不依赖外部程序，生成一页说明来源的 PDF，用于测试。
+
+后端实例在启动前会被 pickle 传给转换进程，因此构造函数只应保存配置，
+真正占用资源的初始化放在 ``start`` 中。
+"""
+
+import abc
+import atexit
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .timing import stage
+
+# 默认的单个文件转换超时（秒）
+DEFAULT_CONVERT_TIMEOUT = 300
+
+# LibreOffice 无界面转换命令；{profile} 为每个后端实例独立的用户配置目录，
+# 使多个实例可以同时运行
+LIBREOFFICE_COMMAND = (
+    "soffice",
+    "-env:UserInstallation={profile}",
+    "--headless",
+    "--convert-to",
+    "pdf",
+    "--outdir",
+    "{outdir}",
+    "{input}",
+)
+
+
+class ConversionError(Exception):
+    """文档转换失败。"""
+
+
+class ConversionTimeout(ConversionError):
+    """文档转换超时，对应的转换进程已被终止。"""
+
+
+class ConverterBackend(abc.ABC):
+    """
+    转换后端的接口，子类必须实现 ``convert``，否则无法创建实例。
+
+    ``start`` 在转换进程中第一次使用该后端时调用，``convert`` 对每个文件调用一次，
+    ``close`` 在进程池关闭或转换出错后调用；出错后的下一个文件会重新调用 ``start``。
+    """
+
+    def start(self):
+        """启动外部程序等需要复用的资源。"""
+
+    @abc.abstractmethod
+    def convert(self, input_path, output_pdf_path):
+        """把 input_path 转换为 output_pdf_path，失败时抛出异常。"""
+
+    def close(self):
+        """释放 ``start`` 占用的资源。"""
+
+    def process_ids(self):
+        """
+        返回 ``start`` 启动、不会随转换进程退出的外部程序的进程号列表，默认为空。
+
+        转换超时或转换进程意外退出时，进程池终止转换进程后会一并终止这些进程。
+        """
+        return []
+
+
+class _ComBackend(ConverterBackend):
+    """通过 Windows COM 复用同一个 Office 应用程序实例，子类还须实现 ``_window_handle``。"""
+
+    prog_id = None
+
+    def __init__(self):
+        self._app = None
+        self._pid = None
+
+    def start(self):
+        import pythoncom
+        import win32com.client
+        import win32process
+
+        pythoncom.CoInitialize()  # 初始化COM库
+        # DispatchEx 总是启动独立的实例，不会接管用户已经打开的窗口
+        self._app = win32com.client.DispatchEx(self.prog_id)
+        self._app.Visible = False  # 不显示应用程序界面
+
+        # Office 由 COM 服务启动，不是转换进程的子进程，转换进程被终止时不会随之退出；
+        # 记下其进程号，超时后由进程池终止。找不到窗口时只是无法清理，不影响转换
+        try:
+            hwnd = self._window_handle()
+            self._pid = win32process.GetWindowThreadProcessId(hwnd)[1] if hwnd else None
+        except Exception:
+            self._pid = None
+
+    @abc.abstractmethod
+    def _window_handle(self):
+        """返回应用程序主窗口的句柄，用于确定进程号。"""
+
+    def process_ids(self):
+        return [self._pid] if self._pid else []
+
+    def close(self):
+        import pythoncom
+
+        if self._app is not None:
+            try:
+                self._app.Quit()
+            finally:
+                self._app = None
+                self._pid = None
+                pythoncom.CoUninitialize()
+
+
+class WordBackend(_ComBackend):
+    """使用 Word 把 .doc/.docx 转换为 PDF。"""
+
+    prog_id = "Word.Application"
+
+    def start(self):
+        super().start()
+        self._app.DisplayAlerts = 0  # 不弹出任何对话框
+
+    def _window_handle(self):
+        import win32gui
+
+        # Word 的 Application 没有窗口句柄属性：设置唯一的标题后按窗口类名查找
+        caption = f"pdfcrop-{os.getpid()}-{id(self)}"
+        self._app.Caption = caption
+        return win32gui.FindWindow("OpusApp", caption)
+
+    def convert(self, input_path, output_pdf_path):
+        doc = self._app.Documents.Open(os.path.abspath(input_path), ReadOnly=True)
+        try:
+            doc.SaveAs(os.path.abspath(output_pdf_path), FileFormat=17)  # 17表示保存为PDF格式
+        finally:
+            doc.Close(False)
+
+
+class VisioBackend(_ComBackend):
+    """使用 Visio 把 .vsd/.vsdx 转换为 PDF。"""
+
+    prog_id = "Visio.Application"
+
+    def start(self):
+        super().start()
+        self._app.AlertResponse = 7  # 自动回答对话框，不阻塞转换
+
+    def _window_handle(self):
+        return self._app.WindowHandle32
+
+    def convert(self, input_path, output_pdf_path):
+        doc = self._app.Documents.Open(os.path.abspath(input_path))
+        try:
+            doc.SaveAs(os.path.abspath(output_pdf_path), 32)  # 32表示保存为PDF格式
+        finally:
+            doc.Close()
+
+
+class SubprocessBackend(ConverterBackend):
+    """
+    调用本地命令行程序转换，程序把 ``<输入文件名>.pdf`` 写入 {outdir}。
+
+    每个文件各运行一次命令：默认的 LibreOffice 每次都要重新启动，与 Office COM 后端不同，
+    常驻的转换进程无法复用它。``start`` 只创建独立的用户配置目录，使 LibreOffice
+    不必每次重新初始化配置，并允许多个实例同时运行。
+
+    Args:
+        command: 命令参数列表，可使用占位符 {input}（输入路径）、{outdir}（输出目录）
+            与 {profile}（该后端实例独立的临时目录的 file URI），默认为 ``LIBREOFFICE_COMMAND``。
+        timeout: 单次命令的超时（秒），超时后终止命令，默认为 ``DEFAULT_CONVERT_TIMEOUT``。
+    """
+
+    def __init__(self, command=LIBREOFFICE_COMMAND, timeout=DEFAULT_CONVERT_TIMEOUT):
+        self.command = tuple(command)
+        self.timeout = timeout
+        self._profile_dir = None
+
+    def start(self):
+        self._profile_dir = tempfile.mkdtemp(prefix="pdfcrop_profile_")
+
+    def convert(self, input_path, output_pdf_path):
+        outdir = tempfile.mkdtemp(prefix="pdfcrop_convert_")
+        try:
+            values = {
+                "input": os.path.abspath(input_path),
+                "outdir": outdir,
+                "profile": Path(self._profile_dir).as_uri(),
+            }
+            args = [part.format(**values) for part in self.command]
+            completed = subprocess.run(args, capture_output=True, text=True, timeout=self.timeout)
+            converted = os.path.join(outdir, os.path.splitext(os.path.basename(input_path))[0] + ".pdf")
+            if completed.returncode != 0 or not os.path.exists(converted):
+                message = (completed.stderr or completed.stdout).strip()
+                raise ConversionError(f"转换命令失败（返回值 {completed.returncode}）: {message}")
+            shutil.move(converted, output_pdf_path)
+        finally:
+            shutil.rmtree(outdir, ignore_errors=True)
+
+    def close(self):
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+
+class FakeBackend(ConverterBackend):
+    """
+    测试用后端：生成一页写有来源文件名的 PDF。
+
+    PDF 的 subject 元数据为 ``"<进程号>:<该实例的启动次数>:<该实例已转换的文件数>"``，
+    可用于确认转换进程与后端实例是否被复用。
+
+    Args:
+        delay: 每次转换前等待的秒数，用于测试超时，默认为 0。
+        fail: 为 True 时每次转换都抛出异常，默认为 False。
+        helper: 为 True 时在 ``start`` 中启动一个空闲的子进程并由 ``process_ids`` 报告，
+            模拟 COM 启动的 Office，用于测试超时后的清理，默认为 False。
+    """
+
+    def __init__(self, delay=0, fail=False, helper=False):
+        self.delay = delay
+        self.fail = fail
+        self.helper = helper
+        self.starts = 0
+        self.converted = 0
+        self._helper = None
+
+    def start(self):
+        self.starts += 1
+        if self.helper:
+            self._helper = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(3600)"])
+
+    def process_ids(self):
+        return [self._helper.pid] if self._helper is not None else []
+
+    def close(self):
+        if self._helper is not None:
+            self._helper.kill()
+            self._helper.wait()
+            self._helper = None
+
+    def convert(self, input_path, output_pdf_path):
+        import fitz
+
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConversionError(f"模拟转换失败: {input_path}")
+        self.converted += 1
+        with fitz.open() as pdf_document:
+            page = pdf_document.new_page()
+            page.insert_text((72, 72), os.path.basename(input_path))
+            pdf_document.set_metadata({"subject": f"{os.getpid()}:{self.starts}:{self.converted}"})
+            pdf_document.save(output_pdf_path)
+
+
+def default_backends():
+    """
+    返回当前系统上默认的 ``{扩展名: 后端}``：Windows 上使用 Office COM，
+    其他系统上使用 LibreOffice。
+    """
+    if os.name == "nt":
+        word, visio = WordBackend(), VisioBackend()
+    else:
+        word = visio = SubprocessBackend()
+    return {".doc": word, ".docx": word, ".vsd": visio, ".vsdx": visio}
+
+
+def _worker_main(conn, backends):
+    """转换进程的主循环：按任务调用后端，并复用已启动的后端实例。"""
+    # 已启动的后端：id -> 后端；同一个实例可以对应多个扩展名
+    started = {}
+
+    def report_process_ids():
+        # 已启动的后端变化时把外部程序的进程号告知进程池
+        conn.send(("pids", [pid for backend in started.values() for pid in backend.process_ids()]))
+
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except EOFError:
+                break
+            if task is None:
+                break
+
+            input_path, output_pdf_path = task
+            backend = backends[os.path.splitext(input_path)[1].lower()]
+            try:
+                if id(backend) not in started:
+                    started[id(backend)] = backend
+                    backend.start()
+                    report_process_ids()
+                backend.convert(input_path, output_pdf_path)
+            except Exception as e:
+                # 出错后关闭该后端，下一个文件重新启动，避免复用状态异常的应用程序
+                if started.pop(id(backend), None) is not None:
+                    try:
+                        backend.close()
+                    except Exception:
+                        pass
+                    report_process_ids()
+                conn.send(("done", f"{type(e).__name__}: {e}"))
+            else:
+                conn.send(("done", None))
+    finally:
+        for backend in started.values():
+            try:
+                backend.close()
+            except Exception:
+                pass
+
+
+class _Worker:
+    """一个常驻的转换进程及与之通信的管道。"""
+
+    def __init__(self, context, backends):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, backends), daemon=True)
+        self.process.start()
+        child_conn.close()
+        # 后端启动的外部程序的进程号，由转换进程报告
+        self.process_ids = []
+
+    def run(self, task, timeout):
+        """
+        发送一个任务并等待结果。
+
+        Returns:
+            ``(是否在超时前完成, 出错信息或 None)``。
+
+        Raises:
+            EOFError, OSError: 转换进程意外退出。
+        """
+        self.conn.send(task)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not self.conn.poll(remaining):
+                return False, None
+            kind, value = self.conn.recv()
+            if kind == "pids":
+                self.process_ids = value
+            else:
+                return True, value
+
+    def stop(self, timeout):
+        """请求进程关闭后端并退出，超时则强制终止。"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            # 后端已正常关闭，外部程序已经退出
+            self.conn.close()
+
+    def kill(self):
+        """强制终止转换进程及其后端启动的外部程序。"""
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        for pid in self.process_ids:
+            try:
+                # Windows 上 os.kill 调用 TerminateProcess
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        self.process_ids = []
+        self.conn.close()
+
+
+class ConverterPool:
+    """
+    常驻的文档转换进程池，可以在多个线程中同时调用 ``convert``。
+
+    转换进程在第一次需要时才启动，之后一直保留到 ``close``；超时或意外退出的进程
+    会被丢弃，下次使用时重新启动。
+
+    Args:
+        backends: ``{扩展名: ConverterBackend}``，默认为 ``default_backends()``。
+        workers: 转换进程数，即同时进行的转换数上限，默认为 1。
+        timeout: 单个文件的转换超时（秒），默认为 ``DEFAULT_CONVERT_TIMEOUT``；None 表示不限时。
+    """
+
+    def __init__(self, backends=None, workers=1, timeout=DEFAULT_CONVERT_TIMEOUT):
+        self.backends = dict(default_backends() if backends is None else backends)
+        self.workers = max(int(workers), 1)
+        self.timeout = timeout
+        # COM 与 Tk 都不适合在 fork 出的子进程中继续使用，统一使用 spawn
+        self._context = multiprocessing.get_context("spawn")
+        # 空闲的转换进程；None 表示尚未启动的名额
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(None)
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def supports(self, path):
+        """返回是否有后端可以转换该文件。"""
+        return os.path.splitext(path)[1].lower() in self.backends
+
+    def converters(self):
+        """返回可直接传给 ``merge_files`` 的 ``{扩展名: convert}``。"""
+        return {extension: self.convert for extension in self.backends}
+
+    def convert(self, input_path, output_pdf_path):
+        """
+        把 input_path 转换为 output_pdf_path，在完成前阻塞。
+
+        Raises:
+            ValueError: 没有支持该文件类型的后端。
+            ConversionTimeout: 转换超时。
+            ConversionError: 后端转换失败或转换进程意外退出。
+        """
+        extension = os.path.splitext(input_path)[1].lower()
+        if extension not in self.backends:
+            raise ValueError(f"不支持的文件类型: {extension}")
+        if self._closed:
+            raise ConversionError("转换进程池已关闭")
+
+        # 没有空闲进程时在此等待，从而限制并发数
+        worker = self._idle.get()
+        try:
+            with stage("convert", input_path):
+                if worker is None:
+                    worker = _Worker(self._context, self.backends)
+                try:
+                    finished, message = worker.run(
+                        (os.path.abspath(input_path), os.path.abspath(output_pdf_path)), self.timeout
+                    )
+                except (EOFError, OSError):
+                    worker.kill()
+                    worker = None
+                    raise ConversionError(f"转换进程意外退出: {input_path}") from None
+                if not finished:
+                    worker.kill()
+                    worker = None
+                    raise ConversionTimeout(f"转换超时（{self.timeout} 秒）: {input_path}")
+        finally:
+            self._idle.put(worker)
+
+        if message is not None:
+            raise ConversionError(message)
+
+    def close(self, timeout=30):
+        """等待正在进行的转换完成，然后关闭所有后端与转换进程。"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in range(self.workers):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.stop(timeout)
+
+
+# convert_to_pdf 未指定进程池时共用的默认进程池
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def _get_default_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConverterPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def convert_to_pdf(input_path, output_pdf_path=None, pool=None):
+    """
+    使用转换后端把文档转换为 PDF。
+
+    Args:
+        input_path: 输入文件路径。
+        output_pdf_path: 输出 PDF 文件的路径，默认为 None（与输入文件同名、扩展名为 .pdf）。
+        pool: ``ConverterPool`` 对象，默认为 None（使用进程内共享、退出时关闭的默认进程池）。
+
+    Returns:
+        输出 PDF 文件的路径。
+    """
+    if output_pdf_path is None:
+        output_pdf_path = os.path.splitext(input_path)[0] + ".pdf"
+    (pool or _get_default_pool()).convert(input_path, output_pdf_path)
+    return output_pdf_path
@@ -0,0 +1,776 @@
+"""PDF 自动裁剪：逐页计算内容区域并生成裁剪后的文档。
+
+栅格检测依赖 NumPy，只在第一次渲染页面时才导入；只使用 vector 模式的调用方不会加载 NumPy。
+"""
+
+import io
+import math
+import os
+import random
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import BinaryIO, Callable, Optional, Union
+
+import fitz
+
+from .export import write_exported_figures
+from .options import (
+    CROP_MODES,
+    DEFAULT_EXPORT_DPI,
+    DEFAULT_EXPORT_TEMPLATE,
+    DEFAULT_FIGURE_GAP,
+    FIGURE_OUTPUTS,
+    OUTPUT_MODES,
+    CropOptions,
+    check_export_options,
+    parse_uniform_sample,
+)
+from .save import save_pdf
+from .timing import install_hooks, pool_hooks, stage
+from .vector import vector_content_rect
+
+# 页数少于该值的页段不值得单独启动进程
+MIN_SHARD_PAGES = 16
+
+# auto_crop_pdf 的返回值：处理的页数、输出文件字节数、保存耗时（秒）与实际写出的文件路径列表
+CropResult = namedtuple("CropResult", ["page_count", "bytes_written", "save_seconds", "output_paths"])
+
+
+class CropCancelled(Exception):
+    """处理被用户取消。"""
+
+
+def raster_crop_rect(page, border_width=5, detector=None, precision_dpi=None):
+    """
+    渲染页面并按像素检测内容区域。
+
+    先以 72 DPI 渲染整页求出粗略边界；如果指定了 precision_dpi，再只在四条边附近
+    渲染细长条带，以高分辨率细化边界。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        detector: 内容检测器，默认为 None（即 ``strict_detector``）。
+        precision_dpi: 细化边界时使用的分辨率，默认为 None（不细化，精度为 1 点）。
+
+    Returns:
+        裁剪区域的 ``fitz.Rect``；如果整个页面都是白色或只有边框，则返回 None。
+    """
+    # 延迟导入 NumPy，首次调用之后只是一次模块缓存查找
+    from .detect import find_content_box, strict_detector
+    from .render import render_gray
+
+    detector = detector or strict_detector
+
+    # gray 是 pix 样本缓冲区的视图，检测完成前 pix 必须保持存活
+    with stage("render", page):
+        pix, gray = render_gray(page)
+
+    # 寻找所有非白色像素，并且忽略边框
+    with stage("detect", page):
+        box = find_content_box(gray, border_width, detector)
+    if box is None:
+        return None
+
+    # box 的右、下边界已包含加一
+    rect = fitz.Rect(box)
+    if precision_dpi and precision_dpi > 72:
+        with stage("refine", page):
+            rect = refine_crop_rect(page, rect, precision_dpi, border_width, detector)
+    return rect
+
+
+def refine_crop_rect(page, rect, precision_dpi, border_width=5, detector=None):
+    """
+    以高分辨率渲染粗略边界四周的细长条带，细化裁剪区域。
+
+    72 DPI 下检测到的边界与真实边界的误差不超过一个像素，因此每条边只需渲染
+    该边两侧各一个点宽的条带。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        rect: 72 DPI 下检测到的粗略裁剪区域。
+        precision_dpi: 细化使用的分辨率。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        detector: 内容检测器，默认为 None（即 ``strict_detector``）。
+
+    Returns:
+        细化后的 ``fitz.Rect``。
+    """
+    from .detect import find_content_box, strict_detector
+    from .render import render_gray
+
+    detector = detector or strict_detector
+    zoom = precision_dpi / 72
+    border = max(border_width, 0)
+    inner = page.rect + (border, border, -border, -border)
+    left, top, right, bottom = rect
+
+    # 每个条带对应的边，以及从条带检测结果中取哪一项：(left, top, right, bottom) 的下标
+    strips = (
+        (0, fitz.Rect(left - 1, top - 1, left + 1, bottom + 1)),
+        (1, fitz.Rect(left - 1, top - 1, right + 1, top + 1)),
+        (2, fitz.Rect(right - 1, top - 1, right + 1, bottom + 1)),
+        (3, fitz.Rect(left - 1, bottom - 1, right + 1, bottom + 1)),
+    )
+
+    refined = list(rect)
+    for index, strip in strips:
+        strip &= inner
+        if strip.is_empty:
+            continue
+
+        pix, gray = render_gray(page, dpi=precision_dpi, clip=strip)
+        box = find_content_box(gray, 0, detector)
+        if box is None:
+            continue
+
+        # 条带像素坐标 -> 页面坐标
+        origin = pix.x if index in (0, 2) else pix.y
+        refined[index] = (origin + box[index]) / zoom
+
+    refined = fitz.Rect(refined) & inner
+    return refined if not refined.is_empty else rect
+
+
+def find_crop_rect(page, border_width=5, mode="raster", precision_dpi=None):
+    """
+    计算单个页面的裁剪区域。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        mode: 裁剪模式，取值见 ``CROP_MODES``，默认为 "raster"。
+        precision_dpi: 栅格检测时细化边界使用的分辨率，默认为 None（不细化）。
+
+    Returns:
+        裁剪区域的 ``fitz.Rect``；如果整个页面都是白色或只有边框，则返回 None。
+    """
+    if mode not in CROP_MODES:
+        raise ValueError(f"不支持的裁剪模式: {mode}")
+
+    if mode == "vector":
+        with stage("vector", page):
+            rect = vector_content_rect(page, border_width)
+        if rect is not None:
+            return None if rect.is_empty else rect
+
+    return raster_crop_rect(page, border_width, precision_dpi=precision_dpi)
+
+
+def find_figure_rects(page, border_width=5, gap=None, precision_dpi=None, min_size=0):
+    """
+    计算单个页面中每个图表的裁剪区域（多图表分割）。
+
+    分割总是基于 72 DPI 的栅格渲染；指定 precision_dpi 时再逐个细化每个区域的边界。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        gap: 图表之间至少相隔的空白宽度（点），默认为 None（即 ``DEFAULT_FIGURE_GAP``）。
+        precision_dpi: 细化边界使用的分辨率，默认为 None（不细化）。
+        min_size: 宽或高小于该值（点）的区域会被丢弃，默认为 0。
+
+    Returns:
+        ``fitz.Rect`` 列表，按阅读顺序排列；页面为空白时返回空列表。
+    """
+    from .render import render_gray
+    from .segment import segment_content_boxes
+
+    with stage("render", page):
+        pix, gray = render_gray(page)
+    with stage("segment", page):
+        gap = DEFAULT_FIGURE_GAP if gap is None else gap
+        boxes = segment_content_boxes(gray, border_width, gap, min_size=min_size)
+
+    rects = [fitz.Rect(box) for box in boxes]
+    if precision_dpi and precision_dpi > 72:
+        with stage("refine", page):
+            rects = [refine_crop_rect(page, rect, precision_dpi, border_width) for rect in rects]
+    return rects
+
+
+def _cached_crop_rect(page, border_width, mode, precision_dpi, cache):
+    """计算单页裁剪区域（元组形式），命中缓存时跳过检测。"""
+    if cache is None:
+        crop_rect = find_crop_rect(page, border_width, mode, precision_dpi)
+        return None if crop_rect is None else tuple(crop_rect)
+
+    with stage("cache", page):
+        key = cache.page_key(page, border_width=border_width, mode=mode, precision_dpi=precision_dpi)
+        cached = cache.get(key)
+    if cached is not None:
+        return cached or None
+
+    crop_rect = find_crop_rect(page, border_width, mode, precision_dpi)
+    crop_rect = None if crop_rect is None else tuple(crop_rect)
+    cache.put(key, crop_rect)
+    return crop_rect
+
+
+def _find_crop_rects(
+    pdf_document, start, stop, border_width, mode, precision_dpi, cache, progress=None, figure_gap=None
+):
+    """
+    计算 [start, stop) 页的裁剪区域，每完成一页调用一次 progress(已完成页数, 总页数)。
+
+    指定 figure_gap 时按图表分割，每页的结果为裁剪区域列表（不使用缓存）。
+    """
+    crop_rects = []
+    try:
+        for page_number in range(start, stop):
+            page = pdf_document[page_number]
+            if figure_gap is None:
+                crop_rects.append(_cached_crop_rect(page, border_width, mode, precision_dpi, cache))
+            else:
+                figure_rects = find_figure_rects(page, border_width, figure_gap, precision_dpi)
+                crop_rects.append([tuple(rect) for rect in figure_rects] or None)
+            if progress is not None:
+                progress(len(crop_rects), stop - start)
+    finally:
+        if cache is not None:
+            cache.flush()
+    return crop_rects
+
+
+def _uniform_sample_pages(page_count, first, random_count):
+    """
+    统一裁剪时抽样的页码：开头的 first 页加上其余页面中随机抽取的 random_count 页。
+
+    随机数以页数为种子，同一文档每次抽到相同的页面，结果可以复现（增量清单、缓存依赖于此）。
+    """
+    head = list(range(min(first, page_count)))
+    rest = range(len(head), page_count)
+    tail = random.Random(page_count).sample(rest, min(random_count, len(rest)))
+    return head + sorted(tail)
+
+
+def _percentile_rect(rects, percentile):
+    """
+    各边分别取百分位数（最近秩）的矩形：percentile 为 100 时即并集，
+    较小的取值会忽略少数向外突出的页面。
+    """
+    count = len(rects)
+    rank = max(1, math.ceil(percentile / 100 * count))
+    lows = [sorted(rect[index] for rect in rects)[count - rank] for index in (0, 1)]
+    highs = [sorted(rect[index] for rect in rects)[rank - 1] for index in (2, 3)]
+    return fitz.Rect(lows[0], lows[1], highs[0], highs[1])
+
+
+def _bboxlog_fits(page, rect, border_width):
+    """不渲染页面，检查 ``page.get_bboxlog()`` 中各绘制操作的外接矩形（忽略边框）是否都在 rect 之内。"""
+    border = max(border_width, 0)
+    inner = page.rect + (border, border, -border, -border)
+    return all(rect.contains(fitz.Rect(bbox) & inner) for _, bbox in page.get_bboxlog())
+
+
+def _fits_uniform_rect(page, rect, border_width, use_bboxlog=True):
+    """
+    检查页面在 rect 之外（忽略边框）是否没有内容。
+
+    先用 ``_bboxlog_fits`` 检查，通过即可确定而不需要渲染；否则（例如有整页的白色背景）
+    以 72 DPI 渲染一次整页检查，省去细化。72 DPI 的检测精度为一个点，因此与向外取整到
+    整数坐标的 rect 比较：细化过的 rect 与内容紧贴其边缘的页面（如模板的边框）仍然符合。
+    """
+    from .detect import find_content_box, strict_detector
+    from .render import render_gray
+
+    if use_bboxlog and _bboxlog_fits(page, rect, border_width):
+        return True
+
+    pix, gray = render_gray(page)
+    box = find_content_box(gray, border_width, strict_detector)
+    grid_rect = fitz.Rect(math.floor(rect.x0), math.floor(rect.y0), math.ceil(rect.x1), math.ceil(rect.y1))
+    return box is None or grid_rect.contains(fitz.Rect(box))
+
+
+def _page_size(page):
+    """页面（已考虑旋转）的宽与高，保留两位小数以便比较。"""
+    return round(page.rect.width, 2), round(page.rect.height, 2)
+
+
+def _uniform_crop_rects(
+    pdf_document, border_width, mode, precision_dpi, cache, sample, percentile=100, progress=None
+):
+    """
+    统一裁剪：只对抽样页面做完整检测，求出一个共同的裁剪区域应用到所有页面。
+
+    共同区域由与最常见的页面尺寸相同、且不是空白的抽样页面的裁剪区域求出，
+    各边按 percentile 取百分位数。其余页面只做 ``_fits_uniform_rect`` 的廉价检查：
+    尺寸相同且内容都在共同区域之内的页面直接使用共同区域，否则回退为逐页检测；
+    抽样页面中内容超出共同区域的（percentile 小于 100 时）保留各自的检测结果。
+
+    Returns:
+        与 ``_find_crop_rects`` 相同，每页一个 ``(x0, y0, x1, y1)`` 元组或 None。
+    """
+    page_count = pdf_document.page_count
+    sample_pages = _uniform_sample_pages(page_count, *sample)
+    done = 0
+    try:
+        sampled = {}
+        for page_number in sample_pages:
+            page = pdf_document[page_number]
+            crop_rect = _cached_crop_rect(page, border_width, mode, precision_dpi, cache)
+            sampled[page_number] = (_page_size(page), crop_rect)
+            done += 1
+            if progress is not None:
+                progress(done, page_count)
+
+        # 抽样页面都为空白时没有共同区域，全部逐页检测
+        sizes = Counter(size for size, rect in sampled.values() if rect is not None)
+        uniform_size = sizes.most_common(1)[0][0] if sizes else None
+        if uniform_size is not None:
+            uniform_rect = _percentile_rect(
+                [rect for size, rect in sampled.values() if rect is not None and size == uniform_size], percentile
+            )
+            # 带整页白色背景等的文档 bboxlog 检查总是不通过，抽样页面上都不通过时直接渲染检查
+            use_bboxlog = any(
+                _bboxlog_fits(pdf_document[page_number], uniform_rect, border_width)
+                for page_number, (size, _) in sampled.items()
+                if size == uniform_size
+            )
+
+        crop_rects = []
+        for page_number in range(page_count):
+            if page_number in sampled:
+                size, crop_rect = sampled[page_number]
+                # 空白页面与内容在共同区域之内的抽样页面使用共同区域
+                if size == uniform_size and (crop_rect is None or uniform_rect.contains(crop_rect)):
+                    crop_rect = tuple(uniform_rect)
+                crop_rects.append(crop_rect)
+                continue
+
+            page = pdf_document[page_number]
+            fits = False
+            if _page_size(page) == uniform_size:
+                with stage("fit", page):
+                    fits = _fits_uniform_rect(page, uniform_rect, border_width, use_bboxlog)
+            if fits:
+                crop_rects.append(tuple(uniform_rect))
+            else:
+                crop_rects.append(_cached_crop_rect(page, border_width, mode, precision_dpi, cache))
+            done += 1
+            if progress is not None:
+                progress(done, page_count)
+    finally:
+        if cache is not None:
+            cache.flush()
+    return crop_rects
+
+
+def compute_crop_rects(
+    input_pdf_path,
+    start=0,
+    stop=None,
+    border_width=5,
+    mode="raster",
+    precision_dpi=None,
+    cache=None,
+    figure_gap=None,
+):
+    """
+    独立打开文档并计算一段页面的裁剪区域，可在子进程中调用。
+
+    Args:
+        input_pdf_path: 输入 PDF 文件的路径。
+        start: 起始页（包含），默认为 0。
+        stop: 结束页（不包含），默认为 None（到最后一页）。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        mode: 裁剪模式，取值见 ``CROP_MODES``，默认为 "raster"。
+        precision_dpi: 栅格检测时细化边界使用的分辨率，默认为 None（不细化）。
+        cache: ``CropCache`` 对象，默认为 None（不使用缓存）。
+        figure_gap: 按图表分割时图表之间的最小空白宽度（点），默认为 None（不分割）。
+
+    Returns:
+        每页一个 ``(x0, y0, x1, y1)`` 元组；不需要裁剪的页面为 None。按图表分割时，
+        每页为这样的元组组成的列表。
+    """
+    with stage("open", input_pdf_path):
+        pdf_document = fitz.open(input_pdf_path)
+    with pdf_document:
+        stop = pdf_document.page_count if stop is None else stop
+        return _find_crop_rects(
+            pdf_document, start, stop, border_width, mode, precision_dpi, cache, figure_gap=figure_gap
+        )
+
+
+def _page_shards(page_count, jobs):
+    """把页面均分为最多 jobs 段，每段不少于 MIN_SHARD_PAGES 页。"""
+    shard_count = max(1, min(jobs or 1, page_count // MIN_SHARD_PAGES))
+    size = max(1, -(-page_count // shard_count))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _compute_sharded_crop_rects(
+    input_pdf_path, shards, border_width, mode, precision_dpi, cache, progress=None, figure_gap=None
+):
+    """在进程池中按页段并行计算裁剪区域，并按原页序拼接结果；每完成一段调用一次 progress。"""
+    page_count = shards[-1][1]
+    # 已注册的可 pickle 钩子在子进程中同样生效
+    with ProcessPoolExecutor(
+        max_workers=len(shards), initializer=install_hooks, initargs=(pool_hooks(),)
+    ) as executor:
+        futures = [
+            executor.submit(
+                compute_crop_rects,
+                input_pdf_path,
+                start,
+                stop,
+                border_width,
+                mode,
+                precision_dpi,
+                cache,
+                figure_gap,
+            )
+            for start, stop in shards
+        ]
+        if progress is not None:
+            done = 0
+            for future in as_completed(futures):
+                done += len(future.result())
+                progress(done, page_count)
+        return [crop_rect for future in futures for crop_rect in future.result()]
+
+
+def append_cropped_pages(output_pdf, pdf_document, crop_rects):
+    """
+    按裁剪区域把源文档的页面逐页追加到 output_pdf 末尾。
+
+    每页都会以 Form XObject 的形式嵌入新页面，兼容忽略 CropBox 的阅读器，
+    但原页面的链接与注释不会保留。页面内容在追加时即复制到 output_pdf 中，
+    之后可以立即关闭源文档。
+
+    Args:
+        output_pdf: 要追加页面的目标文档。
+        pdf_document: 已打开的源文档。
+        crop_rects: 与源文档页面一一对应的裁剪区域，None 表示该页不裁剪；
+            为列表时（按图表分割）每个裁剪区域各生成一页。
+    """
+    for page_number, crop_rect in enumerate(crop_rects):
+        # 如果整个页面都是白色或只有边框，则不裁剪
+        with stage("compose", pdf_document, page_number):
+            if crop_rect is None:
+                page_rect = pdf_document[page_number].rect
+                new_page = output_pdf.new_page(width=page_rect.width, height=page_rect.height)
+                new_page.show_pdf_page(new_page.rect, pdf_document, page_number)
+                continue
+
+            for figure_rect in crop_rect if isinstance(crop_rect, list) else [crop_rect]:
+                # 创建新的 PDF 页面
+                figure_rect = fitz.Rect(figure_rect)
+                new_page = output_pdf.new_page(width=figure_rect.width, height=figure_rect.height)
+
+                # 从原始页面提取并显示内容
+                new_page.show_pdf_page(new_page.rect, pdf_document, page_number, clip=figure_rect)
+
+
+def write_cropped_pdf(pdf_document, crop_rects, output_pdf_path, save_profile="fast"):
+    """
+    按裁剪区域逐页生成新文档并保存，页面的生成方式见 ``append_cropped_pages``。
+
+    Args:
+        pdf_document: 已打开的源文档。
+        crop_rects: 与源文档页面一一对应的裁剪区域，None 表示该页不裁剪；
+            为列表时（按图表分割）每个裁剪区域各生成一页。
+        output_pdf_path: 输出 PDF 文件的路径。
+        save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+
+    Returns:
+        ``(写入字节数, 保存耗时秒数)``。
+    """
+    output_pdf = fitz.open()
+    append_cropped_pages(output_pdf, pdf_document, crop_rects)
+
+    # 保存输出 PDF
+    with stage("save", output_pdf_path):
+        return save_pdf(output_pdf, output_pdf_path, save_profile)
+
+
+def figure_file_path(output_pdf_path, page_number, figure_index):
+    """按图表分割并逐个输出文件时，第 page_number 页（从 0 开始）第 figure_index 个图表的文件路径。"""
+    stem, extension = os.path.splitext(output_pdf_path)
+    return f"{stem}_p{page_number + 1}_{figure_index + 1}{extension}"
+
+
+def is_path(value):
+    """value 是否为文件路径（字符串或 ``os.PathLike``），而不是内存数据或文件对象。"""
+    return isinstance(value, (str, os.PathLike))
+
+
+def open_pdf(source):
+    """
+    打开 PDF 文档。
+
+    Args:
+        source: 文件路径；``bytes``、``bytearray``、``memoryview`` 等内存数据；
+            或有 ``read`` 方法的二进制文件对象（如 ``sys.stdin.buffer``）。内存数据直接从内存打开，不写临时文件。
+
+    Returns:
+        打开的 ``fitz.Document``。
+    """
+    if is_path(source):
+        return fitz.open(os.fspath(source))
+    if hasattr(source, "read"):
+        source = source.read()
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def write_figure_files(pdf_document, crop_rects, output_pdf_path, save_profile="fast"):
+    """
+    按图表分割的结果把每个图表保存为单独的文件，文件名见 ``figure_file_path``。
+
+    Args:
+        pdf_document: 已打开的源文档。
+        crop_rects: 与源文档页面一一对应的裁剪区域列表，None 表示该页没有图表。
+        output_pdf_path: 输出 PDF 文件的路径，用作各图表文件名的前缀。
+        save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+
+    Returns:
+        ``(合计写入字节数, 合计保存耗时秒数, 写出的文件路径列表)``。
+    """
+    bytes_written = 0
+    save_seconds = 0.0
+    figure_paths = []
+    for page_number, figure_rects in enumerate(crop_rects):
+        for figure_index, figure_rect in enumerate(figure_rects or []):
+            figure_pdf = fitz.open()
+            with stage("compose", pdf_document, page_number):
+                figure_rect = fitz.Rect(figure_rect)
+                new_page = figure_pdf.new_page(width=figure_rect.width, height=figure_rect.height)
+                new_page.show_pdf_page(new_page.rect, pdf_document, page_number, clip=figure_rect)
+
+            figure_path = figure_file_path(output_pdf_path, page_number, figure_index)
+            with stage("save", figure_path):
+                size, seconds = save_pdf(figure_pdf, figure_path, save_profile)
+            bytes_written += size
+            save_seconds += seconds
+            figure_paths.append(figure_path)
+    return bytes_written, save_seconds, figure_paths
+
+
+def set_page_crop(page, crop_rect):
+    """
+    把页面的 CropBox 与 MediaBox 设置为裁剪区域。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        crop_rect: 裁剪区域，使用 ``page.rect`` 的坐标（已考虑页面旋转）。
+    """
+    # 转换为旋转前、以当前 CropBox 左上角为原点的坐标，再加上 CropBox 的位置
+    cropbox = page.cropbox
+    rect = fitz.Rect(crop_rect) * page.derotation_matrix
+    rect += (cropbox.x0, cropbox.y0, cropbox.x0, cropbox.y0)
+    page.set_cropbox(rect)
+
+    # set_mediabox 使用 PDF 原始坐标，并会移除 CropBox，因此取回原始值后重新写入
+    document = page.parent
+    box = document.xref_get_key(page.xref, "CropBox")[1]
+    page.set_mediabox(fitz.Rect([float(value) for value in box.strip("[]").split()]))
+    document.xref_set_key(page.xref, "CropBox", box)
+
+
+def write_cropbox_pdf(pdf_document, crop_rects, output_pdf_path, save_profile="fast"):
+    """
+    直接修改原文档每页的 CropBox 与 MediaBox 并另存，不重建页面。
+
+    保存速度快、文件小，并保留原页面的链接与注释。保存后 pdf_document 会被关闭。
+
+    Args:
+        pdf_document: 已打开的源文档。
+        crop_rects: 与源文档页面一一对应的裁剪区域，None 表示该页不裁剪。
+        output_pdf_path: 输出 PDF 文件的路径。
+        save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+
+    Returns:
+        ``(写入字节数, 保存耗时秒数)``。
+    """
+    for page_number, crop_rect in enumerate(crop_rects):
+        if crop_rect is not None:
+            with stage("compose", pdf_document, page_number):
+                set_page_crop(pdf_document[page_number], crop_rect)
+
+    with stage("save", output_pdf_path):
+        return save_pdf(pdf_document, output_pdf_path, save_profile)
+
+
+def auto_crop_pdf(
+    input_pdf_path,
+    output_pdf_path,
+    border_width=5,
+    mode="raster",
+    precision_dpi=None,
+    jobs=1,
+    cache=None,
+    output_mode="rebuild",
+    save_profile="fast",
+    progress=None,
+    figure_gap=None,
+    figure_output="pages",
+    uniform=None,
+    uniform_percentile=100,
+    export_format=None,
+    export_dpi=DEFAULT_EXPORT_DPI,
+    export_template=DEFAULT_EXPORT_TEMPLATE,
+):
+    """
+    自动裁剪 PDF 文件中的图表，去除周围空白，并忽略指定宽度的边框。
+
+    Args:
+        input_pdf_path: 输入 PDF 文件的路径，也可以是内存数据或二进制文件对象，见 ``open_pdf``。
+        output_pdf_path: 输出 PDF 文件的路径，也可以是有 ``write`` 方法的二进制文件对象；
+            需要 bytes 结果时可使用 ``crop_bytes``。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        mode: 裁剪模式，取值见 ``CROP_MODES``，默认为 "raster"。
+        precision_dpi: 栅格检测时细化边界使用的分辨率，默认为 None（不细化）。
+        jobs: 计算裁剪区域的并行进程数，默认为 1。大于 1 时，页数较多的文档会按页段
+            拆分给多个进程，各进程独立打开源文件，最后按原页序合成一个输出文件。
+            输入为内存数据时总是在当前进程中计算。
+        cache: ``CropCache`` 对象，默认为 None（不使用缓存）。命中缓存的页面跳过检测，只合成输出。
+        output_mode: 输出方式，取值见 ``OUTPUT_MODES``，默认为 "rebuild"。
+        save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+        progress: 进度回调 ``progress(已完成页数, 总页数)``，默认为 None。回调中抛出的异常
+            （例如 ``CropCancelled``）会中止处理，且不会写出输出文件。
+        figure_gap: 按图表分割时图表之间的最小空白宽度（点），默认为 None（不分割，
+            每页只裁剪出一个区域）。分割总是使用栅格检测、不使用缓存，且只支持 rebuild 输出方式。
+        figure_output: 分割出的图表的输出方式，取值见 ``FIGURE_OUTPUTS``，默认为 "pages"
+            （每个图表在输出文件中各占一页）；"files" 则每个图表保存为单独的文件。
+        uniform: 统一裁剪的抽样页数 ``(开头的页数, 随机抽取的页数)``，默认为 None（逐页裁剪）。
+            指定时只对抽样页面做完整检测，求出一个共同的裁剪区域，其余页面经廉价检查确认内容
+            都在该区域之内后直接使用它，页面尺寸因此保持一致；检查不通过的页面回退为逐页检测。
+            统一裁剪在当前进程中进行，不按页段拆分，也不能与按图表分割同时使用。
+        uniform_percentile: 共同区域的各边取抽样区域边界的百分位数，默认为 100（并集）；
+            较小的取值会忽略少数内容向外突出的抽样页面，这些页面保留各自的裁剪区域。
+        export_format: 把每个裁剪区域直接导出为图片，取值见 ``EXPORT_FORMATS``，默认为 None
+            （输出 PDF）。指定时不写出 PDF，output_mode、save_profile 与 figure_output 不起作用；
+            文件名由 export_template 与 output_pdf_path 决定（见 ``export_file_path``），
+            整页空白的页面不导出。jobs 大于 1 时导出同样分给多个进程。
+        export_dpi: 导出 PNG 的分辨率，默认为 300。
+        export_template: 导出文件名的模板，默认为 ``DEFAULT_EXPORT_TEMPLATE``。
+
+    Returns:
+        ``CropResult``：处理的页数、输出文件字节数、保存耗时（导出时为图片合计的字节数与导出耗时）
+        与实际写出的文件路径（图表逐个输出或导出图片时为各个文件，输出为文件对象时为空列表）。
+    """
+    if output_mode not in OUTPUT_MODES:
+        raise ValueError(f"不支持的输出方式: {output_mode}")
+    if figure_output not in FIGURE_OUTPUTS:
+        raise ValueError(f"不支持的图表输出方式: {figure_output}")
+    if figure_gap is not None and output_mode != "rebuild":
+        raise ValueError("按图表分割只支持 rebuild 输出方式")
+    if uniform is not None:
+        uniform = parse_uniform_sample(uniform)
+        if figure_gap is not None:
+            raise ValueError("统一裁剪不能与按图表分割同时使用")
+    if figure_gap is not None and figure_output == "files" and not is_path(output_pdf_path):
+        raise ValueError("图表逐个输出为文件时输出必须是路径")
+    check_export_options(export_format, export_dpi, export_template)
+    if export_format is not None and not is_path(output_pdf_path):
+        raise ValueError("导出图片时输出必须是路径")
+
+    # 计时记录中的文件名；内存数据没有路径
+    source_name = os.fspath(input_pdf_path) if is_path(input_pdf_path) else "<memory>"
+
+    # file 阶段包含该文件的全部其他阶段
+    with stage("file", source_name):
+        with stage("open", source_name):
+            pdf_document = open_pdf(input_pdf_path)
+        page_count = pdf_document.page_count
+
+        try:
+            # 子进程按路径重新打开源文件，内存数据与统一裁剪不拆分
+            shards = _page_shards(page_count, jobs if is_path(input_pdf_path) and uniform is None else 1)
+            if uniform is not None:
+                crop_rects = _uniform_crop_rects(
+                    pdf_document, border_width, mode, precision_dpi, cache, uniform, uniform_percentile, progress
+                )
+            elif len(shards) > 1:
+                crop_rects = _compute_sharded_crop_rects(
+                    source_name, shards, border_width, mode, precision_dpi, cache, progress, figure_gap
+                )
+            else:
+                crop_rects = _find_crop_rects(
+                    pdf_document, 0, page_count, border_width, mode, precision_dpi, cache, progress, figure_gap
+                )
+        except BaseException:
+            pdf_document.close()
+            raise
+
+        # 写出失败时同样关闭源文档；保存成功时 save_pdf 已经关闭了它
+        try:
+            if export_format is not None:
+                bytes_written, save_seconds, output_paths = write_exported_figures(
+                    pdf_document,
+                    crop_rects,
+                    os.fspath(output_pdf_path),
+                    export_format,
+                    export_dpi,
+                    export_template,
+                    jobs,
+                    source_name if is_path(input_pdf_path) else None,
+                )
+            elif figure_gap is not None and figure_output == "files":
+                bytes_written, save_seconds, output_paths = write_figure_files(
+                    pdf_document, crop_rects, output_pdf_path, save_profile
+                )
+            else:
+                if output_mode == "cropbox":
+                    bytes_written, save_seconds = write_cropbox_pdf(
+                        pdf_document, crop_rects, output_pdf_path, save_profile
+                    )
+                else:
+                    bytes_written, save_seconds = write_cropped_pdf(
+                        pdf_document, crop_rects, output_pdf_path, save_profile
+                    )
+                # 写入文件对象时没有输出路径
+                output_paths = [os.fspath(output_pdf_path)] if is_path(output_pdf_path) else []
+        finally:
+            if not pdf_document.is_closed:
+                pdf_document.close()
+        return CropResult(page_count, bytes_written, save_seconds, output_paths)
+
+
+def crop_document(
+    input_pdf_path: Union[str, "os.PathLike[str]", bytes, BinaryIO],
+    output_pdf_path: Union[str, "os.PathLike[str]", BinaryIO],
+    options: Optional[CropOptions] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> CropResult:
+    """
+    按 ``CropOptions`` 裁剪一个 PDF 文件，供其他程序以库的方式调用。
+
+    Args:
+        input_pdf_path: 输入 PDF 文件的路径、内存数据或二进制文件对象。
+        output_pdf_path: 输出 PDF 文件的路径或二进制文件对象。
+        options: 裁剪选项，默认为 None（全部使用默认值）。
+        progress: 进度回调 ``progress(已完成页数, 总页数)``，默认为 None。
+
+    Returns:
+        ``CropResult``：处理的页数、输出文件字节数与保存耗时。
+    """
+    options = options or CropOptions()
+    if is_path(input_pdf_path):
+        input_pdf_path = os.fspath(input_pdf_path)
+    if is_path(output_pdf_path):
+        output_pdf_path = os.fspath(output_pdf_path)
+    return auto_crop_pdf(input_pdf_path, output_pdf_path, progress=progress, **options.as_kwargs())
+
+
+def crop_bytes(
+    data: Union[bytes, bytearray, memoryview, BinaryIO],
+    options: Optional[CropOptions] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> bytes:
+    """
+    在内存中裁剪 PDF，不读写任何临时文件，适合服务端或管道中使用。
+
+    Args:
+        data: PDF 文件内容，或有 ``read`` 方法的二进制文件对象。
+        options: 裁剪选项，默认为 None（全部使用默认值）。figure_output 不能为 "files"。
+        progress: 进度回调 ``progress(已完成页数, 总页数)``，默认为 None。
+
+    Returns:
+        裁剪后的 PDF 文件内容。
+    """
+    output = io.BytesIO()
+    crop_document(data, output, options, progress)
+    return output.getvalue()
@@ -0,0 +1,85 @@
+"""基于 NumPy 的内容区域检测引擎。
+
+检测器（detector）是一个可调用对象：接收去掉边框后的灰度区域（二维 uint8 数组），
+返回两个布尔向量 ``(rows, cols)``，分别表示每一行、每一列是否含有内容。
+``find_content_box`` 负责屏蔽边框、调用检测器并把行列结果归约为边界框。
+"""
+
+import math
+
+import numpy as np
+
+
+def strict_detector(region):
+    """默认检测器：任何小于 255 的像素都视为内容，与原先逐像素循环的判断一致。"""
+    return threshold_detector(255)(region)
+
+
+def threshold_detector(threshold):
+    """
+    创建按白度阈值判断的检测器。
+
+    Args:
+        threshold: 灰度值小于该阈值的像素视为内容，例如 250 可忽略抗锯齿产生的浅灰噪点。
+    """
+
+    def detect(region):
+        # 按行、列取最小值即可判断是否存在深于阈值的像素，无需生成完整掩码
+        rows = region.min(axis=1) < threshold
+        cols = region.min(axis=0) < threshold
+        return rows, cols
+
+    return detect
+
+
+def ink_fraction_detector(min_fraction, threshold=255):
+    """
+    创建按最小墨水比例判断的检测器。
+
+    Args:
+        min_fraction: 一行（或一列）中内容像素所占比例达到该值时才视为内容，取值 0~1。
+        threshold: 灰度值小于该阈值的像素视为内容像素，默认为 255。
+    """
+
+    def detect(region):
+        mask = region < threshold
+        height, width = mask.shape
+        rows = np.count_nonzero(mask, axis=1) >= max(1, math.ceil(min_fraction * width))
+        cols = np.count_nonzero(mask, axis=0) >= max(1, math.ceil(min_fraction * height))
+        return rows, cols
+
+    return detect
+
+
+def find_content_box(gray, border_width=5, detector=strict_detector):
+    """
+    在灰度图像中查找内容区域，并忽略指定宽度的边框。
+
+    Args:
+        gray: 灰度图像，形状为 (height, width) 的 uint8 数组。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        detector: 内容检测器，默认为 ``strict_detector``。
+
+    Returns:
+        内容区域 ``(left, top, right, bottom)``，right 与 bottom 为开区间（即已加一）；
+        如果整个页面都是白色或只有边框，则返回 None。
+    """
+    height, width = gray.shape[:2]
+    border = max(int(border_width), 0)
+
+    # 去掉边框后再检测，边框内的像素不参与计算
+    region = gray[border:height - border, border:width - border]
+    if region.size == 0:
+        return None
+
+    rows, cols = detector(region)
+    row_indices = np.flatnonzero(rows)
+    col_indices = np.flatnonzero(cols)
+    if row_indices.size == 0 or col_indices.size == 0:
+        return None
+
+    left = border + int(col_indices[0])
+    top = border + int(row_indices[0])
+    right = border + int(col_indices[-1]) + 1
+    bottom = border + int(row_indices[-1]) + 1
+    return left, top, right, bottom
@@ -0,0 +1,77 @@
+"""递归查找输入文件，并按输入目录结构生成输出路径。
+
+``iter_files`` 是生成器：边遍历目录边产出文件，不会先列出整棵目录树，
+处理几十万个文件的归档时也能立即开始裁剪，内存占用只与目录深度和单个目录的大小有关。
+"""
+
+import fnmatch
+import os
+
+
+def _matches(name, relative_path, patterns):
+    """文件名或相对路径（以 / 分隔）匹配任一通配符（不区分大小写）。"""
+    name = name.lower()
+    relative_path = relative_path.lower()
+    return any(
+        fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(relative_path, pattern) for pattern in patterns
+    )
+
+
+def iter_files(roots, include=("*.pdf",), exclude=(), skip_dirs=()):
+    """
+    递归遍历目录，按文件名顺序逐个产出匹配的文件。
+
+    Args:
+        roots: 要遍历的目录列表。
+        include: 文件名通配符，匹配任一即纳入，默认为 ``("*.pdf",)``。
+        exclude: 排除的通配符，匹配文件名、目录名或相对于根目录的路径（以 / 分隔，
+            如 ``"drafts/*"``）；匹配的目录整棵跳过。默认为空。
+        skip_dirs: 始终跳过的目录（例如位于输入目录中的输出文件夹），默认为空。
+
+    Yields:
+        ``(文件路径, 所在的根目录)``。不跟随指向目录的符号链接，无法读取的目录会被跳过。
+    """
+    include = tuple(pattern.lower() for pattern in include)
+    exclude = tuple(pattern.lower() for pattern in exclude)
+    skipped = {os.path.normcase(os.path.abspath(path)) for path in skip_dirs}
+
+    for root in roots:
+        # 深度优先，用栈代替递归；元素为 (目录, 相对于根目录的路径)
+        pending = [(root, "")]
+        while pending:
+            directory, relative_dir = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    entries = sorted(entries, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                relative_path = f"{relative_dir}{entry.name}"
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if exclude and _matches(entry.name, relative_path, exclude):
+                        continue
+                    if os.path.normcase(os.path.abspath(entry.path)) in skipped:
+                        continue
+                    subdirs.append((entry.path, relative_path + "/"))
+                elif _matches(entry.name, relative_path, include) and not (
+                    exclude and _matches(entry.name, relative_path, exclude)
+                ):
+                    yield entry.path, root
+            pending.extend(reversed(subdirs))
+
+
+def mirrored_output_path(input_path, root, output_folder, suffix="_cropped.pdf"):
+    """
+    返回保持目录结构的输出路径：``<输出文件夹>/<相对于 root 的目录>/<文件名><suffix>``。
+
+    不同子文件夹中的同名文件因此不会互相覆盖。输出目录不存在时由调用方创建。
+    """
+    relative_dir = os.path.dirname(os.path.relpath(input_path, root))
+    output_file_name = os.path.splitext(os.path.basename(input_path))[0] + suffix
+    return os.path.join(output_folder, relative_dir, output_file_name)
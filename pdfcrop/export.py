@@ -0,0 +1,133 @@
+"""把裁剪区域直接导出为 PNG 或 SVG 图片，不生成中间 PDF。
+
+PNG 以目标分辨率只渲染裁剪区域（``get_pixmap(clip=...)``），每个区域只渲染一次；
+SVG 在内存中新建一页、以 Form XObject 嵌入裁剪区域后转换，文字与线条保持矢量。
+区域较多时交错分给进程池，各进程独立打开源文件并行导出。
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+from .options import DEFAULT_EXPORT_DPI, DEFAULT_EXPORT_TEMPLATE, EXPORT_FORMATS
+from .timing import install_hooks, pool_hooks, stage
+
+# 每个进程至少分到的区域数，区域更少时不值得启动进程
+MIN_EXPORT_SHARD = 8
+
+
+def export_file_path(output_pdf_path, page_number, figure_index, export_format, template=DEFAULT_EXPORT_TEMPLATE):
+    """
+    按文件名模板返回第 page_number 页（从 0 开始）第 figure_index 个区域的导出路径。
+
+    模板可用的字段：stem（输出 PDF 的文件名去掉扩展名）、page（页码，从 1 开始）、
+    index（该页中的序号，从 1 开始）与 ext（导出格式），支持格式说明，如 ``{page:03d}``。
+    模板中的相对路径以输出 PDF 所在的文件夹为起点，如 ``"{stem}/fig{page}.{ext}"``。
+    """
+    folder, file_name = os.path.split(output_pdf_path)
+    stem = os.path.splitext(file_name)[0]
+    name = template.format(stem=stem, page=page_number + 1, index=figure_index + 1, ext=export_format)
+    return os.path.join(folder, name)
+
+
+def _export_regions(pdf_document, regions, export_format, dpi):
+    """把 ``[(页码, 区域, 路径)]`` 逐个导出，返回写入的字节数。"""
+    bytes_written = 0
+    for page_number, rect, path in regions:
+        page = pdf_document[page_number]
+        with stage("export", page):
+            rect = fitz.Rect(rect)
+            if export_format == "png":
+                pix = page.get_pixmap(dpi=dpi, clip=rect, alpha=False)
+                # 写入分辨率，LaTeX 等按原始尺寸排版
+                pix.set_dpi(dpi, dpi)
+                data = pix.tobytes("png")
+            else:
+                with fitz.open() as svg_pdf:
+                    svg_page = svg_pdf.new_page(width=rect.width, height=rect.height)
+                    svg_page.show_pdf_page(svg_page.rect, pdf_document, page_number, clip=rect)
+                    data = svg_page.get_svg_image().encode("utf-8")
+
+            # 先写入临时文件再改名，下游程序不会读到写了一半的图片
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as image_file:
+                image_file.write(data)
+            os.replace(temp_path, path)
+        bytes_written += len(data)
+    return bytes_written
+
+
+def _export_shard(input_pdf_path, regions, export_format, dpi):
+    """在子进程中独立打开源文件并导出一部分区域。"""
+    with fitz.open(input_pdf_path) as pdf_document:
+        return _export_regions(pdf_document, regions, export_format, dpi)
+
+
+def write_exported_figures(
+    pdf_document,
+    crop_rects,
+    output_pdf_path,
+    export_format="png",
+    dpi=DEFAULT_EXPORT_DPI,
+    template=DEFAULT_EXPORT_TEMPLATE,
+    jobs=1,
+    input_pdf_path=None,
+):
+    """
+    把每个裁剪区域导出为单独的图片文件，文件名见 ``export_file_path``。
+
+    Args:
+        pdf_document: 已打开的源文档。
+        crop_rects: 与源文档页面一一对应的裁剪区域，为列表时（按图表分割）每个区域各导出一个文件；
+            None 表示整页空白，不导出。
+        output_pdf_path: 输出 PDF 文件的路径，用作文件名模板中的 stem 与导出文件夹。
+        export_format: 导出格式，取值见 ``EXPORT_FORMATS``，默认为 "png"。
+        dpi: PNG 的分辨率，默认为 300。
+        template: 文件名模板，默认为 ``DEFAULT_EXPORT_TEMPLATE``。
+        jobs: 并行进程数，默认为 1。大于 1 且提供了 input_pdf_path 时，区域交错分给多个进程。
+        input_pdf_path: 源文件的路径，供子进程重新打开，默认为 None（在当前进程中导出）。
+
+    Returns:
+        ``(写入字节数, 导出耗时秒数, 导出的文件路径列表)``。
+
+    Raises:
+        ValueError: 导出格式不支持，或文件名模板使不同区域得到相同的文件名。
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {export_format}")
+
+    regions = []
+    for page_number, crop_rect in enumerate(crop_rects):
+        if crop_rect is None:
+            continue
+        for figure_index, rect in enumerate(crop_rect if isinstance(crop_rect, list) else [crop_rect]):
+            path = export_file_path(output_pdf_path, page_number, figure_index, export_format, template)
+            regions.append((page_number, tuple(rect), path))
+    if len({path for _, _, path in regions}) != len(regions):
+        raise ValueError(f"文件名模板 {template} 使不同的区域得到相同的文件名")
+
+    start_time = time.perf_counter()
+    shard_count = min(jobs or 1, len(regions) // MIN_EXPORT_SHARD) if input_pdf_path is not None else 1
+    if shard_count <= 1:
+        bytes_written = _export_regions(pdf_document, regions, export_format, dpi)
+    else:
+        # 交错分配，使各进程分到的页面分布均匀
+        shards = [regions[index::shard_count] for index in range(shard_count)]
+        # 已注册的可 pickle 钩子在子进程中同样生效
+        with ProcessPoolExecutor(
+            max_workers=shard_count, initializer=install_hooks, initargs=(pool_hooks(),)
+        ) as executor:
+            sizes = executor.map(
+                _export_shard,
+                [input_pdf_path] * shard_count,
+                shards,
+                [export_format] * shard_count,
+                [dpi] * shard_count,
+            )
+            bytes_written = sum(sizes)
+    return bytes_written, time.perf_counter() - start_time, [path for _, _, path in regions]
@@ -0,0 +1,63 @@
+"""图片流式导入：逐张把图片嵌入 PDF，可在嵌入前裁掉四周的空白。
+
+每次只处理一张图片：读入文件的原始字节，直接交给 PyMuPDF 嵌入输出文档，JPEG 以原始的
+DCT 数据嵌入，不解码也不重新编码；PNG 等格式由 MuPDF 直接转换为 Flate 压缩的图像流，
+不经过 Pillow。需要裁剪时，用与 PDF 页面相同的检测引擎在 72 DPI（或 precision_dpi）
+下渲染图片求出内容区域，再把页面的 CropBox 与 MediaBox 设为该区域，图像数据本身保持完整。
+
+因此内存占用只与单张图片有关，不随图片数量增长；输出文档中只保存压缩后的图像流。
+"""
+
+import os
+
+import fitz
+
+from .crop import find_figure_rects, raster_crop_rect, set_page_crop
+from .timing import stage
+
+# 可以直接嵌入 PDF 的图片格式
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def append_image(output_pdf, image_path, crop_options=None):
+    """
+    把一张图片作为新页面追加到 output_pdf 末尾，页面大小按图片的分辨率换算为点。
+
+    Args:
+        output_pdf: 要追加页面的目标文档。
+        image_path: 图片路径，格式见 ``IMAGE_EXTENSIONS``。
+        crop_options: ``CropOptions`` 对象，默认为 None（不裁剪）。图片总是按栅格检测，
+            只使用其中的 border_width、precision_dpi 与 figure_gap；指定 figure_gap 时
+            每个图表各占一页，共用同一份图像数据。
+
+    Returns:
+        追加的页数；图片为空白时不裁剪，仍追加一页。
+    """
+    with open(image_path, "rb") as image_file:
+        data = image_file.read()
+
+    # 图片文档只解析文件头即可得到页面大小，需要检测时才会解码像素
+    with fitz.open(stream=data, filetype=os.path.splitext(image_path)[1][1:].lower()) as image_document:
+        image_page = image_document[0]
+        page_rect = image_page.rect
+
+        crop_rects = [None]
+        if crop_options is not None and crop_options.figure_gap is not None:
+            crop_rects = find_figure_rects(
+                image_page, crop_options.border_width, crop_options.figure_gap, crop_options.precision_dpi
+            ) or [None]
+        elif crop_options is not None:
+            crop_rects = [raster_crop_rect(image_page, crop_options.border_width, precision_dpi=crop_options.precision_dpi)]
+
+    xref = 0
+    with stage("compose", image_path):
+        for crop_rect in crop_rects:
+            page = output_pdf.new_page(width=page_rect.width, height=page_rect.height)
+            if xref:
+                # 同一张图片的后续页面引用已嵌入的图像对象
+                page.insert_image(page.rect, xref=xref)
+            else:
+                xref = page.insert_image(page.rect, stream=data)
+            if crop_rect is not None:
+                set_page_crop(page, crop_rect)
+    return len(crop_rects)
@@ -0,0 +1,114 @@
+"""增量批处理清单：记录已完成的输入文件，跳过未变化的文件并支持中断后续跑。
+
+清单以 JSON Lines 格式保存在输出文件夹中，每处理完一个文件追加一行，
+因此进程中途崩溃时已完成的记录不会丢失；重复的记录以最后一行为准。
+"""
+
+import json
+import os
+
+MANIFEST_NAME = ".pdfcrop-manifest.jsonl"
+
+
+def file_signature(path):
+    """返回文件的 ``(大小, 修改时间)``，用于判断文件是否变化。"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _as_json(params):
+    """params 经 JSON 往返后的值（元组变为列表），与从清单文件读回的记录可以直接比较。"""
+    return json.loads(json.dumps(params))
+
+
+class Manifest:
+    """
+    输出文件夹中的处理清单。
+
+    Args:
+        output_folder: 输出文件夹路径，清单保存在其中。
+    """
+
+    def __init__(self, output_folder):
+        self.path = os.path.join(output_folder, MANIFEST_NAME)
+        self.entries = {}
+
+        line_count = 0
+        damaged = False
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as manifest_file:
+                for line in manifest_file:
+                    line_count += 1
+                    # 崩溃时可能留下写了一半的最后一行；即使内容完整，缺少换行符时
+                    # 之后追加的记录也会接在同一行上
+                    if not line.endswith("\n"):
+                        damaged = True
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        damaged = True
+                        continue
+                    self.entries[entry["input"]] = entry
+
+        # 有损坏的行时重写清单，使之后追加的记录从新的一行开始；重复记录过多时同样压缩清单
+        if damaged or line_count > 2 * len(self.entries) + 100:
+            self._rewrite()
+
+    def _rewrite(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            for entry in self.entries.values():
+                manifest_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.path)
+
+    def is_current(self, input_pdf_path, output_pdf_path, params):
+        """
+        判断输入文件是否已按相同参数处理过且未发生变化。
+
+        上次记录的输出文件（见 ``record`` 的 output_paths）必须都还存在。
+
+        Args:
+            input_pdf_path: 输入 PDF 文件的路径。
+            output_pdf_path: 输出 PDF 文件的路径。
+            params: 影响输出结果的裁剪参数（可序列化为 JSON 的字典）。
+        """
+        entry = self.entries.get(os.path.abspath(input_pdf_path))
+        if entry is None:
+            return False
+        if not all(os.path.exists(path) for path in entry.get("outputs", [entry["output"]])):
+            return False
+        size, mtime_ns = file_signature(input_pdf_path)
+        return (
+            entry["size"] == size
+            and entry["mtime_ns"] == mtime_ns
+            and entry["params"] == _as_json(params)
+            and entry["output"] == os.path.abspath(output_pdf_path)
+        )
+
+    def record(self, input_pdf_path, output_pdf_path, params, signature, output_paths=None):
+        """
+        记录一个已完成的文件，立即追加写入清单。
+
+        Args:
+            input_pdf_path: 输入 PDF 文件的路径。
+            output_pdf_path: 输出 PDF 文件的路径。
+            params: 影响输出结果的裁剪参数。
+            signature: 开始处理前由 ``file_signature`` 取得的输入文件签名，
+                处理期间输入文件被修改时，下次运行仍会重新处理。
+            output_paths: 实际写出的文件（``CropResult.output_paths``），默认为 None
+                （即 output_pdf_path）。图表逐个输出或导出图片时不写出 output_pdf_path 本身。
+        """
+        if output_paths is None:
+            output_paths = [output_pdf_path]
+        size, mtime_ns = signature
+        entry = {
+            "input": os.path.abspath(input_pdf_path),
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "params": _as_json(params),
+            "output": os.path.abspath(output_pdf_path),
+            "outputs": [os.path.abspath(path) for path in output_paths],
+        }
+        self.entries[entry["input"]] = entry
+        with open(self.path, "a", encoding="utf-8") as manifest_file:
+            manifest_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
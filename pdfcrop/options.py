@@ -0,0 +1,137 @@
+"""裁剪选项：可取值的常量与带类型的选项对象。
+
+本模块只依赖标准库，命令行脚本解析参数时无需导入 PyMuPDF 或 NumPy。
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+from .save import SAVE_PROFILES
+
+# raster: 渲染页面后按像素检测；vector: 直接使用 PDF 的绘图指令，无法处理的页面回退到 raster
+CROP_MODES = ("raster", "vector")
+
+# rebuild: 新建文档并逐页嵌入裁剪后的内容；cropbox: 只修改原文档每页的 CropBox 与 MediaBox
+OUTPUT_MODES = ("rebuild", "cropbox")
+
+# 按图表分割时的输出：pages 每个图表在输出文件中各占一页；files 每个图表保存为单独的文件
+FIGURE_OUTPUTS = ("pages", "files")
+
+# 默认的图表间距（点，72 DPI 下与像素一致）：空白达到该宽度才视为两个图表之间的间隔
+DEFAULT_FIGURE_GAP = 20
+
+# 把裁剪区域直接导出为图片时的格式：png 按目标分辨率渲染；svg 保持矢量
+EXPORT_FORMATS = ("png", "svg")
+
+# 导出 PNG 的默认分辨率
+DEFAULT_EXPORT_DPI = 300
+
+# 导出文件名的默认模板，可用字段见 ``export_file_path``
+DEFAULT_EXPORT_TEMPLATE = "{stem}_p{page}_{index}.{ext}"
+
+# 统一裁剪默认的抽样页数：(开头的页数, 随机抽取的页数)
+DEFAULT_UNIFORM_SAMPLE = (5, 5)
+
+
+def parse_uniform_sample(value):
+    """
+    把统一裁剪的抽样页数转换为 ``(开头的页数, 随机抽取的页数)``。
+
+    Args:
+        value: "N,K" 或 "N" 形式的字符串（只有 N 时随机抽取的页数为 0），或两个整数组成的序列。
+
+    Raises:
+        ValueError: 格式错误、页数为负数或两者都为 0。
+    """
+    if isinstance(value, str):
+        parts = [part.strip() for part in value.split(",")]
+        if len(parts) == 1:
+            parts.append("0")
+    else:
+        parts = list(value)
+    if len(parts) != 2:
+        raise ValueError(f"抽样页数的格式应为 N,K: {value}")
+    first, random_count = (int(part) for part in parts)
+    if first < 0 or random_count < 0 or first + random_count == 0:
+        raise ValueError(f"抽样页数必须为非负数且不能都为 0: {value}")
+    return first, random_count
+
+
+def check_export_options(export_format, export_dpi, export_template):
+    """
+    检查导出选项是否有效。
+
+    Raises:
+        ValueError: 格式不支持、分辨率不是正数，或文件名模板含有未知字段。
+    """
+    if export_format is not None and export_format not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {export_format}")
+    if export_dpi <= 0:
+        raise ValueError(f"导出分辨率必须为正数: {export_dpi}")
+    try:
+        export_template.format(stem="", page=1, index=1, ext="png")
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"无效的文件名模板 {export_template}: {e}") from None
+
+
+@dataclass(frozen=True)
+class CropOptions:
+    """
+    ``crop_document`` 的裁剪选项，创建时即检查取值是否有效。
+
+    Attributes:
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        mode: 裁剪模式，取值见 ``CROP_MODES``，默认为 "raster"。
+        precision_dpi: 栅格检测时细化边界使用的分辨率，默认为 None（不细化）。
+        output_mode: 输出方式，取值见 ``OUTPUT_MODES``，默认为 "rebuild"。
+        save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+        jobs: 单个文档按页段拆分的并行进程数，默认为 1。
+        cache: ``CropCache`` 对象，默认为 None（不使用缓存）。
+        figure_gap: 按图表分割时图表之间的最小空白宽度（点），默认为 None（不分割）。
+        figure_output: 分割出的图表的输出方式，取值见 ``FIGURE_OUTPUTS``，默认为 "pages"。
+        uniform: 统一裁剪的抽样页数 ``(开头的页数, 随机抽取的页数)``，默认为 None（逐页裁剪）。
+        uniform_percentile: 统一裁剪区域取各抽样区域边界的百分位数，默认为 100（并集）。
+        export_format: 把裁剪区域直接导出为图片的格式，取值见 ``EXPORT_FORMATS``，
+            默认为 None（输出 PDF）。
+        export_dpi: 导出 PNG 的分辨率，默认为 300。
+        export_template: 导出文件名的模板，默认为 ``DEFAULT_EXPORT_TEMPLATE``。
+    """
+
+    border_width: int = 5
+    mode: str = "raster"
+    precision_dpi: Optional[int] = None
+    output_mode: str = "rebuild"
+    save_profile: str = "fast"
+    jobs: int = 1
+    cache: Optional[Any] = None
+    figure_gap: Optional[int] = None
+    figure_output: str = "pages"
+    uniform: Optional[Tuple[int, int]] = None
+    uniform_percentile: float = 100
+    export_format: Optional[str] = None
+    export_dpi: int = DEFAULT_EXPORT_DPI
+    export_template: str = DEFAULT_EXPORT_TEMPLATE
+
+    def __post_init__(self):
+        if self.mode not in CROP_MODES:
+            raise ValueError(f"不支持的裁剪模式: {self.mode}")
+        if self.output_mode not in OUTPUT_MODES:
+            raise ValueError(f"不支持的输出方式: {self.output_mode}")
+        if self.save_profile not in SAVE_PROFILES:
+            raise ValueError(f"不支持的保存配置: {self.save_profile}")
+        if self.figure_output not in FIGURE_OUTPUTS:
+            raise ValueError(f"不支持的图表输出方式: {self.figure_output}")
+        if self.figure_gap is not None and self.output_mode != "rebuild":
+            raise ValueError("按图表分割只支持 rebuild 输出方式")
+        if self.uniform is not None:
+            # 冻结的数据类只能经由 object.__setattr__ 规范化取值
+            object.__setattr__(self, "uniform", parse_uniform_sample(self.uniform))
+            if self.figure_gap is not None:
+                raise ValueError("统一裁剪不能与按图表分割同时使用")
+        if not 0 < self.uniform_percentile <= 100:
+            raise ValueError(f"统一裁剪的百分位数必须在 (0, 100] 之间: {self.uniform_percentile}")
+        check_export_options(self.export_format, self.export_dpi, self.export_template)
+
+    def as_kwargs(self) -> Dict[str, Any]:
+        """返回可直接传给 ``auto_crop_pdf`` 的关键字参数（cache 不做拷贝）。"""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
@@ -0,0 +1,154 @@
+"""转换→裁剪→合并的流式流水线。
+
+每个输入文件依次转换为内存中的 PDF、按需裁剪，再直接追加到同一个输出文档中，
+最后只写出一次输出文件。同一时刻最多只打开一个源文档，追加完成后立即关闭，
+中间结果不会写到源文件旁边。
+"""
+
+import os
+import tempfile
+from collections import namedtuple
+
+import fitz
+
+from .crop import _find_crop_rects, append_cropped_pages, set_page_crop
+from .images import IMAGE_EXTENSIONS, append_image
+from .save import save_pdf
+from .timing import stage
+
+# merge_files 的返回值：合并的文件数、输出页数、输出文件字节数与保存耗时（秒）
+MergeResult = namedtuple("MergeResult", ["file_count", "page_count", "bytes_written", "save_seconds"])
+
+
+def open_as_pdf(path, converters=None):
+    """
+    把输入文件打开为 PDF 文档，非 PDF 文件在内存中转换。
+
+    Args:
+        path: 输入文件路径：PDF、图片（见 ``IMAGE_EXTENSIONS``），或 converters 支持的格式。
+        converters: ``{扩展名: convert(输入路径, 输出 PDF 路径)}``，用于 Word、Visio 等
+            需要外部程序转换的格式，默认为 None。转换结果写入临时文件，读入内存后立即删除。
+
+    Returns:
+        已打开的 PDF 文档，由调用方负责关闭。
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        return fitz.open(path)
+
+    if extension in IMAGE_EXTENSIONS:
+        pdf_document = fitz.open()
+        append_image(pdf_document, path)
+        return pdf_document
+
+    convert = (converters or {}).get(extension)
+    if convert is None:
+        raise ValueError(f"不支持的文件类型: {extension}")
+
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+    os.close(temp_fd)
+    try:
+        convert(os.path.abspath(path), temp_path)
+        with open(temp_path, "rb") as temp_file:
+            return fitz.open("pdf", temp_file.read())
+    finally:
+        os.remove(temp_path)
+
+
+def _append_document(output_pdf, pdf_document, crop_options):
+    """把一个源文档（按需裁剪后）追加到 output_pdf 末尾。"""
+    if crop_options is None:
+        output_pdf.insert_pdf(pdf_document)
+        return
+
+    crop_rects = _find_crop_rects(
+        pdf_document,
+        0,
+        pdf_document.page_count,
+        crop_options.border_width,
+        crop_options.mode,
+        crop_options.precision_dpi,
+        crop_options.cache,
+        figure_gap=crop_options.figure_gap,
+    )
+
+    if crop_options.output_mode == "cropbox":
+        # 原样复制页面（保留链接与注释），再设置复制出的页面的 CropBox
+        start = output_pdf.page_count
+        output_pdf.insert_pdf(pdf_document)
+        for page_number, crop_rect in enumerate(crop_rects):
+            if crop_rect is not None:
+                set_page_crop(output_pdf[start + page_number], crop_rect)
+        return
+
+    # 源文档由 merge_files 在追加后立即关闭，其内存随之释放
+    append_cropped_pages(output_pdf, pdf_document, crop_rects)
+
+
+def merge_files(
+    input_paths,
+    output_pdf_path,
+    converters=None,
+    crop_options=None,
+    save_profile="fast",
+    progress=None,
+    on_error=None,
+):
+    """
+    依次转换、按需裁剪并合并多个文件，只在最后写出一次输出文件。
+
+    Args:
+        input_paths: 输入文件路径列表，格式见 ``open_as_pdf``。
+        output_pdf_path: 输出 PDF 文件的路径。
+        converters: 传给 ``open_as_pdf`` 的外部转换器，默认为 None。
+        crop_options: ``CropOptions`` 对象，默认为 None（不裁剪）。其中的 output_mode
+            决定 PDF 页面的裁剪方式，save_profile 与 jobs 不起作用；图片的裁剪见 ``append_image``。
+        save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+        progress: 进度回调 ``progress(已完成文件数, 文件总数)``，默认为 None。
+        on_error: 出错回调 ``on_error(输入路径, 异常)``，默认为 None。提供时跳过出错的文件
+            继续处理（该文件已追加的页面会被删除），否则直接抛出异常。
+
+    Returns:
+        ``MergeResult``：合并的文件数、输出页数、输出文件字节数与保存耗时。
+    """
+    output_pdf = fitz.open()
+    file_count = 0
+
+    try:
+        for index, input_path in enumerate(input_paths):
+            start = output_pdf.page_count
+            try:
+                if os.path.splitext(input_path)[1].lower() in IMAGE_EXTENSIONS:
+                    # 图片直接嵌入输出文档，不经过中间文档
+                    with stage("append", input_path):
+                        append_image(output_pdf, input_path, crop_options)
+                else:
+                    with stage("open", input_path):
+                        pdf_document = open_as_pdf(input_path, converters)
+                    try:
+                        with stage("append", input_path):
+                            _append_document(output_pdf, pdf_document, crop_options)
+                    finally:
+                        pdf_document.close()
+                file_count += 1
+            except Exception as e:
+                if on_error is None:
+                    raise
+                # 出错前可能已追加了部分页面，跳过的文件不应在输出中留下不完整的内容
+                if output_pdf.page_count > start:
+                    output_pdf.delete_pages(start, output_pdf.page_count - 1)
+                on_error(input_path, e)
+
+            if progress is not None:
+                progress(index + 1, len(input_paths))
+
+        if output_pdf.page_count == 0:
+            raise ValueError("没有可合并的页面")
+        page_count = output_pdf.page_count
+    except BaseException:
+        output_pdf.close()
+        raise
+
+    with stage("save", output_pdf_path):
+        bytes_written, save_seconds = save_pdf(output_pdf, output_pdf_path, save_profile)
+    return MergeResult(file_count, page_count, bytes_written, save_seconds)
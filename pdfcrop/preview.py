@@ -0,0 +1,260 @@
+"""GUI 的裁剪预览：在后台线程中渲染页面缩略图并检测裁剪区域。
+
+缩略图、72 DPI 灰度图与检测结果都保存在按字节数限制容量的 LRU 缓存中：
+来回翻页不会重新渲染，修改边框宽度时只在缓存的灰度图上重新检测。
+
+本模块只依赖标准库，PyMuPDF 与 NumPy 在后台线程第一次渲染时才导入。
+"""
+
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+
+from .manifest import file_signature
+
+# 预览缓存的默认容量（字节）
+DEFAULT_PREVIEW_CACHE_BYTES = 128 * 1024 * 1024
+
+# 显示一页之后预先渲染其后的页数
+DEFAULT_PREFETCH = 2
+
+# 同时保持打开的文档数
+MAX_OPEN_DOCUMENTS = 4
+
+# 检测结果在缓存中按该字节数计
+_RECT_ENTRY_BYTES = 64
+
+# 缓存中没有该键（与缓存的 None 区分）
+_MISSING = object()
+
+# 一页的预览结果：image 为 PPM 格式的缩略图，scale 为每点对应的像素数，
+# crop_rect 为页面坐标中的裁剪区域（None 表示整页空白、不裁剪）；出错时 error 为异常
+PreviewResult = namedtuple(
+    "PreviewResult",
+    ["path", "page_number", "page_count", "image", "width", "height", "scale", "crop_rect", "error"],
+)
+
+
+class LRUCache:
+    """
+    按字节数限制容量的线程安全 LRU 缓存。
+
+    Args:
+        max_bytes: 容量上限（字节），超出时淘汰最久未使用的条目；单个条目超过上限时不缓存。
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # 键 -> (值, 字节数)，按最近使用排序
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """取出缓存的值并标记为最近使用；没有该键时返回 default。"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        """
+        保存一个值。
+
+        Args:
+            key: 可哈希的键。
+            value: 要缓存的值（可以是 None）。
+            size: 该值占用的字节数，用于计算容量。
+        """
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def clear(self):
+        """清空缓存。"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+class PreviewRenderer:
+    """
+    在后台线程中渲染预览页，GUI 以 ``window.after`` 定时调用 ``poll`` 取回结果。
+
+    只处理最新的请求：快速翻页时，尚未开始的旧请求直接丢弃。显示一页之后在空闲时
+    预先渲染其后的几页并检测裁剪区域，翻到下一页时直接命中缓存。缓存键包含文件的
+    大小与修改时间，文件被修改后自动重新渲染。
+
+    Args:
+        max_bytes: 缓存容量上限（字节），默认为 128 MB。
+        prefetch: 预先渲染的页数，默认为 2。
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PREVIEW_CACHE_BYTES, prefetch=DEFAULT_PREFETCH):
+        self.cache = LRUCache(max_bytes)
+        self.prefetch = prefetch
+        self._results = queue.Queue()
+        self._condition = threading.Condition()
+        self._request = None
+        self._closed = False
+        self._thread = None
+        # 只在后台线程中使用：路径 -> (签名, 文档)，按最近使用排序
+        self._documents = OrderedDict()
+
+    def request(self, path, page_number, max_size, border_width=5, mode="raster", precision_dpi=None):
+        """
+        请求预览一页，立即返回；会取代尚未开始处理的上一个请求。
+
+        Args:
+            path: PDF 或图片文件的路径。
+            page_number: 页码（从 0 开始）。
+            max_size: 缩略图的最大 ``(宽, 高)``（像素），缩略图按比例缩放到该范围之内。
+            border_width: 需要忽略的边框宽度，默认为 5 像素。
+            mode: 裁剪模式，取值见 ``CROP_MODES``，默认为 "raster"。
+            precision_dpi: 栅格检测时细化边界使用的分辨率，默认为 None（不细化）。
+        """
+        with self._condition:
+            self._request = (path, page_number, tuple(max_size), border_width, mode, precision_dpi)
+            self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def poll(self):
+        """不阻塞地取出最新的预览结果（``PreviewResult``）；没有新结果时返回 None。"""
+        result = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return result
+
+    def close(self):
+        """停止后台线程，正在渲染的页面完成后关闭所有文档。"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _has_request(self):
+        with self._condition:
+            return self._request is not None or self._closed
+
+    def _next_request(self):
+        """等待并取出最新的请求；关闭后返回 None。"""
+        with self._condition:
+            while self._request is None and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return None
+            request, self._request = self._request, None
+            return request
+
+    def _run(self):
+        try:
+            while True:
+                request = self._next_request()
+                if request is None:
+                    break
+                self._results.put(self._preview(*request))
+
+                # 空闲时预先处理其后的页面，有新请求时立即停止
+                path, page_number, *options = request
+                for offset in range(1, self.prefetch + 1):
+                    if self._has_request():
+                        break
+                    result = self._preview(path, page_number + offset, *options)
+                    if result.error is not None:
+                        break
+        finally:
+            for _, document in self._documents.values():
+                document.close()
+            self._documents.clear()
+
+    def _open(self, path, signature):
+        """打开文档并保持打开，文件被修改后重新打开。"""
+        import fitz
+
+        entry = self._documents.pop(path, None)
+        if entry is not None and entry[0] != signature:
+            entry[1].close()
+            entry = None
+        if entry is None:
+            entry = (signature, fitz.open(path))
+        self._documents[path] = entry
+        while len(self._documents) > MAX_OPEN_DOCUMENTS:
+            _, (_, document) = self._documents.popitem(last=False)
+            document.close()
+        return entry[1]
+
+    def _preview(self, path, page_number, max_size, border_width, mode, precision_dpi):
+        """渲染一页的缩略图并检测裁剪区域，出错时返回带 error 的结果。"""
+        import fitz
+
+        try:
+            signature = file_signature(path)
+            document = self._open(path, signature)
+            page_count = document.page_count
+            if not 0 <= page_number < page_count:
+                raise IndexError(f"页码超出范围: {page_number + 1}/{page_count}")
+            page = document[page_number]
+            page_key = (path, signature, page_number)
+
+            thumbnail = self.cache.get(page_key + ("thumbnail", max_size), _MISSING)
+            if thumbnail is _MISSING:
+                scale = min(max_size[0] / page.rect.width, max_size[1] / page.rect.height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+                thumbnail = (pix.tobytes("ppm"), pix.width, pix.height, pix.width / page.rect.width)
+                self.cache.put(page_key + ("thumbnail", max_size), thumbnail, len(thumbnail[0]))
+
+            crop_rect = self._crop_rect(page, page_key, border_width, mode, precision_dpi)
+        except Exception as e:
+            return PreviewResult(path, page_number, 0, None, 0, 0, 0.0, None, e)
+        return PreviewResult(path, page_number, page_count, *thumbnail, crop_rect, None)
+
+    def _crop_rect(self, page, page_key, border_width, mode, precision_dpi):
+        """按裁剪参数检测页面的裁剪区域；栅格模式复用缓存的 72 DPI 灰度图。"""
+        import fitz
+
+        from .crop import find_crop_rect, refine_crop_rect
+        from .detect import find_content_box
+        from .render import render_gray
+
+        rect_key = page_key + ("crop", border_width, mode, precision_dpi)
+        crop_rect = self.cache.get(rect_key, _MISSING)
+        if crop_rect is not _MISSING:
+            return crop_rect
+
+        if mode == "raster":
+            gray = self.cache.get(page_key + ("gray",), _MISSING)
+            if gray is _MISSING:
+                # 复制一份，使灰度图不再引用 pixmap 的缓冲区
+                _, gray = render_gray(page)
+                gray = gray.copy()
+                self.cache.put(page_key + ("gray",), gray, gray.nbytes)
+            box = find_content_box(gray, border_width)
+            rect = None if box is None else fitz.Rect(box)
+            if rect is not None and precision_dpi and precision_dpi > 72:
+                rect = refine_crop_rect(page, rect, precision_dpi, border_width)
+        else:
+            rect = find_crop_rect(page, border_width, mode, precision_dpi)
+
+        crop_rect = None if rect is None else tuple(rect)
+        self.cache.put(rect_key, crop_rect, _RECT_ENTRY_BYTES)
+        return crop_rect
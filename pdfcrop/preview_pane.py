@@ -0,0 +1,141 @@
+"""两个 GUI 共用的裁剪预览面板（tkinter）。
+
+面板本身只创建控件；渲染与检测由 ``PreviewRenderer`` 在后台线程中完成，
+导入本模块不会加载 PyMuPDF 或 NumPy。
+"""
+
+import os
+import tkinter as tk
+from tkinter import ttk
+
+from .preview import DEFAULT_PREVIEW_CACHE_BYTES, PreviewRenderer
+
+# 轮询后台渲染结果的间隔（毫秒）
+POLL_INTERVAL_MS = 50
+
+
+class PreviewPane(ttk.LabelFrame):
+    """
+    显示一页的缩略图，并以红框标出按当前参数检测到的裁剪区域。
+
+    用 ``show_file`` 切换文件，``show_page`` 翻页（也可以用按钮或鼠标滚轮），
+    ``set_options`` 更新边框宽度等裁剪参数后预览随即刷新。
+
+    Args:
+        master: 父控件。
+        width: 画布的初始宽度（像素），默认为 360。
+        height: 画布的初始高度（像素），默认为 480。
+        max_bytes: 预览缓存的容量上限（字节），默认为 128 MB。
+        **kwargs: 传给 ``ttk.LabelFrame`` 的其他参数。
+    """
+
+    def __init__(self, master, width=360, height=480, max_bytes=DEFAULT_PREVIEW_CACHE_BYTES, **kwargs):
+        super().__init__(master, text="预览", **kwargs)
+        self.renderer = PreviewRenderer(max_bytes)
+        self.path = None
+        self.page_number = 0
+        self.page_count = 0
+        self.options = {"border_width": 5, "mode": "raster", "precision_dpi": None}
+        # PhotoImage 必须保持引用，否则会被回收而不显示
+        self._photo = None
+
+        self.canvas = tk.Canvas(self, width=width, height=height, background="#808080", highlightthickness=0)
+        self.canvas.pack(padx=5, pady=5, fill="both", expand=True)
+
+        navigation = ttk.Frame(self)
+        navigation.pack(padx=5, pady=5)
+        ttk.Button(navigation, text="上一页", command=lambda: self.show_page(self.page_number - 1)).pack(
+            side=tk.LEFT, padx=5
+        )
+        self.page_label = ttk.Label(navigation, text="")
+        self.page_label.pack(side=tk.LEFT, padx=5)
+        ttk.Button(navigation, text="下一页", command=lambda: self.show_page(self.page_number + 1)).pack(
+            side=tk.LEFT, padx=5
+        )
+
+        self.info_label = ttk.Label(self, text="选择文件后在此预览裁剪效果")
+        self.info_label.pack(padx=5, pady=5)
+
+        # Windows 与 macOS 使用 MouseWheel，X11 使用 Button-4/5
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.show_page(self.page_number - 1))
+        self.canvas.bind("<Button-5>", lambda event: self.show_page(self.page_number + 1))
+        self.canvas.bind("<Configure>", lambda event: self._request())
+        self.after(POLL_INTERVAL_MS, self._poll)
+
+    def show_file(self, path):
+        """预览文件的第一页。"""
+        self.path = path
+        self.page_number = 0
+        self.page_count = 0
+        self._request()
+
+    def show_page(self, page_number):
+        """预览当前文件的第 page_number 页（从 0 开始），超出范围时忽略。"""
+        if self.path is None or page_number < 0 or (self.page_count and page_number >= self.page_count):
+            return
+        self.page_number = page_number
+        self._request()
+
+    def set_options(self, border_width=5, mode="raster", precision_dpi=None):
+        """更新裁剪参数，参数变化时重新检测当前页（缩略图直接取自缓存）。"""
+        options = {"border_width": border_width, "mode": mode, "precision_dpi": precision_dpi}
+        if options != self.options:
+            self.options = options
+            self._request()
+
+    def destroy(self):
+        self.renderer.close()
+        super().destroy()
+
+    def _on_mouse_wheel(self, event):
+        # 向上滚动为上一页
+        self.show_page(self.page_number - 1 if event.delta > 0 else self.page_number + 1)
+
+    def _canvas_size(self):
+        # 窗口显示之前 winfo_width 为 1，使用请求的大小
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            width, height = self.canvas.winfo_reqwidth(), self.canvas.winfo_reqheight()
+        return width, height
+
+    def _request(self):
+        if self.path is not None:
+            self.renderer.request(self.path, self.page_number, self._canvas_size(), **self.options)
+
+    def _poll(self):
+        result = self.renderer.poll()
+        if result is not None and result.path == self.path and result.page_number == self.page_number:
+            self._draw(result)
+        self.after(POLL_INTERVAL_MS, self._poll)
+
+    def _draw(self, result):
+        self.canvas.delete("all")
+        canvas_width, canvas_height = self._canvas_size()
+        if result.error is not None:
+            self._photo = None
+            self.page_label.config(text="")
+            self.info_label.config(text=f"无法预览 {os.path.basename(result.path)}：{result.error}")
+            return
+
+        self.page_count = result.page_count
+        self.page_label.config(text=f"第 {result.page_number + 1} / {result.page_count} 页")
+
+        # 缩略图居中显示
+        self._photo = tk.PhotoImage(data=result.image, format="PPM")
+        left = (canvas_width - result.width) // 2
+        top = (canvas_height - result.height) // 2
+        self.canvas.create_image(left, top, image=self._photo, anchor=tk.NW)
+
+        page_width = result.width / result.scale
+        page_height = result.height / result.scale
+        if result.crop_rect is None:
+            self.info_label.config(text=f"整页空白，不裁剪（{page_width:.0f} × {page_height:.0f} 点）")
+            return
+        x0, y0, x1, y1 = (value * result.scale for value in result.crop_rect)
+        self.canvas.create_rectangle(left + x0, top + y0, left + x1, top + y1, outline="red", width=2)
+        self.info_label.config(
+            text=f"裁剪后 {(x1 - x0) / result.scale:.0f} × {(y1 - y0) / result.scale:.0f} 点"
+            f"（原页面 {page_width:.0f} × {page_height:.0f} 点）"
+        )
@@ -0,0 +1,27 @@
+"""页面渲染：直接渲染为灰度图并以零拷贝方式暴露给 NumPy。"""
+
+import fitz
+import numpy as np
+
+
+def render_gray(page, dpi=None, clip=None):
+    """
+    将页面渲染为无 alpha 通道的灰度图。
+
+    返回的数组直接引用 pixmap 的样本缓冲区，不做任何拷贝，因此在使用数组期间
+    必须保持 pixmap 存活。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        dpi: 渲染分辨率，默认为 None（即 72 DPI，一个像素对应一个点）。
+        clip: 只渲染页面中的这一区域（页面坐标），默认为 None（整页）。
+
+    Returns:
+        ``(pix, gray)``：渲染得到的 pixmap，以及形状为 (height, width) 的 uint8 数组视图。
+    """
+    pix = page.get_pixmap(dpi=dpi, clip=clip, colorspace=fitz.csGRAY, alpha=False)
+    samples = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+
+    # 每行可能带有对齐填充，按 stride 还原二维形状后再截取有效宽度（仍是视图）
+    gray = samples.reshape(pix.height, pix.stride)[:, :pix.width]
+    return pix, gray
@@ -0,0 +1,65 @@
+"""输出文档的保存方式（保存配置）。"""
+
+import os
+import time
+
+# 每种配置对应 fitz.Document.save 的参数：
+#   fast: PyMuPDF 默认参数，写入最快，不做压缩与去重；
+#   compact: 合并重复对象、压缩内容流并使用对象流，文件明显变小；
+#   archival: 在 compact 基础上去除重复的流、清理内容流并压缩图片与字体，文件最小、写入最慢。
+# 当前 MuPDF 已不支持线性化（linear），因此各配置均不启用。
+SAVE_PROFILES = {
+    "fast": {},
+    "compact": {"garbage": 3, "deflate": True, "use_objstms": 1},
+    "archival": {
+        "garbage": 4,
+        "clean": True,
+        "deflate": True,
+        "deflate_images": True,
+        "deflate_fonts": True,
+        "use_objstms": 1,
+    },
+}
+
+
+def save_pdf(document, output_pdf_path, profile="fast"):
+    """
+    按保存配置保存并关闭文档。
+
+    输出为路径时先写入临时文件再改名，中途崩溃也不会留下不完整的输出文件；
+    输出为文件对象时在内存中生成完整文档后一次写入，不经过磁盘。
+
+    Args:
+        document: 要保存的文档。
+        output_pdf_path: 输出 PDF 文件的路径，或有 ``write`` 方法的二进制文件对象
+            （如 ``io.BytesIO``、``sys.stdout.buffer``）。
+        profile: 保存配置名称，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+
+    Returns:
+        ``(写入字节数, 保存耗时秒数)``。
+    """
+    if profile not in SAVE_PROFILES:
+        raise ValueError(f"不支持的保存配置: {profile}")
+
+    if hasattr(output_pdf_path, "write"):
+        start_time = time.perf_counter()
+        try:
+            data = document.tobytes(**SAVE_PROFILES[profile])
+        finally:
+            document.close()
+        output_pdf_path.write(data)
+        return len(data), time.perf_counter() - start_time
+
+    temp_path = f"{output_pdf_path}.{os.getpid()}.tmp"
+    start_time = time.perf_counter()
+    try:
+        document.save(temp_path, **SAVE_PROFILES[profile])
+        document.close()
+        bytes_written = os.path.getsize(temp_path)
+        os.replace(temp_path, output_pdf_path)
+    finally:
+        if not document.is_closed:
+            document.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return bytes_written, time.perf_counter() - start_time
@@ -0,0 +1,75 @@
+"""多图表分割：把一页中被空白隔开的多个内容区域分别找出来。
+
+采用递归 XY 切分（XY-cut）：先对区域求行、列投影（即检测器返回的行列布尔向量），
+在不少于 gap 个像素的连续空白行或空白列处切开，再对每一块递归，直到某一块在两个方向上
+都无法再切分为止。每一步都是对子数组视图的向量化运算，循环次数只与区域个数有关，
+与像素个数无关。
+"""
+
+import numpy as np
+
+from .detect import strict_detector
+from .options import DEFAULT_FIGURE_GAP
+
+
+def _runs(profile, gap):
+    """返回投影中被不少于 gap 个空白隔开的内容段 ``[(start, stop)]``，stop 为开区间。"""
+    indices = np.flatnonzero(profile)
+    if indices.size == 0:
+        return []
+    # 相邻内容下标之差减一即为中间的空白数
+    breaks = np.flatnonzero(np.diff(indices) > gap)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    stops = np.concatenate((indices[breaks], [indices[-1]])) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def segment_content_boxes(gray, border_width=5, gap=DEFAULT_FIGURE_GAP, detector=strict_detector, min_size=0):
+    """
+    在灰度图像中查找被空白隔开的多个内容区域，并忽略指定宽度的边框。
+
+    Args:
+        gray: 灰度图像，形状为 (height, width) 的 uint8 数组。
+        border_width: 需要忽略的边框宽度，默认为 5 像素。
+        gap: 区域之间至少相隔的空白像素数，默认为 ``DEFAULT_FIGURE_GAP``。
+        detector: 内容检测器，默认为 ``strict_detector``。
+        min_size: 宽或高小于该值的区域（如页码、零星噪点）会被丢弃，默认为 0（全部保留）。
+
+    Returns:
+        ``(left, top, right, bottom)`` 列表，right 与 bottom 为开区间，按从上到下、
+        从左到右的阅读顺序排列；页面为空白时返回空列表。
+    """
+    height, width = gray.shape[:2]
+    border = max(int(border_width), 0)
+    region = gray[border:height - border, border:width - border]
+    if region.size == 0:
+        return []
+
+    boxes = []
+    # 待处理的块：(子数组视图, 左上角在 gray 中的坐标)；用栈代替递归，逆序入栈以保持阅读顺序
+    pending = [(region, border, border)]
+    while pending:
+        block, left, top = pending.pop()
+        rows, cols = detector(block)
+        row_runs = _runs(rows, gap)
+        col_runs = _runs(cols, gap)
+        if not row_runs or not col_runs:
+            continue
+
+        if len(row_runs) > 1:
+            # 先按行切分为上下排列的若干条带
+            pieces = [(block[start:stop], left, top + start) for start, stop in row_runs]
+        elif len(col_runs) > 1:
+            (row_start, row_stop), = row_runs
+            pieces = [
+                (block[row_start:row_stop, start:stop], left + start, top + row_start) for start, stop in col_runs
+            ]
+        else:
+            (row_start, row_stop), = row_runs
+            (col_start, col_stop), = col_runs
+            if col_stop - col_start >= min_size and row_stop - row_start >= min_size:
+                boxes.append((left + col_start, top + row_start, left + col_stop, top + row_stop))
+            continue
+
+        pending.extend(reversed(pieces))
+    return boxes
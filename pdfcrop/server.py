@@ -0,0 +1,490 @@
+"""常驻的裁剪服务：通过本地 HTTP（或 Unix 套接字）调用 ``auto_crop_pdf``。
+
+服务启动时即创建进程池并在子进程中导入 PyMuPDF 与 NumPy，之后每个请求只需排队与计算，
+不再承担解释器启动与导入的开销。排队中与处理中的请求总数有上限，队列已满时立即返回
+429（并带 Retry-After），由调用方稍后重试。
+
+用法::
+
+    python -m pdfcrop.server --port 8765 --workers 4 --queue-size 16
+    python -m pdfcrop.server --unix /tmp/pdfcrop.sock
+
+接口：
+
+- ``POST /crop``：请求体为 PDF 字节时返回裁剪后的 PDF（裁剪选项放在查询参数中，
+  如 ``/crop?border_width=5&mode=vector``，响应头 X-Page-Count 为页数）；请求体为 JSON
+  ``{"input": 输入路径, "output": 输出路径, "options": {...}}`` 时由服务端读写文件，
+  返回 JSON 格式的 ``CropResult``。
+- ``POST /boxes``：输入同上（JSON 中不需要 output），返回每页的裁剪区域，不生成 PDF。
+- ``GET /health``：服务状态；``GET /metrics``：请求计数、排队情况与耗时分位数。
+
+请求无效时返回 400，文档无法处理（例如不是有效的 PDF）时返回 422；子进程意外退出
+（例如 MuPDF 崩溃或内存不足）时重建进程池，该请求返回 503。错误信息均为 JSON ``{"error": 说明}``。
+
+路径由服务进程直接读写，服务默认只监听 127.0.0.1，不应暴露到不受信任的网络。
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .options import CropOptions, parse_uniform_sample
+from .timing import install_hooks, pool_hooks
+
+DEFAULT_PORT = 8765
+
+# 默认的排队上限（不含正在处理的请求）
+DEFAULT_QUEUE_SIZE = 16
+
+# 默认的请求体大小上限（MB）
+DEFAULT_MAX_BODY_MB = 100
+
+# 计算耗时分位数时保留的最近请求数
+LATENCY_WINDOW = 1000
+
+# 请求中可以指定的裁剪选项及其类型；jobs 由服务端决定，cache 无法随请求传递
+OPTION_TYPES = {
+    "border_width": int,
+    "mode": str,
+    "precision_dpi": int,
+    "output_mode": str,
+    "save_profile": str,
+    "figure_gap": int,
+    "figure_output": str,
+    "uniform": parse_uniform_sample,
+    "uniform_percentile": float,
+    "export_format": str,
+    "export_dpi": int,
+    "export_template": str,
+}
+
+
+class ServerBusy(Exception):
+    """排队的请求已达上限。"""
+
+
+class JobFailed(Exception):
+    """请求有效，但文档处理失败（例如无法打开输入文件）。"""
+
+
+class WorkerCrashed(Exception):
+    """处理请求的子进程意外退出，进程池已重建。"""
+
+
+def _init_worker(hooks):
+    """进程池的 initializer：安装钩子、忽略 Ctrl+C，并预先导入裁剪所需的模块。"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    install_hooks(hooks)
+    from . import crop, detect, render  # noqa: F401
+
+
+def _warm_up():
+    """空任务，用于在服务启动时拉起子进程。"""
+
+
+def _crop_path_job(input_pdf_path, output_pdf_path, options):
+    from .crop import auto_crop_pdf
+
+    return auto_crop_pdf(input_pdf_path, output_pdf_path, **options)
+
+
+def _crop_bytes_job(data, options):
+    from .crop import auto_crop_pdf
+
+    # 输入与输出都在内存中，不经过临时文件
+    output = io.BytesIO()
+    result = auto_crop_pdf(data, output, **options)
+    return result, output.getvalue()
+
+
+def _boxes_job(source, options):
+    from .crop import _find_crop_rects, _uniform_crop_rects, open_pdf
+
+    with open_pdf(source) as pdf_document:
+        # 与 /crop 使用同一条路径，相同的选项得到与实际裁剪相同的区域
+        if options["uniform"] is not None:
+            return _uniform_crop_rects(
+                pdf_document,
+                options["border_width"],
+                options["mode"],
+                options["precision_dpi"],
+                None,
+                options["uniform"],
+                options["uniform_percentile"],
+            )
+        return _find_crop_rects(
+            pdf_document,
+            0,
+            pdf_document.page_count,
+            options["border_width"],
+            options["mode"],
+            options["precision_dpi"],
+            None,
+            figure_gap=options["figure_gap"],
+        )
+
+
+def _percentile(values, percent):
+    """最近秩法求分位数。"""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class CropService:
+    """
+    带有限队列的裁剪进程池，记录请求统计，供 HTTP 处理线程调用。
+
+    Args:
+        workers: 子进程数，默认为 CPU 核数。
+        queue_size: 除正在处理的请求外最多排队的请求数，默认为 ``DEFAULT_QUEUE_SIZE``。
+    """
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.started = time.monotonic()
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self._counters = {
+            "accepted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "restarts": 0,
+        }
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        """创建进程池，并等待全部子进程启动、完成导入。"""
+        # 已注册的可 pickle 钩子在子进程中同样生效
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(pool_hooks(),))
+        for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def _replace_executor(self, broken):
+        """用新的进程池替换已损坏的 broken；多个请求同时发现损坏时只替换一次。"""
+        with self._restart_lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            with self._lock:
+                self._counters["restarts"] += 1
+        broken.shutdown(wait=False)
+
+    def run(self, function, *args):
+        """
+        在子进程中执行 function(*args) 并等待结果。
+
+        Raises:
+            ServerBusy: 排队的请求已达上限，请求未被执行。
+            WorkerCrashed: 子进程意外退出，进程池已重建，请求未完成。
+            JobFailed: function 抛出了异常。
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise ServerBusy()
+
+        start = time.perf_counter()
+        with self._lock:
+            self._counters["accepted"] += 1
+            self._counters["in_flight"] += 1
+        succeeded = False
+        executor = self._executor
+        try:
+            result = executor.submit(function, *args).result()
+            succeeded = True
+            return result
+        except BrokenProcessPool as e:
+            # 进程池中的任一子进程退出后，整个进程池都不再可用
+            self._replace_executor(executor)
+            raise WorkerCrashed("处理请求的子进程意外退出，请稍后重试") from e
+        except Exception as e:
+            raise JobFailed(f"{type(e).__name__}: {e}") from e
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._counters["in_flight"] -= 1
+                self._counters["completed" if succeeded else "failed"] += 1
+                self._latencies.append(time.perf_counter() - start)
+
+    def metrics(self):
+        """返回请求计数、排队情况与最近请求耗时（毫秒）的分位数。"""
+        with self._lock:
+            metrics = dict(self._counters)
+            latencies = list(self._latencies)
+        metrics.update(
+            {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queued": max(metrics["in_flight"] - self.workers, 0),
+                "uptime_seconds": round(time.monotonic() - self.started, 3),
+            }
+        )
+        for percent in (50, 90, 99):
+            value = _percentile(latencies, percent) * 1000 if latencies else None
+            metrics[f"latency_p{percent}_ms"] = None if value is None else round(value, 3)
+        return metrics
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_options(values):
+    """
+    把请求中的裁剪选项（字符串或 JSON 值）转换为 ``auto_crop_pdf`` 的关键字参数。
+
+    Raises:
+        ValueError: 选项名称未知或取值无效。
+    """
+    parsed = {}
+    for name, value in values.items():
+        if name not in OPTION_TYPES:
+            raise ValueError(f"未知的裁剪选项: {name}")
+        if value in (None, ""):
+            continue
+        try:
+            parsed[name] = OPTION_TYPES[name](value)
+        except (TypeError, ValueError) as e:
+            # JSON 中类型不对的值（如列表、对象）同样属于无效请求
+            raise ValueError(f"裁剪选项 {name} 的取值无效: {value!r}") from e
+    # 借助 CropOptions 检查取值；每个请求只在一个子进程中处理
+    options = CropOptions(**parsed).as_kwargs()
+    del options["jobs"], options["cache"]
+    return options
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """把 HTTP 请求转换为对 ``CropService`` 的调用。"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "pdfcrop"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write(f"{self.log_date_time_string()} {format % args}\n")
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8", headers)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            self._send_json(200, self.server.service.metrics())
+        else:
+            self._send_json(404, {"error": f"未知的路径: {path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path not in ("/crop", "/boxes"):
+            self._send_json(404, {"error": f"未知的路径: {url.path}"})
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._send_json(411, {"error": "缺少 Content-Length"})
+            return
+        try:
+            length = int(length)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # 无法确定请求体在哪里结束，这个连接不能再用于下一个请求
+            self.close_connection = True
+            self._send_json(400, {"error": f"无效的 Content-Length: {self.headers['Content-Length']}"})
+            return
+        if length > self.server.max_body:
+            self.close_connection = True
+            self._send_json(413, {"error": f"请求体超过上限（{self.server.max_body} 字节）"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            status, payload, headers = self._dispatch(url, body)
+        except ServerBusy:
+            self._send_json(429, {"error": "服务繁忙，请稍后重试"}, {"Retry-After": "1"})
+            return
+        except WorkerCrashed as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+            return
+        except JobFailed as e:
+            self._send_json(422, {"error": str(e)})
+            return
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if isinstance(payload, bytes):
+            self._send(status, payload, "application/pdf", headers)
+        else:
+            self._send_json(status, payload, headers)
+
+    def _dispatch(self, url, body):
+        """执行请求，返回 ``(状态码, JSON 对象或 PDF 字节, 额外响应头)``。"""
+        service = self.server.service
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+
+        if content_type == "application/json":
+            try:
+                request = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"请求体不是有效的 JSON: {e}") from None
+            if not isinstance(request, dict):
+                raise ValueError("请求体必须是 JSON 对象")
+            options = request.get("options") or {}
+            if not isinstance(options, dict):
+                raise ValueError("options 必须是 JSON 对象")
+            options = parse_options(options)
+            input_pdf_path = request.get("input")
+            if not input_pdf_path:
+                raise ValueError("缺少 input")
+            if url.path == "/boxes":
+                boxes = service.run(_boxes_job, input_pdf_path, options)
+                return 200, {"page_count": len(boxes), "boxes": boxes}, None
+            output_pdf_path = request.get("output")
+            if not output_pdf_path:
+                raise ValueError("缺少 output")
+            result = service.run(_crop_path_job, input_pdf_path, output_pdf_path, options)
+            return 200, result._asdict(), None
+
+        options = parse_options(dict(parse_qsl(url.query)))
+        if url.path == "/boxes":
+            boxes = service.run(_boxes_job, body, options)
+            return 200, {"page_count": len(boxes), "boxes": boxes}, None
+        if options["figure_gap"] is not None and options["figure_output"] == "files":
+            raise ValueError("以 PDF 字节提交时不支持 figure_output=files")
+        if options["export_format"] is not None:
+            raise ValueError("以 PDF 字节提交时不支持 export_format")
+        result, data = service.run(_crop_bytes_job, body, options)
+        return 200, data, {"X-Page-Count": str(result.page_count)}
+
+
+def _is_socket(path):
+    """path 是否为已存在的 Unix 套接字。"""
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+class _UnixHTTPServer(ThreadingHTTPServer):
+    """监听 Unix 套接字的 HTTP 服务。"""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+def make_server(
+    service, host="127.0.0.1", port=DEFAULT_PORT, unix_socket=None, max_body_mb=DEFAULT_MAX_BODY_MB, verbose=False
+):
+    """
+    创建（尚未开始监听循环的）HTTP 服务，调用其 ``serve_forever`` 开始处理请求。
+
+    Args:
+        service: ``CropService`` 对象。
+        host: 监听地址，默认为 127.0.0.1。
+        port: 监听端口，默认为 ``DEFAULT_PORT``；为 0 时由系统分配。
+        unix_socket: Unix 套接字路径，指定时忽略 host 与 port，默认为 None。该路径上
+            已有的套接字（例如上次运行留下的）会被删除。
+        max_body_mb: 请求体大小上限（MB），默认为 ``DEFAULT_MAX_BODY_MB``。
+        verbose: 是否打印每个请求的日志，默认为 False。
+
+    Raises:
+        ValueError: unix_socket 已存在且不是套接字。
+    """
+    if unix_socket is not None:
+        if _is_socket(unix_socket):
+            os.remove(unix_socket)
+        elif os.path.lexists(unix_socket):
+            raise ValueError(f"{unix_socket} 已存在且不是套接字，不能用作 --unix 路径")
+        server = _UnixHTTPServer(unix_socket, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    server.max_body = max_body_mb * 1024 * 1024
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="常驻的 PDF 自动裁剪服务。")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址，默认为 127.0.0.1。")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"监听端口，默认为 {DEFAULT_PORT}。")
+    parser.add_argument("--unix", default=None, metavar="PATH", help="改为监听 Unix 套接字（Windows 不支持）。")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="裁剪子进程数，默认为 CPU 核数。")
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"除正在处理的请求外最多排队的请求数，超出时返回 429，默认为 {DEFAULT_QUEUE_SIZE}。",
+    )
+    parser.add_argument(
+        "--max-body",
+        type=int,
+        default=DEFAULT_MAX_BODY_MB,
+        help=f"请求体大小上限（MB），超出时返回 413，默认为 {DEFAULT_MAX_BODY_MB}。",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="打印每个请求的日志。")
+    args = parser.parse_args(argv)
+
+    service = CropService(args.workers, args.queue_size)
+    try:
+        server = make_server(service, args.host, args.port, args.unix, args.max_body, args.verbose)
+    except ValueError as e:
+        service.close()
+        parser.error(str(e))
+    address = args.unix or f"http://{args.host}:{server.server_port}"
+    print(f"裁剪服务已启动：{address}（{service.workers} 个子进程，队列上限 {service.queue_size}，按 Ctrl+C 停止）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.unix is not None and _is_socket(args.unix):
+            os.remove(args.unix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
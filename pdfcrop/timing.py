@@ -0,0 +1,212 @@
+"""分阶段计时：在打开、渲染、检测、合成与保存等阶段调用已注册的钩子。
+
+钩子的参数是一条记录（字典）::
+
+    {"stage": 阶段名称, "seconds": 耗时, "file": 文件路径, "page": 页码, "pid": 进程号}
+
+库中的阶段名称包括 file（整个文件，包含其余阶段）、open、cache、render、detect、
+segment、refine、vector、fit（统一裁剪时检查页面内容是否在共同区域之内）、
+compose、export（导出图片）、convert（转换 Word、Visio 等文档）、
+append（合并时追加一个源文档）与 save，
+命令行脚本另有 manifest（增量清单的读写）。
+
+未注册任何钩子时 ``stage`` 直接返回一个空操作的上下文管理器，几乎没有开销；
+页码与文件名也只在注册了钩子时才会求值。
+"""
+
+import json
+import os
+import pickle
+import time
+
+# 耗时直方图的桶上限（毫秒），最后一个桶收纳更慢的记录
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+# 已注册的钩子
+_hooks = []
+
+
+class _NullStage:
+    """未注册钩子时使用的空操作上下文管理器。"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """计时并在结束时把记录交给所有钩子。"""
+
+    __slots__ = ("name", "source", "page_number", "start")
+
+    def __init__(self, name, source, page_number):
+        self.name = name
+        self.source = source
+        self.page_number = page_number
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        file, page = _describe(self.source, self.page_number)
+        record = {"stage": self.name, "seconds": seconds, "file": file, "page": page, "pid": os.getpid()}
+        for hook in list(_hooks):
+            hook(record)
+        return False
+
+
+def _describe(source, page_number):
+    """从页面、文档或路径中取出文件名与页码。"""
+    if source is None or isinstance(source, str):
+        return source, page_number
+    if hasattr(source, "parent"):
+        return source.parent.name, source.number
+    return source.name, page_number
+
+
+def stage(name, source=None, page_number=None):
+    """
+    返回一个为某个阶段计时的上下文管理器。
+
+    Args:
+        name: 阶段名称。
+        source: 页面对象、文档对象或文件路径，用于在记录中标明文件与页码，默认为 None。
+        page_number: 页码，source 为页面对象时自动取得，默认为 None。
+    """
+    if not _hooks:
+        return _NULL_STAGE
+    return _Stage(name, source, page_number)
+
+
+def add_hook(hook):
+    """注册钩子 ``hook(record)``，可用于把计时转发给监控系统。"""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """移除已注册的钩子。"""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def pool_hooks():
+    """返回可以 pickle 传给子进程的钩子，作为 ``install_hooks`` 的参数。"""
+    hooks = []
+    for hook in _hooks:
+        try:
+            pickle.dumps(hook)
+        except Exception:
+            # lambda、闭包等只在当前进程中生效
+            continue
+        hooks.append(hook)
+    return hooks
+
+
+def install_hooks(hooks):
+    """在子进程中安装钩子，用作进程池的 initializer。"""
+    _hooks[:] = hooks
+
+
+class TraceWriter:
+    """
+    把每条记录追加写入 JSON Lines 文件的钩子。
+
+    对象可以被 pickle 传给子进程，各进程以追加方式写入同一个文件，每条记录一行。
+
+    Args:
+        path: 跟踪文件路径。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def __call__(self, record):
+        if self._file is None:
+            # 行缓冲：每条记录以一次写入追加到文件末尾，多个进程的记录不会交错
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path):
+    """读取 ``TraceWriter`` 写出的跟踪文件，返回记录列表。"""
+    records = []
+    with open(path, encoding="utf-8") as trace_file:
+        for line in trace_file:
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+
+def summarize(records):
+    """
+    按阶段汇总记录。
+
+    Returns:
+        ``{阶段: {"count", "total", "mean", "max", "histogram"}}``，histogram 为与
+        ``HISTOGRAM_BOUNDS_MS`` 对应（外加一个溢出桶）的计数列表。
+    """
+    summary = {}
+    for record in records:
+        entry = summary.setdefault(
+            record["stage"],
+            {"count": 0, "total": 0.0, "max": 0.0, "histogram": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)},
+        )
+        seconds = record["seconds"]
+        entry["count"] += 1
+        entry["total"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+
+        milliseconds = seconds * 1000
+        bucket = len(HISTOGRAM_BOUNDS_MS)
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if milliseconds <= bound:
+                bucket = index
+                break
+        entry["histogram"][bucket] += 1
+
+    for entry in summary.values():
+        entry["mean"] = entry["total"] / entry["count"]
+    return summary
+
+
+def format_summary(summary, bar_width=30):
+    """把 ``summarize`` 的结果格式化为各阶段合计表与耗时直方图。"""
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+    ordered = sorted(summary.items(), key=lambda item: item[1]["total"], reverse=True)
+
+    lines = [f"{'阶段':<10}{'次数':>8}{'合计 s':>10}{'平均 ms':>10}{'最大 ms':>10}"]
+    for name, entry in ordered:
+        lines.append(
+            f"{name:<10}{entry['count']:>8}{entry['total']:>10.3f}"
+            f"{entry['mean'] * 1000:>10.2f}{entry['max'] * 1000:>10.2f}"
+        )
+
+    for name, entry in ordered:
+        lines.append("")
+        lines.append(f"{name} 耗时分布：")
+        peak = max(entry["histogram"])
+        for label, count in zip(labels, entry["histogram"]):
+            if count:
+                lines.append(f"  {label:>9} {count:>7}  {'#' * max(1, round(count / peak * bar_width))}")
+    return "\n".join(lines)
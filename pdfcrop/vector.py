@@ -0,0 +1,128 @@
+"""不经栅格化、直接根据 PDF 绘图指令计算内容区域。
+
+路径来自 ``page.get_drawings(extended=True)``，可以据此跟踪裁剪路径并忽略白色填充；
+文字与图片的位置来自 ``page.get_bboxlog()``。遇到渐变填充（shading）或非矩形
+裁剪路径时无法准确求出边界，此时返回 None，由调用方回退到栅格化检测。
+"""
+
+import fitz
+
+# bboxlog 中代表可见文字与图片的条目类型
+_VISIBLE_KINDS = ("fill-text", "stroke-text", "fill-image", "fill-imgmask")
+
+
+def _is_white(color):
+    """判断颜色是否为白色（灰度、RGB 或 CMYK）。"""
+    if len(color) == 4:
+        return all(c <= 0 for c in color)
+    return all(c >= 1 for c in color)
+
+
+def _segment_rects(item):
+    """返回路径中一段的各条边的外接矩形（矩形与四边形拆成四条边）。"""
+    kind = item[0]
+    if kind == "re":
+        quad = fitz.Rect(item[1]).quad
+    elif kind == "qu":
+        quad = item[1]
+    else:
+        # 直线与贝塞尔曲线：曲线位于控制点的凸包之内
+        rect = fitz.Rect(item[1], item[1])
+        for point in item[2:]:
+            rect |= point
+        return [rect]
+    corners = (quad.ul, quad.ur, quad.lr, quad.ll)
+    return [fitz.Rect(corners[i], corners[i]) | corners[(i + 1) % 4] for i in range(4)]
+
+
+def _path_rects(path):
+    """返回路径可见部分的外接矩形列表；白色或完全透明的路径返回空列表。"""
+    rects = []
+    fill = path.get("fill")
+    filled = fill is not None and path.get("fill_opacity") != 0 and not _is_white(fill)
+    if filled:
+        rects.append(fitz.Rect(path["rect"]))
+
+    color = path.get("color")
+    if color is not None and path.get("stroke_opacity") != 0 and not _is_white(color):
+        # 描边会向路径两侧各延伸半个线宽，宽度为 0 时按细线（一个像素）处理
+        half = max(path.get("width") or 0, 1) / 2
+        if filled:
+            rects.append(fitz.Rect(path["rect"]) + (-half, -half, half, half))
+        else:
+            # 只描边的路径（如页面四周的边框）内部是空的，逐条边计算，
+            # 否则外接矩形会覆盖整个内部区域
+            for item in path["items"]:
+                rects += [rect + (-half, -half, half, half) for rect in _segment_rects(item)]
+    return rects
+
+
+def _clip_rect(clip):
+    """返回矩形裁剪路径的范围；非矩形裁剪返回 None。"""
+    items = clip["items"]
+    if len(items) != 1:
+        return None
+    item = items[0]
+    if item[0] == "re":
+        return fitz.Rect(item[1])
+    if item[0] == "qu" and item[1].is_rectangular:
+        return item[1].rect
+    return None
+
+
+def vector_content_rect(page, border_width=5):
+    """
+    根据页面的绘图、文字和图片位置计算内容区域，并忽略指定宽度的边框。
+
+    Args:
+        page: PyMuPDF 页面对象。
+        border_width: 需要忽略的边框宽度，单位为点（与 72 DPI 下的像素一致），默认为 5。
+
+    Returns:
+        内容区域的 ``fitz.Rect``（精确到浮点坐标）；页面为空白时返回空矩形；
+        页面包含渐变填充或非矩形裁剪路径而无法处理时返回 None。
+    """
+    content = fitz.Rect()
+
+    # 与栅格检测一致，每个元素先去掉落在边框内的部分再合并，
+    # 否则边框上的线条会把外接矩形撑到整个页面
+    border = max(border_width, 0)
+    inner = page.rect + (border, border, -border, -border)
+
+    def add(rect):
+        nonlocal content
+        # 绘图与 bboxlog 使用旋转前的坐标，转换为 page.rect 的坐标
+        rect = rect * page.rotation_matrix & inner
+        if not rect.is_empty:
+            content |= rect
+
+    for kind, bbox in page.get_bboxlog():
+        if kind == "fill-shade":
+            return None
+        if kind in _VISIBLE_KINDS:
+            add(fitz.Rect(bbox))
+
+    # 裁剪栈：(层级, 裁剪范围)，层级不低于当前条目的裁剪已经失效
+    clips = []
+    for item in page.get_drawings(extended=True):
+        level = item["level"]
+        while clips and clips[-1][0] >= level:
+            clips.pop()
+
+        if item["type"] == "group":
+            continue
+        if item["type"] == "clip":
+            scissor = _clip_rect(item)
+            if scissor is None:
+                return None
+            if clips:
+                scissor &= clips[-1][1]
+            clips.append((level, scissor))
+            continue
+
+        for rect in _path_rects(item):
+            if clips:
+                rect &= clips[-1][1]
+            add(rect)
+
+    return content if not content.is_empty else fitz.Rect()
@@ -0,0 +1,206 @@
+"""热文件夹监视：持续裁剪新出现或被修改的 PDF 文件。
+
+``FolderWatcher`` 以轮询方式扫描文件夹（只依赖标准库，Windows 共享文件夹上同样可用），
+文件的大小与修改时间保持不变达到 settle_seconds 后才视为写入完成。
+
+``watch_folder`` 把写入完成的文件交给常驻的进程池裁剪：子进程在整个监视期间保持运行，
+PyMuPDF 等只导入一次。输出文件夹中的处理清单（见 ``Manifest``）记录已完成的文件，
+重新启动监视时不会重复处理未变化的旧文件；每个文件完成后在它实际写出的每个文件旁写入
+``<输出文件>.done`` 标记（图表逐个输出或导出图片时为各个文件），下游程序看到标记即可放心读取输出。
+"""
+
+import fnmatch
+import json
+import os
+import signal
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .manifest import Manifest, file_signature
+from .timing import install_hooks, pool_hooks
+
+# 输出完成标记的后缀
+DONE_SUFFIX = ".done"
+
+# watch_folder 产出的事件：result 与 error 中恰有一个为 None；
+# latency 为从检测到文件写入完成到裁剪结束的秒数
+WatchEvent = namedtuple("WatchEvent", ["input_path", "output_path", "result", "error", "latency"])
+
+
+class FolderWatcher:
+    """
+    轮询文件夹，找出新出现或被修改、且已写入完成的文件。
+
+    Args:
+        folder: 要监视的文件夹（不包含子文件夹）。
+        patterns: 文件名通配符（不区分大小写），默认为 ``("*.pdf",)``。
+        settle_seconds: 文件大小与修改时间保持不变达到该秒数才视为写入完成，默认为 2。
+    """
+
+    def __init__(self, folder, patterns=("*.pdf",), settle_seconds=2.0):
+        self.folder = folder
+        self.patterns = tuple(pattern.lower() for pattern in patterns)
+        self.settle_seconds = settle_seconds
+        # 正在观察的文件：路径 -> (签名, 首次看到该签名的时间)
+        self._seen = {}
+        # 已经交出的文件：路径 -> 交出时的签名
+        self._reported = {}
+
+    def _scan(self):
+        signatures = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                if not any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # 扫描期间文件被删除或改名
+                    continue
+                signatures[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def poll(self):
+        """
+        扫描一次文件夹。
+
+        Returns:
+            写入完成、且尚未交出或交出后又发生变化的文件路径列表，按文件名排序。
+        """
+        now = time.monotonic()
+        current = self._scan()
+
+        ready = []
+        for path, signature in current.items():
+            if self._reported.get(path) == signature:
+                continue
+            seen = self._seen.get(path)
+            if seen is None or seen[0] != signature:
+                # 新文件或仍在写入：从现在开始重新计时
+                seen = self._seen[path] = (signature, now)
+            if now - seen[1] >= self.settle_seconds:
+                ready.append(path)
+                self._reported[path] = signature
+                del self._seen[path]
+
+        # 忘记已删除的文件，同名文件再次出现时按新文件处理
+        for table in (self._seen, self._reported):
+            for path in [path for path in table if path not in current]:
+                del table[path]
+        return sorted(ready)
+
+
+def _init_worker(hooks):
+    """进程池的 initializer：安装钩子，并让子进程忽略 Ctrl+C，由主进程统一停止。"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    install_hooks(hooks)
+
+
+def _write_done_marker(output_path, input_pdf_path, result):
+    """原子地在一个输出文件旁写入完成标记，内容为输入路径与裁剪结果。"""
+    marker_path = output_path + DONE_SUFFIX
+    temp_path = marker_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as marker_file:
+        json.dump({"input": os.path.abspath(input_pdf_path), **result._asdict()}, marker_file, ensure_ascii=False)
+    os.replace(temp_path, marker_path)
+
+
+def watch_folder(
+    folder,
+    output_folder,
+    jobs=None,
+    settle_seconds=2.0,
+    poll_interval=1.0,
+    stop_event=None,
+    **crop_options,
+):
+    """
+    持续监视文件夹，在常驻进程池中裁剪写入完成的 PDF 文件，每完成一个文件就产出一次事件。
+
+    输出文件为 ``<输出文件夹>/<文件名>_cropped.pdf``；图表逐个输出或导出图片时以它为前缀，
+    实际写出的文件见事件中的 ``result.output_paths``。处理中的文件再次被修改时，
+    会在本次处理结束后重新处理；处理失败的文件在下次被修改后重试。
+
+    Args:
+        folder: 要监视的文件夹，不能与 output_folder 相同。
+        output_folder: 输出文件夹路径，不存在时自动创建。
+        jobs: 并行进程数，默认为 CPU 核数。
+        settle_seconds: 文件保持不变多少秒后才开始处理，默认为 2。
+        poll_interval: 扫描文件夹的间隔（秒），默认为 1。
+        stop_event: ``threading.Event``，设置后停止监视，默认为 None（一直运行，直到 Ctrl+C）。
+        **crop_options: 传给 ``auto_crop_pdf`` 的其他参数，如 border_width、mode。
+
+    Yields:
+        ``WatchEvent``。
+    """
+    # 延迟导入 PyMuPDF：主进程只负责扫描与调度
+    from .crop import auto_crop_pdf
+
+    if os.path.abspath(folder) == os.path.abspath(output_folder):
+        raise ValueError("输出文件夹不能与监视的文件夹相同")
+    os.makedirs(output_folder, exist_ok=True)
+
+    # 影响输出结果的参数；缓存只影响速度
+    params = {name: value for name, value in crop_options.items() if name != "cache"}
+    manifest = Manifest(output_folder)
+    watcher = FolderWatcher(folder, settle_seconds=settle_seconds)
+
+    # 正在处理的文件：future -> (输入路径, 输出路径, 开始前的签名, 检测到文件就绪的时间)
+    running = {}
+    # 处理期间又被修改、需要在完成后重新处理的文件
+    requeued = set()
+
+    # 已注册的可 pickle 钩子在子进程中同样生效
+    executor = ProcessPoolExecutor(
+        max_workers=jobs or os.cpu_count() or 1, initializer=_init_worker, initargs=(pool_hooks(),)
+    )
+
+    def submit(input_pdf_path, ready_time):
+        output_file_name = os.path.splitext(os.path.basename(input_pdf_path))[0] + "_cropped.pdf"
+        output_pdf_path = os.path.join(output_folder, output_file_name)
+        try:
+            if manifest.is_current(input_pdf_path, output_pdf_path, params):
+                return
+            signature = file_signature(input_pdf_path)
+        except OSError:
+            # 文件在就绪之后被删除
+            return
+        future = executor.submit(auto_crop_pdf, input_pdf_path, output_pdf_path, **crop_options)
+        running[future] = (input_pdf_path, output_pdf_path, signature, ready_time)
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            now = time.monotonic()
+            in_flight = {task[0] for task in running.values()}
+            for input_pdf_path in watcher.poll():
+                if input_pdf_path in in_flight:
+                    requeued.add(input_pdf_path)
+                else:
+                    submit(input_pdf_path, now)
+
+            if not running:
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                input_pdf_path, output_pdf_path, signature, ready_time = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    yield WatchEvent(input_pdf_path, output_pdf_path, None, e, time.monotonic() - ready_time)
+                else:
+                    manifest.record(input_pdf_path, output_pdf_path, params, signature, result.output_paths)
+                    for output_path in result.output_paths:
+                        _write_done_marker(output_path, input_pdf_path, result)
+                    yield WatchEvent(input_pdf_path, output_pdf_path, result, None, time.monotonic() - ready_time)
+
+                if input_pdf_path in requeued:
+                    requeued.discard(input_pdf_path)
+                    submit(input_pdf_path, time.monotonic())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
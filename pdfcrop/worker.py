@@ -0,0 +1,383 @@
+"""GUI 使用的后台裁剪与合并：由一个后台线程驱动 spawn 进程池，通过队列发送进度事件。
+
+PyMuPDF 不支持在多个线程中同时使用，GUI 的预览面板又在自己的后台线程中渲染页面，
+因此裁剪与合并全部放在子进程中进行；主进程中的后台线程只负责提交任务与转发进度，不调用 PyMuPDF。
+"""
+
+import abc
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .timing import install_hooks, pool_hooks
+
+# 后台线程等待子进程结果、转发进度事件的间隔（秒）
+RELAY_INTERVAL = 0.05
+
+# 子进程中的进度队列与取消标志，由进程池的 initializer 设置
+_progress_queue = None
+_cancel_event = None
+
+# 合并进程中常驻的文档转换进程池，第一次合并时创建
+_converter_pool = None
+
+
+def _init_process(progress_queue, cancel_event, hooks):
+    """进程池的 initializer：保存进度队列与取消标志，并安装计时钩子。"""
+    global _progress_queue, _cancel_event
+    _progress_queue = progress_queue
+    _cancel_event = cancel_event
+    install_hooks(hooks)
+
+
+def _report(event):
+    """在子进程中发送进度事件；已请求取消时抛出 ``CropCancelled``。"""
+    from .crop import CropCancelled
+
+    _progress_queue.put(event)
+    if _cancel_event.is_set():
+        raise CropCancelled()
+
+
+def _count_pages(paths):
+    """在子进程中统计全部页数；无法打开的文件在处理时再报告错误。"""
+    import fitz
+
+    page_total = 0
+    for path in paths:
+        try:
+            with fitz.open(path) as pdf_document:
+                page_total += pdf_document.page_count
+        except Exception:
+            continue
+    return page_total
+
+
+def _crop_file(index, input_pdf_path, output_pdf_path, crop_options):
+    """在子进程中裁剪一个文件；被取消时返回 None。"""
+    from .crop import CropCancelled, auto_crop_pdf
+
+    if _cancel_event.is_set():
+        return None
+    try:
+        return auto_crop_pdf(
+            input_pdf_path,
+            output_pdf_path,
+            progress=lambda done, total: _report(("page", index, done, total)),
+            **crop_options,
+        )
+    except CropCancelled:
+        return None
+
+
+def _get_converter_pool():
+    """返回合并进程中常驻的转换进程池，进程退出时关闭 Word、Visio 等应用程序。"""
+    global _converter_pool
+    if _converter_pool is None:
+        from multiprocessing.util import Finalize
+
+        from .convert import ConverterPool
+
+        _converter_pool = ConverterPool()
+        # 进程池的子进程退出时不执行 atexit，改用 multiprocessing 的退出回调
+        Finalize(_converter_pool, _converter_pool.close, exitpriority=10)
+    return _converter_pool
+
+
+def _merge_files(input_paths, output_pdf_path, crop_options, save_profile):
+    """
+    在子进程中合并文件，返回 ``(MergeResult 或 None, [(路径, 异常)], 异常或 None)``；
+    被取消时结果与异常均为 None。合并失败时同样返回已跳过的文件。
+    """
+    from .crop import CropCancelled
+    from .pipeline import merge_files
+
+    skipped = []
+    try:
+        result = merge_files(
+            input_paths,
+            output_pdf_path,
+            converters=_get_converter_pool().converters(),
+            crop_options=crop_options,
+            save_profile=save_profile,
+            progress=lambda done, total: _report(("merge", done, total)),
+            on_error=lambda path, e: skipped.append((path, e)),
+        )
+    except CropCancelled:
+        return None, skipped, None
+    except Exception as e:
+        return None, skipped, e
+    return result, skipped, None
+
+
+class _BackgroundWorker(abc.ABC):
+    """
+    后台任务的公共部分：spawn 进程池、跨进程的进度队列与取消标志，以及供 GUI 轮询的事件队列。
+    子类必须实现在后台线程中执行的 ``_run``。
+
+    子进程通过进度队列发送事件，后台线程在等待结果的同时把它们转发到 ``events``，
+    ``poll`` 在 GUI 线程中取出事件并调用 ``_handle`` 更新统计信息。
+    """
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.finished = False
+        self.start_time = None
+        # Tk 与 PyMuPDF 都不适合在 fork 出的子进程中继续使用，统一使用 spawn
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = self._context.Queue()
+        self._cancel = self._context.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time if self.start_time is not None else 0.0
+
+    def cancel(self):
+        """请求取消。"""
+        self._cancel.set()
+
+    def poll(self):
+        """
+        不阻塞地取出当前所有事件，并更新统计信息。
+
+        Returns:
+            本次取出的事件列表。
+        """
+        events = []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            events.append(event)
+            if event[0] == "finished":
+                self.finished = True
+            else:
+                self._handle(event)
+        return events
+
+    def _handle(self, event):
+        """在 ``poll`` 中处理一个事件。"""
+
+    def _start_thread(self):
+        self.start_time = time.perf_counter()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @abc.abstractmethod
+    def _run(self):
+        """在后台线程中提交任务并转发进度，结束时发送 ("finished", 是否已取消)。"""
+
+    def _new_executor(self, workers):
+        # 已注册的可 pickle 钩子在子进程中同样生效
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=self._context,
+            initializer=_init_process,
+            initargs=(self._progress, self._cancel, pool_hooks()),
+        )
+
+    def _relay(self):
+        """把子进程发来的进度事件转发到 ``events``。"""
+        while True:
+            try:
+                self.events.put(self._progress.get_nowait())
+            except queue.Empty:
+                return
+
+    def _completed(self, futures):
+        """在转发进度事件的同时，按完成顺序产出 futures；取消后尚未开始的任务不再运行。"""
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=RELAY_INTERVAL, return_when=FIRST_COMPLETED)
+            if self.cancelled:
+                for future in pending:
+                    future.cancel()
+            self._relay()
+            yield from done
+
+
+class CropWorker(_BackgroundWorker):
+    """
+    在后台进程池中裁剪多个文件，并通过队列发送进度事件，供 GUI 以 ``window.after`` 轮询。
+
+    队列中的事件均为元组：
+        ("total", 总页数)：开始处理时统计的全部页数；
+        ("page", 文件下标, 已完成页数, 该文件页数)：每处理完一页发送一次；
+        ("file", 文件下标, CropResult 或 None, 异常或 None)：每个文件结束时发送一次，取消的文件不发送；
+        ("finished", 是否已取消)：全部结束后发送一次。
+
+    ``poll`` 在取出事件的同时更新 ``page_total``、``pages_done``、``files_done``、
+    ``errors`` 等统计信息，GUI 只需读取这些属性即可刷新界面。
+
+    Args:
+        tasks: ``(输入路径, 输出路径)`` 列表。
+        jobs: 并行进程数，默认为 CPU 核数与 4 中的较小值。
+        **crop_options: 传给 ``auto_crop_pdf`` 的其他参数，如 border_width、save_profile。
+    """
+
+    def __init__(self, tasks, jobs=None, **crop_options):
+        super().__init__()
+        self.tasks = list(tasks)
+        self.jobs = jobs or min(4, os.cpu_count() or 1)
+        self.crop_options = crop_options
+
+        self.page_total = 0
+        self.pages_done = 0
+        self.files_done = 0
+        self.results = {}
+        self.errors = []
+
+        self._file_pages = {}
+
+    def start(self):
+        """在后台线程中开始处理，立即返回。"""
+        self._start_thread()
+
+    def cancel(self):
+        """请求取消：正在处理的文件在当前页完成后停止（不写出输出），尚未开始的文件不再处理。"""
+        super().cancel()
+
+    def poll(self):
+        events = super().poll()
+        self.pages_done = sum(self._file_pages.values())
+        return events
+
+    def _handle(self, event):
+        kind = event[0]
+        if kind == "total":
+            self.page_total = event[1]
+        elif kind == "page":
+            self._file_pages[event[1]] = event[2]
+        elif kind == "file":
+            _, index, result, error = event
+            self.files_done += 1
+            if error is None:
+                self.results[index] = result
+            else:
+                self.errors.append((index, error))
+
+    def _run(self):
+        workers = max(min(self.jobs, len(self.tasks)), 1)
+        try:
+            with self._new_executor(workers) as executor:
+                # 先统计总页数，用于按页显示的进度条
+                futures = {executor.submit(_count_pages, [input_pdf_path for input_pdf_path, _ in self.tasks]): None}
+                for index, (input_pdf_path, output_pdf_path) in enumerate(self.tasks):
+                    future = executor.submit(_crop_file, index, input_pdf_path, output_pdf_path, self.crop_options)
+                    futures[future] = index
+
+                for future in self._completed(futures):
+                    index = futures[future]
+                    if future.cancelled():
+                        continue
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if index is not None:
+                            self.events.put(("file", index, None, e))
+                        continue
+                    if index is None:
+                        self.events.put(("total", result))
+                    elif result is not None:
+                        self.events.put(("file", index, result, None))
+        finally:
+            # 进程池关闭时子进程已退出，其发送的进度事件都已到达
+            self._relay()
+            self.events.put(("finished", self.cancelled))
+
+
+class MergeWorker(_BackgroundWorker):
+    """
+    在常驻的后台进程中依次转换、按需裁剪并合并文件，供 GUI 以 ``window.after`` 轮询。
+
+    同一个对象可以多次调用 ``start``。后台进程及其中的 Word、Visio 转换进程池
+    一直保留到 ``close``，之后的合并不必重新启动这些应用程序。
+
+    队列中的事件均为元组：
+        ("merge", 已完成文件数, 文件总数)：每处理完一个文件发送一次；
+        ("result", MergeResult 或 None, [(路径, 异常)], 异常或 None)：合并结束时发送一次，
+            列表为转换失败、已跳过的文件；取消时结果与异常均为 None；
+        ("finished", 是否已取消)：最后发送一次。
+
+    ``poll`` 在取出事件的同时更新 ``files_done``、``file_total``、``result``、``skipped``
+    与 ``error``。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._executor = None
+        self._task = None
+        self._reset()
+
+    def _reset(self):
+        self.files_done = 0
+        self.file_total = 0
+        self.result = None
+        self.skipped = []
+        self.error = None
+        self.finished = False
+
+    def start(self, input_paths, output_pdf_path, crop_options=None, save_profile="fast"):
+        """
+        在后台开始合并，立即返回。
+
+        Args:
+            input_paths: 输入文件路径列表，格式见 ``open_as_pdf``。
+            output_pdf_path: 输出 PDF 文件的路径。
+            crop_options: ``CropOptions`` 对象，默认为 None（不裁剪）。
+            save_profile: 保存配置，取值见 ``SAVE_PROFILES``，默认为 "fast"。
+        """
+        self._reset()
+        self.file_total = len(input_paths)
+        # 丢弃上一次合并残留的进度事件
+        self._relay()
+        self.events = queue.Queue()
+        self._cancel.clear()
+        self._task = (list(input_paths), output_pdf_path, crop_options, save_profile)
+        self._start_thread()
+
+    def cancel(self):
+        """请求取消：当前文件处理完后停止，不写出输出文件。"""
+        super().cancel()
+
+    def close(self):
+        """关闭后台进程及其中的转换进程池，等待正在进行的合并结束。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _handle(self, event):
+        kind = event[0]
+        if kind == "merge":
+            _, self.files_done, self.file_total = event
+        elif kind == "result":
+            _, self.result, self.skipped, self.error = event
+
+    def _run(self):
+        result, skipped, error = None, [], None
+        try:
+            if self._executor is None:
+                self._executor = self._new_executor(1)
+            future = self._executor.submit(_merge_files, *self._task)
+            for _ in self._completed([future]):
+                pass
+            if not future.cancelled():
+                result, skipped, error = future.result()
+        except BrokenProcessPool as e:
+            # 后台进程意外退出，下次合并时重新启动
+            self._executor = None
+            error = e
+        except Exception as e:
+            error = e
+        finally:
+            self._relay()
+            self.events.put(("result", result, skipped, error))
+            self.events.put(("finished", self.cancelled))
@@ -0,0 +1,32 @@
+"""测试的公共设置：把仓库根目录加入导入路径，并提供生成测试 PDF 的工具。"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    返回 ``make_pdf(name, pages, size=(300, 400))``：每页画出给定的无描边实心矩形并保存，返回文件路径。
+
+    pages 为每页的矩形列表，矩形为页面坐标中的 ``(x0, y0, x1, y1)``；空列表表示空白页。
+    """
+    import fitz
+
+    def make(name, pages, size=(300, 400)):
+        path = str(tmp_path / name)
+        with fitz.open() as pdf_document:
+            for rects in pages:
+                page = pdf_document.new_page(width=size[0], height=size[1])
+                for rect in rects:
+                    page.draw_rect(fitz.Rect(rect), color=None, fill=(0, 0, 0))
+            pdf_document.save(path)
+        return path
+
+    return make
@@ -0,0 +1,55 @@
+"""按页面内容哈希的裁剪区域缓存。"""
+
+import fitz
+
+from pdfcrop import CropCache, auto_crop_pdf
+
+
+def test_get_put_and_blank_pages(tmp_path):
+    cache = CropCache(str(tmp_path / "cache"))
+    assert cache.get("missing") is None
+    cache.put("page", (1.0, 2.0, 3.0, 4.0))
+    cache.put("blank", None)
+    assert cache.get("page") == (1.0, 2.0, 3.0, 4.0)
+    # 不需要裁剪的页面以空元组表示，与未命中区分
+    assert cache.get("blank") == ()
+    cache.close()
+
+    reopened = CropCache(str(tmp_path / "cache"))
+    assert reopened.get("page") == (1.0, 2.0, 3.0, 4.0)
+    reopened.close()
+
+
+def test_page_key_depends_on_content_and_params(tmp_path, make_pdf):
+    first = make_pdf("first.pdf", [[(50, 50, 100, 100)], [(60, 60, 200, 200)]])
+    # 另一个文件中内容相同的页面
+    second = make_pdf("second.pdf", [[(10, 10, 20, 20)], [(50, 50, 100, 100)]])
+    cache = CropCache(str(tmp_path / "cache"))
+    with fitz.open(first) as a, fitz.open(second) as b:
+        key = cache.page_key(a[0], border_width=5, mode="raster")
+        assert cache.page_key(b[1], border_width=5, mode="raster") == key
+        assert cache.page_key(a[1], border_width=5, mode="raster") != key
+        assert cache.page_key(a[0], border_width=6, mode="raster") != key
+        assert cache.page_key(a[0], border_width=5, mode="vector") != key
+
+
+def test_second_run_hits_cache(tmp_path, make_pdf):
+    input_pdf_path = make_pdf("in.pdf", [[(50, 50, 100, 100)], [(60, 60, 200, 200)], []])
+    cache = CropCache(str(tmp_path / "cache"))
+    auto_crop_pdf(input_pdf_path, str(tmp_path / "out1.pdf"), cache=cache)
+    cache.flush()
+
+    hits = []
+    original_get = cache.get
+
+    def counting_get(key):
+        value = original_get(key)
+        hits.append(value is not None)
+        return value
+
+    cache.get = counting_get
+    auto_crop_pdf(input_pdf_path, str(tmp_path / "out2.pdf"), cache=cache)
+    cache.close()
+    assert hits == [True, True, True]
+    with fitz.open(str(tmp_path / "out1.pdf")) as out1, fitz.open(str(tmp_path / "out2.pdf")) as out2:
+        assert [page.rect for page in out1] == [page.rect for page in out2]
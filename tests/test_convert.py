@@ -0,0 +1,103 @@
+"""转换进程池：用 FakeBackend 检查复用、超时后的清理与关闭。"""
+
+import os
+import time
+
+import fitz
+import pytest
+
+from pdfcrop.convert import ConversionError, ConversionTimeout, ConverterPool, FakeBackend
+
+
+def subject(path):
+    """FakeBackend 写入的 ``(进程号, 启动次数, 已转换的文件数)``。"""
+    with fitz.open(path) as pdf_document:
+        return tuple(int(part) for part in pdf_document.metadata["subject"].split(":"))
+
+
+def process_exited(pid, timeout=5):
+    """等待进程退出（或只剩僵尸进程），返回是否已退出。"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        try:
+            with open(f"/proc/{pid}/stat") as stat_file:
+                if stat_file.read().rsplit(")", 1)[1].split()[0] == "Z":
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """返回 ``make(name)``：创建一个空的输入文件（FakeBackend 不读取内容）。"""
+
+    def make(name):
+        path = tmp_path / name
+        path.touch()
+        return str(path)
+
+    return make
+
+
+def test_conversions_reuse_the_worker_and_backend(tmp_path, inputs):
+    with ConverterPool({".doc": FakeBackend()}, timeout=30) as pool:
+        first, second = str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")
+        pool.convert(inputs("a.doc"), first)
+        pool.convert(inputs("b.doc"), second)
+    pid, starts, converted = subject(first)
+    assert pid != os.getpid()
+    assert (starts, converted) == (1, 1)
+    assert subject(second) == (pid, 1, 2)
+
+
+def test_failed_conversion_restarts_the_backend(tmp_path, inputs):
+    with ConverterPool({".doc": FakeBackend(), ".bad": FakeBackend(fail=True)}, timeout=30) as pool:
+        with pytest.raises(ConversionError, match="模拟转换失败"):
+            pool.convert(inputs("a.bad"), str(tmp_path / "a.pdf"))
+        output_pdf_path = str(tmp_path / "b.pdf")
+        pool.convert(inputs("b.doc"), output_pdf_path)
+    assert subject(output_pdf_path)[1:] == (1, 1)
+
+
+def test_timeout_kills_the_worker_and_its_helper(tmp_path, inputs):
+    backends = {".doc": FakeBackend(helper=True), ".slow": FakeBackend(delay=30)}
+    with ConverterPool(backends, timeout=1) as pool:
+        before = str(tmp_path / "before.pdf")
+        pool.convert(inputs("a.doc"), before)
+        # 空闲的转换进程及其报告的外部程序进程号
+        (worker,) = pool._idle.queue
+        (helper_pid,) = worker.process_ids
+
+        start = time.monotonic()
+        with pytest.raises(ConversionTimeout):
+            pool.convert(inputs("b.slow"), str(tmp_path / "b.pdf"))
+        assert time.monotonic() - start < 10
+        assert not worker.process.is_alive()
+        assert process_exited(helper_pid)
+
+        # 下一个文件在新启动的转换进程中完成
+        after = str(tmp_path / "after.pdf")
+        pool.convert(inputs("c.doc"), after)
+    assert subject(after)[0] != subject(before)[0]
+    assert subject(after)[1:] == (1, 1)
+
+
+def test_close_stops_workers_and_rejects_new_work(tmp_path, inputs):
+    pool = ConverterPool({".doc": FakeBackend(helper=True)}, workers=2, timeout=30)
+    pool.convert(inputs("a.doc"), str(tmp_path / "a.pdf"))
+    workers = [worker for worker in pool._idle.queue if worker is not None]
+    helper_pids = [pid for worker in workers for pid in worker.process_ids]
+    assert len(workers) == 1 and len(helper_pids) == 1
+
+    pool.close()
+    pool.close()
+    assert not workers[0].process.is_alive()
+    assert all(process_exited(pid) for pid in helper_pids)
+    with pytest.raises(ConversionError):
+        pool.convert(inputs("b.doc"), str(tmp_path / "b.pdf"))
@@ -0,0 +1,45 @@
+"""NumPy 检测引擎与原先逐像素循环的一致性。"""
+
+import numpy as np
+import pytest
+
+from pdfcrop.detect import find_content_box
+
+
+def loop_content_box(image_array, border_width):
+    """原先 auto_crop_pdf 中逐像素查找非白色像素的循环，返回值换算为开区间。"""
+    height, width = image_array.shape
+    left, top, right, bottom = width, height, 0, 0
+    for y in range(height):
+        for x in range(width):
+            is_border = x < border_width or y < border_width or x >= width - border_width or y >= height - border_width
+            if not is_border and image_array[y, x] < 255:
+                left = min(left, x)
+                right = max(right, x)
+                top = min(top, y)
+                bottom = max(bottom, y)
+    if left == width and top == height and right == 0 and bottom == 0:
+        return None
+    return left, top, right + 1, bottom + 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("border_width", [0, 1, 5])
+def test_matches_pixel_loop(seed, border_width):
+    rng = np.random.default_rng(seed)
+    gray = np.full((rng.integers(1, 40), rng.integers(1, 40)), 255, dtype=np.uint8)
+    # 随机撒下少量非白色像素，包括落在边框内的
+    count = rng.integers(0, 6)
+    ys = rng.integers(0, gray.shape[0], count)
+    xs = rng.integers(0, gray.shape[1], count)
+    gray[ys, xs] = rng.integers(0, 255, count)
+    assert find_content_box(gray, border_width) == loop_content_box(gray, border_width)
+
+
+def test_blank_and_border_only_pages_are_not_cropped():
+    gray = np.full((30, 20), 255, dtype=np.uint8)
+    assert find_content_box(gray, 5) is None
+    gray[0, :] = 0
+    gray[:, -1] = 0
+    assert find_content_box(gray, 5) is None
+    assert find_content_box(gray, 0) == (0, 0, 20, 30)
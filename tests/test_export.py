@@ -0,0 +1,76 @@
+"""导出图片：文件名模板与导出的文件。"""
+
+import os
+
+import fitz
+import pytest
+
+from pdfcrop import auto_crop_pdf, check_export_options, export_file_path, write_exported_figures
+
+
+def test_default_template(tmp_path):
+    output_pdf_path = str(tmp_path / "paper_cropped.pdf")
+    assert export_file_path(output_pdf_path, 0, 0, "png") == str(tmp_path / "paper_cropped_p1_1.png")
+
+
+def test_template_fields_and_subfolders(tmp_path):
+    output_pdf_path = str(tmp_path / "paper.pdf")
+    path = export_file_path(output_pdf_path, 4, 1, "svg", "{stem}/fig_{page:03d}_{index}.{ext}")
+    assert path == os.path.join(str(tmp_path), "paper", "fig_005_2.svg")
+
+
+@pytest.mark.parametrize("template", ["{name}.{ext}", "{page", "{0}.png", "{page:x.y}"])
+def test_invalid_templates_are_rejected(template):
+    with pytest.raises(ValueError):
+        check_export_options("png", 300, template)
+
+
+def test_invalid_format_and_dpi_are_rejected():
+    with pytest.raises(ValueError):
+        check_export_options("jpg", 300, "{stem}.{ext}")
+    with pytest.raises(ValueError):
+        check_export_options("png", 0, "{stem}.{ext}")
+    check_export_options(None, 300, "{stem}_p{page}_{index}.{ext}")
+
+
+def test_duplicate_file_names_are_rejected(tmp_path):
+    with fitz.open() as pdf_document:
+        pdf_document.new_page()
+        pdf_document.new_page()
+        crop_rects = [(0, 0, 10, 10), (0, 0, 20, 20)]
+        with pytest.raises(ValueError):
+            write_exported_figures(pdf_document, crop_rects, str(tmp_path / "a.pdf"), template="{stem}.{ext}")
+    assert os.listdir(tmp_path) == []
+
+
+def test_export_writes_one_file_per_region(tmp_path, make_pdf):
+    pages = [[(20, 20, 100, 80), (20, 200, 280, 380)], [], [(50, 50, 150, 150)]]
+    input_pdf_path = make_pdf("in.pdf", pages)
+    output_pdf_path = str(tmp_path / "out" / "paper.pdf")
+
+    auto_crop_pdf(
+        input_pdf_path,
+        output_pdf_path,
+        border_width=0,
+        figure_gap=20,
+        export_format="png",
+        export_dpi=72,
+        export_template="{stem}/fig_{page:02d}_{index}.{ext}",
+    )
+
+    folder = tmp_path / "out" / "paper"
+    # 空白页不导出，不留下临时文件
+    assert sorted(os.listdir(folder)) == ["fig_01_1.png", "fig_01_2.png", "fig_03_1.png"]
+    sizes = []
+    for name in sorted(os.listdir(folder)):
+        pix = fitz.Pixmap(str(folder / name))
+        sizes.append((pix.width, pix.height))
+    assert sizes == [(80, 60), (260, 180), (100, 100)]
+
+
+def test_svg_export(tmp_path, make_pdf):
+    input_pdf_path = make_pdf("in.pdf", [[(50, 50, 150, 150)]])
+    output_pdf_path = str(tmp_path / "paper.pdf")
+    auto_crop_pdf(input_pdf_path, output_pdf_path, border_width=0, export_format="svg")
+    with open(tmp_path / "paper_p1_1.svg", encoding="utf-8") as svg_file:
+        assert "<svg" in svg_file.read()
@@ -0,0 +1,109 @@
+"""增量模式：未变化的文件在再次运行时跳过。"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from conftest import ROOT
+
+from pdfcrop import Manifest, file_signature
+from pdfcrop.manifest import MANIFEST_NAME
+
+SCRIPT = os.path.join(ROOT, "pdf_crop_script.py")
+
+
+def run_script(*args):
+    completed = subprocess.run(
+        [sys.executable, SCRIPT, *args], capture_output=True, text=True, encoding="utf-8", check=True
+    )
+    return completed.stdout
+
+
+def test_rerun_skips_unchanged_files(tmp_path, make_pdf):
+    first = make_pdf("a.pdf", [[(50, 50, 100, 100)]])
+    second = make_pdf("b.pdf", [[(60, 60, 200, 200)]])
+    output_folder = str(tmp_path / "out")
+
+    output = run_script(first, second, "-o", output_folder, "-j", "1", "--incremental")
+    assert "跳过" not in output
+    assert os.path.exists(os.path.join(output_folder, "a_cropped.pdf"))
+
+    output = run_script(first, second, "-o", output_folder, "-j", "1", "--incremental")
+    assert output.count("跳过（未变化）") == 2
+
+    # 参数变化时全部重新处理，输入文件变化时只重新处理该文件
+    output = run_script(first, second, "-o", output_folder, "-j", "1", "--incremental", "-b", "3")
+    assert "跳过" not in output
+    make_pdf("b.pdf", [[(10, 10, 250, 250)]])
+    output = run_script(first, second, "-o", output_folder, "-j", "1", "--incremental", "-b", "3")
+    assert output.count("跳过（未变化）") == 1
+    assert f"跳过（未变化）: {first}" in output
+
+
+@pytest.mark.parametrize(
+    "args, outputs",
+    [
+        (["--export", "png", "--export-dpi", "36", "--split-figures", "20"], ["a_cropped_p1_1.png", "a_cropped_p1_2.png"]),
+        (["--split-figures", "20", "--figure-output", "files"], ["a_cropped_p1_1.pdf", "a_cropped_p1_2.pdf"]),
+    ],
+)
+def test_rerun_skips_files_without_a_cropped_pdf(tmp_path, make_pdf, args, outputs):
+    # 导出图片与图表逐个输出时不写出 a_cropped.pdf，清单按实际写出的文件判断
+    input_pdf_path = make_pdf("a.pdf", [[(20, 20, 100, 80), (20, 200, 280, 380)]])
+    output_folder = str(tmp_path / "out")
+    command = [input_pdf_path, "-o", output_folder, "-j", "1", "--incremental", *args]
+
+    output = run_script(*command)
+    assert "跳过" not in output
+    assert "a_cropped.pdf " not in output
+    assert sorted(os.listdir(output_folder)) == sorted([MANIFEST_NAME, *outputs])
+
+    assert "跳过（未变化）" in run_script(*command)
+
+    # 删除任意一个输出文件后重新处理
+    os.remove(os.path.join(output_folder, outputs[1]))
+    assert "跳过" not in run_script(*command)
+    assert os.path.exists(os.path.join(output_folder, outputs[1]))
+
+
+def test_manifest_round_trip(tmp_path, make_pdf):
+    input_pdf_path = make_pdf("a.pdf", [[(50, 50, 100, 100)]])
+    output_pdf_path = str(tmp_path / "a_cropped.pdf")
+    open(output_pdf_path, "wb").close()
+    # 元组参数写入 JSON 后变为列表，读回后仍应视为相同参数
+    params = {"border_width": 5, "uniform": (5, 5)}
+
+    manifest = Manifest(str(tmp_path))
+    assert not manifest.is_current(input_pdf_path, output_pdf_path, params)
+    manifest.record(input_pdf_path, output_pdf_path, params, file_signature(input_pdf_path))
+
+    reloaded = Manifest(str(tmp_path))
+    assert reloaded.is_current(input_pdf_path, output_pdf_path, params)
+    assert not reloaded.is_current(input_pdf_path, output_pdf_path, {**params, "border_width": 6})
+    os.remove(output_pdf_path)
+    assert not reloaded.is_current(input_pdf_path, output_pdf_path, params)
+
+
+@pytest.mark.parametrize(
+    "tail",
+    ['{"input": "/x", "si', '{"input": "/x", "size": 1, "mtime_ns": 1, "params": {}, "output": "/y"}'],
+)
+def test_record_after_a_truncated_last_line(tmp_path, make_pdf, tail):
+    input_pdf_path = make_pdf("a.pdf", [[(50, 50, 100, 100)]])
+    output_pdf_path = str(tmp_path / "a_cropped.pdf")
+    open(output_pdf_path, "wb").close()
+    params = {"border_width": 5}
+
+    manifest = Manifest(str(tmp_path))
+    manifest.record(input_pdf_path, output_pdf_path, params, file_signature(input_pdf_path))
+    # 模拟崩溃：最后一行没有写完（或没有写入换行符）
+    with open(manifest.path, "a", encoding="utf-8") as manifest_file:
+        manifest_file.write(tail)
+
+    second = make_pdf("b.pdf", [[(60, 60, 200, 200)]])
+    Manifest(str(tmp_path)).record(second, output_pdf_path, params, file_signature(second))
+
+    reloaded = Manifest(str(tmp_path))
+    assert reloaded.is_current(input_pdf_path, output_pdf_path, params)
+    assert reloaded.is_current(second, output_pdf_path, params)
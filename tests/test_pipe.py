@@ -0,0 +1,71 @@
+"""命令行中的 "-"：从标准输入读取、写入标准输出。"""
+
+import os
+import subprocess
+import sys
+
+import fitz
+import pytest
+
+from conftest import ROOT
+
+SCRIPT = os.path.join(ROOT, "pdf_crop_script.py")
+
+
+def run_script(*args, data=None):
+    return subprocess.run([sys.executable, SCRIPT, *args], input=data, capture_output=True)
+
+
+def page_rects(data):
+    with fitz.open("pdf", data) as pdf_document:
+        return [tuple(page.rect) for page in pdf_document]
+
+
+@pytest.fixture
+def input_pdf_path(make_pdf):
+    return make_pdf("in.pdf", [[(50, 60, 150, 200)], [(20, 20, 80, 80)]])
+
+
+def test_stdin_to_stdout(input_pdf_path):
+    with open(input_pdf_path, "rb") as input_file:
+        completed = run_script("-", "-o", "-", "-b", "0", data=input_file.read())
+    assert completed.returncode == 0, completed.stderr
+    # 标准输出中只有 PDF，PyMuPDF 的警告等信息都在标准错误
+    assert completed.stdout.startswith(b"%PDF")
+    assert page_rects(completed.stdout) == [(0, 0, 100, 140), (0, 0, 60, 60)]
+
+
+def test_file_to_stdout(input_pdf_path):
+    completed = run_script(input_pdf_path, "-o", "-", "-b", "0")
+    assert completed.returncode == 0, completed.stderr
+    assert page_rects(completed.stdout) == [(0, 0, 100, 140), (0, 0, 60, 60)]
+
+
+def test_stdin_to_folder(input_pdf_path, tmp_path):
+    output_folder = str(tmp_path / "out")
+    with open(input_pdf_path, "rb") as input_file:
+        completed = run_script("-", "-o", output_folder, "-b", "0", data=input_file.read())
+    assert completed.returncode == 0, completed.stderr
+    with open(os.path.join(output_folder, "stdin_cropped.pdf"), "rb") as output_file:
+        assert page_rects(output_file.read()) == [(0, 0, 100, 140), (0, 0, 60, 60)]
+
+
+def test_invalid_stdin_fails():
+    completed = run_script("-", "-o", "-", data=b"not a pdf")
+    assert completed.returncode != 0
+    assert completed.stdout == b""
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-", "-", "-o", "-"],
+        ["-", "-o", "-", "--export", "png"],
+        ["-", "-o", "-", "-r"],
+        ["-", "-o", "-", "--split-figures", "10", "--figure-output", "files"],
+    ],
+)
+def test_unsupported_combinations_are_rejected(args):
+    completed = run_script(*args, data=b"")
+    assert completed.returncode == 2
+    assert '使用 "-" 时' in completed.stderr.decode("utf-8", "replace")
@@ -0,0 +1,29 @@
+"""转换→裁剪→合并流水线：跳过出错的文件。"""
+
+import fitz
+
+from pdfcrop import pipeline
+from pdfcrop.pipeline import merge_files
+
+
+def test_skipped_file_leaves_no_partial_pages(tmp_path, make_pdf, monkeypatch):
+    first = make_pdf("a.pdf", [[(50, 50, 100, 100)]])
+    broken = make_pdf("b.pdf", [[(50, 50, 100, 100)]] * 3)
+    last = make_pdf("c.pdf", [[(50, 50, 100, 100)]] * 2)
+
+    append_document = pipeline._append_document
+
+    def fail_midway(output_pdf, pdf_document, crop_options):
+        append_document(output_pdf, pdf_document, crop_options)
+        if pdf_document.page_count == 3:
+            raise RuntimeError("追加到一半失败")
+
+    monkeypatch.setattr(pipeline, "_append_document", fail_midway)
+    skipped = []
+    output_pdf_path = str(tmp_path / "merged.pdf")
+    result = merge_files([first, broken, last], output_pdf_path, on_error=lambda path, e: skipped.append(path))
+
+    assert skipped == [broken]
+    assert (result.file_count, result.page_count) == (2, 3)
+    with fitz.open(output_pdf_path) as pdf_document:
+        assert pdf_document.page_count == 3
@@ -0,0 +1,35 @@
+"""递归 XY 切分的多图表分割。"""
+
+import numpy as np
+
+from pdfcrop.segment import segment_content_boxes
+
+
+def page_with(boxes, shape=(200, 300)):
+    gray = np.full(shape, 255, dtype=np.uint8)
+    for left, top, right, bottom in boxes:
+        gray[top:bottom, left:right] = 0
+    return gray
+
+
+def test_side_by_side_figures_are_split():
+    boxes = [(20, 30, 100, 120), (150, 40, 260, 110)]
+    assert segment_content_boxes(page_with(boxes), border_width=5, gap=20) == boxes
+
+
+def test_narrow_gap_keeps_one_region():
+    boxes = [(20, 30, 100, 120), (110, 40, 260, 110)]
+    assert segment_content_boxes(page_with(boxes), border_width=5, gap=20) == [(20, 30, 260, 120)]
+
+
+def test_nested_cuts_in_reading_order():
+    # 上方一行两个图表，下方一个通栏图表：先按行切开，再把上一行按列切开
+    boxes = [(160, 20, 280, 80), (20, 20, 120, 80), (20, 120, 280, 180)]
+    expected = [(20, 20, 120, 80), (160, 20, 280, 80), (20, 120, 280, 180)]
+    assert segment_content_boxes(page_with(boxes), border_width=5, gap=20) == expected
+
+
+def test_min_size_drops_small_regions_and_blank_page_is_empty():
+    boxes = [(20, 30, 200, 150), (140, 185, 146, 190)]
+    assert segment_content_boxes(page_with(boxes), border_width=5, gap=20, min_size=10) == [(20, 30, 200, 150)]
+    assert segment_content_boxes(page_with([]), border_width=5, gap=20) == []
@@ -0,0 +1,192 @@
+"""裁剪服务：各类请求的状态码与响应内容。"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+
+import fitz
+import pytest
+
+from pdfcrop.server import CropService, WorkerCrashed, make_server
+
+
+@pytest.fixture(scope="module")
+def server():
+    # 只有一个子进程且不排队，便于构造 429
+    service = CropService(1, 0)
+    http_server = make_server(service, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+    service.close()
+
+
+def request(server, method, path, body=None, headers=None):
+    """发送请求，返回 ``(状态码, 响应头, 响应体)``；headers 中的 Content-Length 原样发送。"""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=30)
+    try:
+        connection.putrequest(method, path)
+        headers = dict(headers or {})
+        if body is not None and "Content-Length" not in headers:
+            headers["Content-Length"] = str(len(body))
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        connection.close()
+
+
+def post_json(server, path, payload):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    return request(server, "POST", path, body, {"Content-Type": "application/json"})
+
+
+def test_health_and_unknown_paths(server):
+    assert request(server, "GET", "/health")[0] == 200
+    assert request(server, "GET", "/nothing")[0] == 404
+    assert request(server, "POST", "/nothing", b"")[0] == 404
+
+
+def test_content_length(server):
+    assert request(server, "POST", "/crop")[0] == 411
+    for value in ("abc", "-5"):
+        status, _, body = request(server, "POST", "/crop", headers={"Content-Length": value})
+        assert status == 400
+        assert "Content-Length" in json.loads(body)["error"]
+    too_large = str(server.max_body + 1)
+    assert request(server, "POST", "/crop", headers={"Content-Length": too_large})[0] == 413
+
+
+@pytest.mark.parametrize("body", [b"[1]", b'"x"', b"{", b'{"input": "a.pdf", "options": [1]}'])
+def test_invalid_json_returns_400(server, body):
+    status, _, response = post_json(server, "/crop", body)
+    assert status == 400
+    assert "error" in json.loads(response)
+
+
+@pytest.mark.parametrize("options", [{"border_width": [1]}, {"border_width": {}}, {"uniform": 3}, {"mode": 1}])
+def test_options_of_the_wrong_json_type_return_400(server, options):
+    status, _, body = post_json(server, "/crop", {"input": "a.pdf", "output": "b.pdf", "options": options})
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_invalid_options_return_400(server):
+    assert request(server, "POST", "/crop?mode=nothing", b"%PDF")[0] == 400
+    assert request(server, "POST", "/crop?unknown=1", b"%PDF")[0] == 400
+
+
+def test_invalid_pdf_returns_422(server):
+    assert request(server, "POST", "/crop", b"not a pdf")[0] == 422
+
+
+def test_crop_bytes(server, make_pdf):
+    input_pdf_path = make_pdf("in.pdf", [[(50, 60, 150, 200)], [(20, 20, 80, 80)]])
+    with open(input_pdf_path, "rb") as input_file:
+        data = input_file.read()
+
+    status, headers, body = request(server, "POST", "/crop?border_width=0", data)
+    assert status == 200
+    assert headers["Content-Type"] == "application/pdf"
+    assert headers["X-Page-Count"] == "2"
+    with fitz.open("pdf", body) as pdf_document:
+        assert [tuple(page.rect) for page in pdf_document] == [(0, 0, 100, 140), (0, 0, 60, 60)]
+
+
+def test_crop_paths(server, make_pdf, tmp_path):
+    input_pdf_path = make_pdf("in.pdf", [[(50, 60, 150, 200)]])
+    output_pdf_path = str(tmp_path / "out.pdf")
+    status, _, body = post_json(server, "/crop", {"input": input_pdf_path, "output": output_pdf_path})
+    assert status == 200
+    assert json.loads(body)["page_count"] == 1
+    with fitz.open(output_pdf_path) as pdf_document:
+        assert pdf_document.page_count == 1
+
+
+def test_boxes_honour_uniform(server, make_pdf, tmp_path):
+    pages = [[(50, 50, 150, 150)]] * 4 + [[(60, 60, 120, 120)]]
+    input_pdf_path = make_pdf("in.pdf", pages)
+    options = {"uniform": "2", "border_width": 0}
+
+    status, _, body = post_json(server, "/boxes", {"input": input_pdf_path, "options": options})
+    assert status == 200
+    boxes = json.loads(body)["boxes"]
+    assert len(boxes) == 5
+    # 最后一页的内容较小，但与其余页面得到同一个区域
+    assert all(box == boxes[0] for box in boxes)
+
+    output_pdf_path = str(tmp_path / "out.pdf")
+    status, _, _ = post_json(server, "/crop", {"input": input_pdf_path, "output": output_pdf_path, "options": options})
+    assert status == 200
+    with fitz.open(output_pdf_path) as pdf_document:
+        width, height = boxes[0][2] - boxes[0][0], boxes[0][3] - boxes[0][1]
+        assert [tuple(page.rect)[2:] for page in pdf_document] == [(width, height)] * 5
+
+
+def test_busy_returns_429(server, make_pdf):
+    service = server.service
+    worker = threading.Thread(target=service.run, args=(time.sleep, 2))
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while service.metrics()["in_flight"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        input_pdf_path = make_pdf("in.pdf", [[(50, 50, 150, 150)]])
+        with open(input_pdf_path, "rb") as input_file:
+            status, headers, _ = request(server, "POST", "/crop", input_file.read())
+        assert status == 429
+        assert headers["Retry-After"] == "1"
+    finally:
+        worker.join()
+    assert service.metrics()["rejected"] >= 1
+
+
+def test_worker_crash_rebuilds_the_pool(server, make_pdf):
+    service = server.service
+    restarts = service.metrics()["restarts"]
+    with pytest.raises(WorkerCrashed):
+        service.run(os._exit, 1)
+    assert service.metrics()["restarts"] == restarts + 1
+
+    # 之后的请求由新的进程池处理
+    assert service.run(abs, -1) == 1
+    input_pdf_path = make_pdf("in.pdf", [[(50, 50, 150, 150)]])
+    with open(input_pdf_path, "rb") as input_file:
+        assert request(server, "POST", "/crop", input_file.read())[0] == 200
+
+
+def test_worker_crash_returns_503(server, monkeypatch):
+    def crash(*args):
+        raise WorkerCrashed("crashed")
+
+    monkeypatch.setattr(server.service, "run", crash)
+    status, headers, _ = request(server, "POST", "/crop", b"%PDF")
+    assert status == 503
+    assert headers["Retry-After"] == "1"
+
+
+def test_unix_socket_path_must_not_be_a_regular_file(tmp_path):
+    path = tmp_path / "s"
+    path.write_text("keep me")
+    with pytest.raises(ValueError):
+        make_server(None, unix_socket=str(path))
+    assert path.read_text() == "keep me"
+
+
+def test_stale_unix_socket_is_replaced(tmp_path):
+    path = str(tmp_path / "s")
+    with socket.socket(socket.AF_UNIX) as stale:
+        stale.bind(path)
+    http_server = make_server(None, unix_socket=path)
+    try:
+        assert os.path.exists(path)
+    finally:
+        http_server.server_close()
@@ -0,0 +1,56 @@
+"""统一裁剪：抽样页面求出共同区域，其余页面经检查后直接使用。"""
+
+import fitz
+import pytest
+
+from pdfcrop import auto_crop_pdf, parse_uniform_sample
+
+
+def page_sizes(path):
+    with fitz.open(path) as pdf_document:
+        return [(round(page.rect.width, 2), round(page.rect.height, 2)) for page in pdf_document]
+
+
+def test_all_pages_get_the_union_of_the_sample(tmp_path, make_pdf):
+    # 开头两页的内容合起来为 (40, 40, 260, 360)，其余页面大小不一，但都在其中
+    pages = [[(40, 40, 100, 100)], [(200, 300, 260, 360)]]
+    pages += [[(45 + i % 7, 45 + i % 5, 200 + i, 300 + i)] for i in range(30)]
+    input_pdf_path = make_pdf("in.pdf", pages)
+    output_pdf_path = str(tmp_path / "out.pdf")
+    result = auto_crop_pdf(input_pdf_path, output_pdf_path, uniform=(2, 3))
+    assert result.page_count == 32
+    assert page_sizes(output_pdf_path) == [(220.0, 320.0)] * 32
+
+
+def test_pages_outside_the_region_fall_back(tmp_path, make_pdf):
+    pages = [[(50, 50, 150, 150)]] * 10 + [[(20, 20, 280, 380)], []]
+    input_pdf_path = make_pdf("in.pdf", pages)
+    output_pdf_path = str(tmp_path / "out.pdf")
+    auto_crop_pdf(input_pdf_path, output_pdf_path, uniform=(3, 0))
+    sizes = page_sizes(output_pdf_path)
+    assert sizes[:10] == [(100.0, 100.0)] * 10
+    assert sizes[10] == (260.0, 360.0)
+    # 空白页的内容也在共同区域之内，同样使用它，页面尺寸保持一致
+    assert sizes[11] == (100.0, 100.0)
+
+
+def test_percentile_ignores_an_outlier_in_the_sample(tmp_path, make_pdf):
+    pages = [[(50, 50, 150, 150)]] * 9 + [[(20, 50, 150, 150)]]
+    input_pdf_path = make_pdf("in.pdf", pages)
+    output_pdf_path = str(tmp_path / "out.pdf")
+    auto_crop_pdf(input_pdf_path, output_pdf_path, uniform=(10, 0), uniform_percentile=80)
+    sizes = page_sizes(output_pdf_path)
+    assert sizes[:9] == [(100.0, 100.0)] * 9
+    # 向外突出的抽样页面保留自己的区域
+    assert sizes[9] == (130.0, 100.0)
+
+
+def test_parse_and_conflicts(make_pdf, tmp_path):
+    assert parse_uniform_sample("4,2") == (4, 2)
+    assert parse_uniform_sample("4") == (4, 0)
+    for value in ("0,0", "-1,2", "1,2,3"):
+        with pytest.raises(ValueError):
+            parse_uniform_sample(value)
+    input_pdf_path = make_pdf("in.pdf", [[(50, 50, 150, 150)]])
+    with pytest.raises(ValueError):
+        auto_crop_pdf(input_pdf_path, str(tmp_path / "out.pdf"), uniform=(1, 1), figure_gap=20)
@@ -0,0 +1,45 @@
+"""热文件夹监视：完成标记与清单使用实际写出的文件。"""
+
+import os
+import shutil
+import threading
+
+from pdfcrop import watch_folder
+
+
+def watch_once(folder, output_folder, timeout=5, **crop_options):
+    """监视到第一个事件（或 timeout 秒内没有事件）后停止，返回收到的事件列表。"""
+    stop_event = threading.Event()
+    timer = threading.Timer(timeout, stop_event.set)
+    timer.start()
+    events = []
+    watcher = watch_folder(
+        folder, output_folder, jobs=1, settle_seconds=0, poll_interval=0.05, stop_event=stop_event, **crop_options
+    )
+    try:
+        for event in watcher:
+            events.append(event)
+            break
+    finally:
+        watcher.close()
+        timer.cancel()
+    return events
+
+
+def test_markers_and_restart_use_the_exported_files(tmp_path, make_pdf):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    shutil.move(make_pdf("a.pdf", [[(20, 20, 100, 80), (20, 200, 280, 380)]]), folder / "a.pdf")
+    output_folder = str(tmp_path / "out")
+    options = {"figure_gap": 20, "export_format": "png", "export_dpi": 36}
+
+    (event,) = watch_once(str(folder), output_folder, **options)
+    assert event.error is None
+    names = ["a_cropped_p1_1.png", "a_cropped_p1_2.png"]
+    assert event.result.output_paths == [os.path.join(output_folder, name) for name in names]
+    for path in event.result.output_paths:
+        assert os.path.exists(path + ".done")
+    assert not os.path.exists(os.path.join(output_folder, "a_cropped.pdf.done"))
+
+    # 重新启动监视时，输出都还在的文件不再处理
+    assert watch_once(str(folder), output_folder, timeout=1, **options) == []